@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""
+API Benchmark Suite for Frappe LMS
+Benchmarks every endpoint and route api_tester.py knows through the same
+APITester checks (keep-alive session, streamed content matching), with
+warm-up and measured iterations. Results are summarised as median and IQR
+after Tukey outlier rejection and written as JSON.
+
+With --stub the checks run against a local server that replays recorded
+responses (or synthetic defaults), so the client-side cost of the tooling
+can be measured and compared with no bench running.
+
+Usage:
+    python3 api_benchmark.py                          # against the local bench
+    python3 api_benchmark.py --record lms_responses.json
+    python3 api_benchmark.py --stub lms_responses.json --output bench.json
+    python3 api_benchmark.py --stub                   # synthetic responses
+    python3 api_benchmark.py --serve --port 8765      # stub server only
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from functools import partial
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from api_tester import (APITester, Colors, CORE_API_TESTS, FRONTEND_ROUTES,
+                        REMOVED_APIS, REMOVED_ROUTES, positive_int)
+from readiness import poll_until
+
+DEFAULT_BASE_URL = "http://127.0.0.1:8000"
+DEFAULT_WARMUP = 5
+DEFAULT_ITERATIONS = 50
+DEFAULT_STUB_PORT = 8765
+STUB_START_TIMEOUT = 10
+# Samples outside [Q1 - k*IQR, Q3 + k*IQR] are rejected as outliers
+TUKEY_K = 1.5
+
+HTML_PAGE = "<!DOCTYPE html>\n<html><head><title>Frappe LMS</title></head><body>{}</body></html>"
+NOT_FOUND_PAGE = "<!DOCTYPE html>\n<html><head><title>Not Found</title></head><body>Page not found</body></html>"
+
+def scenarios(tester):
+    """Return [(name, method, path, data, check)] for every endpoint and route.
+
+    check is a zero-argument callable returning (ok, message, status), the
+    same one api_tester runs, so the benchmark covers the full client path.
+    """
+    items = [("lms", "GET", "/lms", None,
+              partial(tester.check_api_endpoint, "/lms", should_contain="<!DOCTYPE html>"))]
+    for test in CORE_API_TESTS:
+        items.append((test["endpoint"].rsplit(".", 1)[-1], test.get("method", "GET"), test["endpoint"],
+                      test.get("data"), partial(tester.check_api_endpoint, **test)))
+    for route, description in FRONTEND_ROUTES:
+        items.append((route, "GET", route, None,
+                      partial(tester.check_api_endpoint, route, should_contain="<!DOCTYPE html>")))
+    for endpoint in REMOVED_APIS:
+        items.append((f"removed {endpoint.rsplit('.', 1)[-1]}", "POST", endpoint, None,
+                      partial(tester.check_removed_api, endpoint)))
+    for route in REMOVED_ROUTES:
+        items.append((f"removed {route}", "GET", route, None,
+                      partial(tester.check_removed_route, route)))
+    return items
+
+def summarize(samples):
+    """Median/IQR statistics in milliseconds after Tukey outlier rejection"""
+    ms = sorted(sample * 1000 for sample in samples)
+    if len(ms) >= 4:
+        q1, _, q3 = statistics.quantiles(ms, n=4, method="inclusive")
+        low, high = q1 - TUKEY_K * (q3 - q1), q3 + TUKEY_K * (q3 - q1)
+        kept = [value for value in ms if low <= value <= high]
+    else:
+        kept = ms
+    if len(kept) >= 4:
+        q1, median, q3 = statistics.quantiles(kept, n=4, method="inclusive")
+    else:
+        q1 = q3 = median = statistics.median(kept)
+    return {
+        "samples": len(ms),
+        "outliers": len(ms) - len(kept),
+        "median_ms": round(median, 3),
+        "iqr_ms": round(q3 - q1, 3),
+        "q1_ms": round(q1, 3),
+        "q3_ms": round(q3, 3),
+        "mean_ms": round(statistics.fmean(kept), 3),
+        "min_ms": round(ms[0], 3),
+        "max_ms": round(ms[-1], 3),
+    }
+
+def run_scenario(check, warmup, iterations):
+    """Return (timings in seconds, failures) for one scenario"""
+    for _ in range(warmup):
+        check()
+    # Start each scenario from a clean heap so earlier garbage is not collected mid-run
+    gc.collect()
+    timings = []
+    failures = 0
+    for _ in range(iterations):
+        start = time.perf_counter()
+        ok, message, status = check()
+        timings.append(time.perf_counter() - start)
+        if not ok:
+            failures += 1
+    return timings, failures
+
+def run_benchmark(base_url, warmup=DEFAULT_WARMUP, iterations=DEFAULT_ITERATIONS, only=None):
+    """Benchmark every scenario and return the results document"""
+    tester = APITester(base_url, pool_size=1)
+    print(f"{Colors.BOLD}{'='*60}")
+    print("⏱️ FRAPPE LMS API BENCHMARK")
+    print(f"{'='*60}{Colors.ENDC}")
+    print(f"{Colors.BLUE}ℹ {base_url} - {warmup} warm-up, {iterations} measured iterations{Colors.ENDC}")
+
+    results = {}
+    for name, method, path, data, check in scenarios(tester):
+        if only and only not in name and only not in path:
+            continue
+        timings, failures = run_scenario(check, warmup, iterations)
+        results[name] = dict(summarize(timings), method=method, path=path, failures=failures)
+
+    return {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "base_url": base_url,
+        "warmup": warmup,
+        "iterations": iterations,
+        "python": platform.python_version(),
+        "requests": requests.__version__,
+        "scenarios": results,
+    }
+
+def print_report(document):
+    print(f"\n{Colors.BOLD}📊 BENCHMARK RESULTS (ms, outliers rejected){Colors.ENDC}")
+    print("-" * 92)
+    print(f"{'Scenario':<32}{'Median':>10}{'IQR':>10}{'Min':>10}{'Max':>10}{'Outliers':>10}{'Failures':>10}")
+    for name, stats in document["scenarios"].items():
+        color = Colors.RED if stats["failures"] else Colors.GREEN
+        print(f"{color}{name:<32}{stats['median_ms']:>10.2f}{stats['iqr_ms']:>10.2f}"
+              f"{stats['min_ms']:>10.2f}{stats['max_ms']:>10.2f}"
+              f"{stats['outliers']:>10}{stats['failures']:>10}{Colors.ENDC}")
+
+def write_json(document, path):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(document, f, indent=2)
+    os.replace(tmp_path, path)
+
+# ---------------------------------------------------------------- stub server
+
+def synthetic_responses():
+    """Default replay table: plausible bodies that pass every api_tester check"""
+    responses = {}
+    json_body = {
+        "get_user_info": {"name": "Guest", "full_name": "Guest", "is_moderator": False, "roles": ["Guest"]},
+        "get_lms_setting": None,
+        "get_sidebar_settings": {"courses": 1, "batches": 1, "certifications": 1, "statistics": 1},
+        "get_courses": [{"name": f"course-{i}", "title": f"Course {i}", "published": 1,
+                         "enrollments": i * 7, "lessons": 12} for i in range(20)],
+        "get_count": 1000,
+    }
+    for test in CORE_API_TESTS:
+        body = json.dumps({"message": json_body.get(test["endpoint"].rsplit(".", 1)[-1])})
+        responses[f"{test.get('method', 'GET')} {test['endpoint']}"] = {
+            "status": 200, "content_type": "application/json", "body": body}
+    for route in ["/lms"] + [route for route, description in FRONTEND_ROUTES]:
+        responses[f"GET {route}"] = {
+            "status": 200, "content_type": "text/html; charset=utf-8",
+            "body": HTML_PAGE.format('<div id="app"></div>' * 200)}
+    # The bench redirects removed Job pages back to the LMS home
+    for route in REMOVED_ROUTES:
+        responses[f"GET {route}"] = {
+            "status": 302, "content_type": "text/html; charset=utf-8", "body": "", "location": "/lms"}
+    return responses
+
+def load_responses(path):
+    """Recorded responses from path layered over the synthetic defaults"""
+    responses = synthetic_responses()
+    if path:
+        with open(path) as f:
+            responses.update(json.load(f)["responses"])
+    return responses
+
+def record_responses(base_url, path):
+    """Fetch every scenario once from a live bench and save the responses for --stub"""
+    session = requests.Session()
+    recorded = {}
+    for name, method, route, data, check in scenarios(APITester(base_url, pool_size=1)):
+        try:
+            response = session.request(method, f"{base_url}{route}", json=data,
+                                       allow_redirects=False, timeout=10)
+        except requests.exceptions.RequestException as e:
+            print(f"{Colors.RED}✗ {method} {route} - {e}{Colors.ENDC}")
+            continue
+        entry = {"status": response.status_code,
+                 "content_type": response.headers.get("Content-Type", "text/plain"),
+                 "body": response.text}
+        if "Location" in response.headers:
+            entry["location"] = response.headers["Location"]
+        recorded[f"{method} {route}"] = entry
+        print(f"{Colors.GREEN}✓ {method} {route} - {response.status_code}, {len(response.content)} bytes{Colors.ENDC}")
+    write_json({"created": datetime.now().isoformat(timespec="seconds"),
+                "base_url": base_url, "responses": recorded}, path)
+    print(f"{Colors.BLUE}ℹ {len(recorded)} responses written to {path}{Colors.ENDC}")
+    return len(recorded)
+
+def make_handler(responses):
+    class StubHandler(BaseHTTPRequestHandler):
+        # HTTP/1.1 so the client's keep-alive pool behaves as it does against the bench
+        protocol_version = "HTTP/1.1"
+        # Headers and body go out in separate writes; without this each
+        # response stalls on delayed ACK and the stub dominates the timings
+        disable_nagle_algorithm = True
+
+        def replay(self, method):
+            length = int(self.headers.get("Content-Length") or 0)
+            if length:
+                self.rfile.read(length)
+            path = self.path.split("?", 1)[0]
+            entry = responses.get(f"{method} {path}") or {
+                "status": 404, "content_type": "text/html; charset=utf-8", "body": NOT_FOUND_PAGE}
+            body = entry["body"].encode()
+            self.send_response(entry["status"])
+            self.send_header("Content-Type", entry["content_type"])
+            self.send_header("Content-Length", str(len(body)))
+            if "location" in entry:
+                self.send_header("Location", entry["location"])
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            self.replay("GET")
+
+        def do_POST(self):
+            self.replay("POST")
+
+        def log_message(self, format, *args):
+            pass
+    return StubHandler
+
+def serve_stub(port, responses_path=None):
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(load_responses(responses_path)))
+    server.daemon_threads = True
+    print(f"{Colors.BLUE}ℹ Stub LMS server on http://127.0.0.1:{port} "
+          f"({responses_path or 'synthetic responses'}){Colors.ENDC}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def start_stub(responses_path=None):
+    """Run the stub in a child process, so it does not share the client's GIL,
+    and return (process, base_url) once it accepts connections"""
+    port = free_port()
+    command = [sys.executable, os.path.abspath(__file__), "--serve", "--port", str(port)]
+    if responses_path:
+        command += ["--responses", responses_path]
+    process = subprocess.Popen(command, stdout=subprocess.DEVNULL)
+
+    def accepting():
+        with socket.create_connection(("127.0.0.1", port), timeout=1):
+            return True
+    ok = poll_until(accepting, STUB_START_TIMEOUT, give_up=lambda: process.poll() is not None)[0]
+    if not ok:
+        process.kill()
+        raise RuntimeError(f"stub server did not start on port {port}")
+    return process, f"http://127.0.0.1:{port}"
+
+def non_negative_int(value):
+    """argparse type for counts that may be 0"""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {value!r}")
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"must be at least 0, got {number}")
+    return number
+
+def main():
+    parser = argparse.ArgumentParser(description="API Benchmark Suite for Frappe LMS")
+    parser.add_argument("base_url", nargs="?", default=DEFAULT_BASE_URL)
+    parser.add_argument("--warmup", type=non_negative_int, default=DEFAULT_WARMUP,
+                        help=f"unmeasured iterations per scenario (default {DEFAULT_WARMUP})")
+    parser.add_argument("--iterations", type=positive_int, default=DEFAULT_ITERATIONS,
+                        help=f"measured iterations per scenario (default {DEFAULT_ITERATIONS})")
+    parser.add_argument("--scenario", metavar="TEXT",
+                        help="only run scenarios whose name or path contains TEXT")
+    parser.add_argument("--output", metavar="FILE", help="write the results as JSON to FILE")
+    parser.add_argument("--stub", nargs="?", const="", metavar="FILE",
+                        help="benchmark against a local stub replaying FILE (synthetic if omitted)")
+    parser.add_argument("--record", metavar="FILE",
+                        help="record one response per scenario from base_url to FILE for --stub")
+    parser.add_argument("--serve", action="store_true", help="only run the stub server")
+    parser.add_argument("--port", type=int, default=DEFAULT_STUB_PORT,
+                        help=f"port for --serve (default {DEFAULT_STUB_PORT})")
+    parser.add_argument("--responses", metavar="FILE", help="recorded responses for --serve")
+    args = parser.parse_args()
+
+    if args.serve:
+        serve_stub(args.port, args.responses)
+        return 0
+    if args.record:
+        return 0 if record_responses(args.base_url, args.record) else 1
+
+    stub = None
+    base_url = args.base_url
+    if args.stub is not None:
+        try:
+            stub, base_url = start_stub(args.stub or None)
+        except RuntimeError as e:
+            print(f"{Colors.RED}❌ {e}{Colors.ENDC}")
+            return 1
+    try:
+        document = run_benchmark(base_url, args.warmup, args.iterations, args.scenario)
+    finally:
+        if stub is not None:
+            stub.terminate()
+            stub.wait()
+    document["stub"] = None if args.stub is None else (args.stub or "synthetic")
+
+    print_report(document)
+    if args.output:
+        write_json(document, args.output)
+        print(f"\n{Colors.BLUE}ℹ Results written to {args.output}{Colors.ENDC}")
+    return 2 if any(stats["failures"] for stats in document["scenarios"].values()) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
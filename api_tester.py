@@ -5,9 +5,18 @@ Tests all critical API endpoints to ensure they work correctly
 """
 
 import requests
+import argparse
 import json
+import math
+import os
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import partial
+from requests.adapters import HTTPAdapter
+
 
 class Colors:
     GREEN = '\033[92m'
@@ -17,13 +26,259 @@ class Colors:
     ENDC = '\033[0m'
     BOLD = '\033[1m'
 
+# Core LMS API endpoints and the content they must not return
+CORE_API_TESTS = [
+    {
+        "endpoint": "/api/method/lms.lms.api.get_user_info",
+        "method": "POST",
+        "should_not_contain": ["Traceback", "Error 500", "Internal Server Error"]
+    },
+    {
+        "endpoint": "/api/method/lms.lms.api.get_lms_setting",
+        "method": "POST",
+        "should_not_contain": ["Traceback", "Error 500"]
+    },
+    {
+        "endpoint": "/api/method/lms.lms.api.get_sidebar_settings",
+        "method": "POST",
+        "should_not_contain": ["Traceback", "Error 500"]
+    },
+    {
+        "endpoint": "/api/method/lms.lms.utils.get_courses",
+        "method": "POST",
+        "should_not_contain": ["Traceback", "Error 500"]
+    },
+    {
+        "endpoint": "/api/method/frappe.client.get_count",
+        "method": "POST",
+        "data": {"doctype": "User"},
+        "should_not_contain": ["Traceback", "Error 500"]
+    }
+]
+
+# These should return 417 or 404 since Jobs were removed
+REMOVED_APIS = [
+    "/api/method/lms.lms.api.get_job_opportunities",
+    "/api/method/lms.lms.api.get_job_details"
+]
+
+FRONTEND_ROUTES = [
+    ("/lms/courses", "Courses page"),
+    ("/lms/batches", "Batches page"),
+    ("/lms/statistics", "Statistics page"),
+]
+
+# Job routes should redirect or show 404
+REMOVED_ROUTES = [
+    "/job-openings",
+    "/lms/job-openings"
+]
+
+DEFAULT_WORKERS = 8
+
+# Exit code when functional checks pass but p95 latency regressed past the baseline
+EXIT_PERF_REGRESSION = 3
+DEFAULT_BASELINE_TOLERANCE = 0.25
+DEFAULT_BASELINE_SAMPLES = 20
+# Absolute slack so sub-millisecond jitter on fast endpoints is not a regression
+BASELINE_MIN_SLACK_MS = 5
+
+class LatencyHistogram:
+    """Compact log-bucketed latency histogram.
+
+    Samples are recorded in microseconds into buckets whose width grows by
+    ~1% per bucket, so percentiles carry at most ~1% relative error while a
+    minute-long run at thousands of requests per second still needs only a
+    few hundred buckets instead of a list of every sample.
+    """
+
+    GROWTH = 1.01
+    LOG_GROWTH = math.log(GROWTH)
+
+    def __init__(self):
+        self.buckets = {}
+        self.count = 0
+        self.total_us = 0
+        self.min_us = None
+        self.max_us = 0
+
+    def record(self, seconds):
+        micros = max(int(seconds * 1_000_000), 1)
+        index = int(math.log(micros) / self.LOG_GROWTH)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.total_us += micros
+        self.max_us = max(self.max_us, micros)
+        self.min_us = micros if self.min_us is None else min(self.min_us, micros)
+
+    def merge(self, other):
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.count += other.count
+        self.total_us += other.total_us
+        self.max_us = max(self.max_us, other.max_us)
+        if other.min_us is not None:
+            self.min_us = other.min_us if self.min_us is None else min(self.min_us, other.min_us)
+
+    def percentile(self, pct):
+        """Return the pct-th percentile latency in milliseconds"""
+        if not self.count:
+            return 0.0
+        rank = max(math.ceil(self.count * pct / 100), 1)
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                # Geometric midpoint of the bucket, clamped to the observed range
+                value = self.GROWTH ** (index + 0.5)
+                return min(max(value, self.min_us), self.max_us) / 1000
+        return self.max_us / 1000
+
+    @property
+    def max_ms(self):
+        return self.max_us / 1000
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "total_us": self.total_us,
+            "min_us": self.min_us,
+            "max_us": self.max_us,
+            "p50_ms": round(self.percentile(50), 3),
+            "p95_ms": round(self.percentile(95), 3),
+            "p99_ms": round(self.percentile(99), 3),
+            "buckets": {str(index): count for index, count in sorted(self.buckets.items())},
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        histogram = cls()
+        histogram.buckets = {int(index): count for index, count in data["buckets"].items()}
+        histogram.count = data["count"]
+        histogram.total_us = data["total_us"]
+        histogram.min_us = data["min_us"]
+        histogram.max_us = data["max_us"]
+        return histogram
+
+# Response bodies are matched in chunks of this size
+STREAM_CHUNK_SIZE = 16 * 1024
+# Once the verdict is known, drain at most this much more so the keep-alive
+# connection can go back to the pool; larger remainders drop the connection
+STREAM_DRAIN_LIMIT = 64 * 1024
+
+class StreamMatcher:
+    """Aho-Corasick matcher that finds many needles in one pass over a byte stream.
+
+    The automaton is compiled to a full transition table over the bytes that
+    occur in the needles (every other byte returns to the root), so matching
+    state carries across chunk boundaries and each byte costs one dict lookup
+    no matter how many needles there are.
+    """
+
+    def __init__(self, needles):
+        self.needles = list(needles)
+        transitions = [{}]
+        outputs = [set()]
+        for index, needle in enumerate(self.needles):
+            state = 0
+            for byte in needle.encode():
+                if byte not in transitions[state]:
+                    transitions.append({})
+                    outputs.append(set())
+                    transitions[state][byte] = len(transitions) - 1
+                state = transitions[state][byte]
+            outputs[state].add(index)
+
+        # Breadth-first pass: inherit failure outputs and fill in the missing
+        # transitions so feed() never has to follow failure links
+        alphabet = {byte for edges in transitions for byte in edges}
+        fail = [0] * len(transitions)
+        queue = list(transitions[0].values())
+        while queue:
+            state = queue.pop(0)
+            outputs[state] |= outputs[fail[state]]
+            for byte in alphabet:
+                child = transitions[state].get(byte)
+                if child is None:
+                    target = transitions[fail[state]].get(byte, 0)
+                    if target:
+                        transitions[state][byte] = target
+                else:
+                    fail[child] = transitions[fail[state]].get(byte, 0) if state else 0
+                    queue.append(child)
+
+        self.transitions = transitions
+        self.outputs = [frozenset(out) for out in outputs]
+        self.state = 0
+        self.found = set()
+
+    def feed(self, chunk):
+        """Consume a chunk of bytes and return the set of needle indexes found so far"""
+        transitions = self.transitions
+        outputs = self.outputs
+        state = self.state
+        for byte in chunk:
+            state = transitions[state].get(byte, 0)
+            if outputs[state]:
+                self.found |= outputs[state]
+        self.state = state
+        return self.found
+
+def as_list(value):
+    if not value:
+        return []
+    return value if isinstance(value, list) else [value]
+
+def match_stream(response, should_contain=(), should_not_contain=(), limit=None):
+    """Scan a streamed response body and return the set of needles it contains.
+
+    Reading stops as soon as the verdict is known: when an unwanted needle
+    appears, when every wanted needle has been seen and there is nothing
+    left to rule out, or after `limit` bytes.
+    """
+    should_contain = list(should_contain)
+    should_not_contain = list(should_not_contain)
+    matcher = StreamMatcher(should_contain + should_not_contain)
+    wanted = set(range(len(should_contain)))
+    unwanted = set(range(len(should_contain), len(matcher.needles)))
+    remaining = limit
+    chunks = response.iter_content(STREAM_CHUNK_SIZE)
+
+    for chunk in chunks:
+        if remaining is not None:
+            chunk = chunk[:remaining]
+            remaining -= len(chunk)
+        found = matcher.feed(chunk)
+        if found & unwanted or (not unwanted and wanted <= found) or remaining == 0:
+            finish_stream(response, chunks)
+            break
+
+    return {matcher.needles[index] for index in matcher.found}
+
+def finish_stream(response, chunks=None):
+    """Release a streamed response's connection, draining it only if the rest is small"""
+    drained = 0
+    for chunk in chunks if chunks is not None else response.iter_content(STREAM_CHUNK_SIZE):
+        drained += len(chunk)
+        if drained > STREAM_DRAIN_LIMIT:
+            response.close()
+            return
+
 class APITester:
-    def __init__(self, base_url="http://127.0.0.1:8000"):
+    def __init__(self, base_url="http://127.0.0.1:8000", pool_size=DEFAULT_WORKERS):
         self.base_url = base_url
         self.session = requests.Session()
+        # One keep-alive pool shared by every check, sized for the worker count
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
         self.passed = 0
         self.failed = 0
         self.warnings = 0
+        # endpoint -> LatencyHistogram from the last load test or latency sampling pass
+        self.latencies = {}
+        # endpoint -> failed requests in that pass; a baseline is only saved without any
+        self.latency_errors = {}
 
     def print_status(self, message, status="INFO"):
         timestamp = datetime.now().strftime("%H:%M:%S")
@@ -39,163 +294,347 @@ class APITester:
         else:
             print(f"{Colors.BLUE}ℹ [{timestamp}] {message}{Colors.ENDC}")
 
-    def test_api_endpoint(self, endpoint, method="GET", data=None, expected_status=200, 
-                         should_contain=None, should_not_contain=None):
-        """Test a single API endpoint"""
+    def check_api_endpoint(self, endpoint, method="GET", data=None, expected_status=200,
+                           should_contain=None, should_not_contain=None):
+        """Check a single API endpoint and return (ok, message, status) without printing"""
         url = f"{self.base_url}{endpoint}"
         
         try:
             if method == "GET":
-                response = self.session.get(url, timeout=10)
+                response = self.session.get(url, timeout=10, stream=True)
             elif method == "POST":
                 headers = {'Content-Type': 'application/json'}
-                response = self.session.post(url, json=data, headers=headers, timeout=10)
+                response = self.session.post(url, json=data, headers=headers, timeout=10, stream=True)
             else:
-                self.print_status(f"Unsupported method {method} for {endpoint}", "ERROR")
-                return False
+                return False, f"Unsupported method {method} for {endpoint}", "ERROR"
 
             # Check status code
             if response.status_code != expected_status:
-                self.print_status(f"API {endpoint} - Status {response.status_code} (expected {expected_status})", "ERROR")
-                return False
-
-            # Check response content
-            response_text = response.text
-            
-            if should_contain:
-                for text in should_contain if isinstance(should_contain, list) else [should_contain]:
-                    if text not in response_text:
-                        self.print_status(f"API {endpoint} - Missing expected content: {text}", "ERROR")
-                        return False
-
-            if should_not_contain:
-                for text in should_not_contain if isinstance(should_not_contain, list) else [should_not_contain]:
-                    if text in response_text:
-                        self.print_status(f"API {endpoint} - Contains unwanted content: {text}", "ERROR")
-                        return False
-
-            self.print_status(f"API {endpoint} - OK", "SUCCESS")
-            return True
+                finish_stream(response)
+                return False, f"API {endpoint} - Status {response.status_code} (expected {expected_status})", "ERROR"
+
+            # Check response content in a single streaming pass
+            should_contain = as_list(should_contain)
+            should_not_contain = as_list(should_not_contain)
+            found = match_stream(response, should_contain, should_not_contain)
+
+            # An unwanted match may stop the scan early, so report it first
+            for text in should_not_contain:
+                if text in found:
+                    return False, f"API {endpoint} - Contains unwanted content: {text}", "ERROR"
+
+            for text in should_contain:
+                if text not in found:
+                    return False, f"API {endpoint} - Missing expected content: {text}", "ERROR"
+
+            return True, f"API {endpoint} - OK", "SUCCESS"
 
         except requests.exceptions.ConnectionError:
-            self.print_status(f"API {endpoint} - Connection Error", "ERROR")
-            return False
+            return False, f"API {endpoint} - Connection Error", "ERROR"
         except requests.exceptions.Timeout:
-            self.print_status(f"API {endpoint} - Timeout", "ERROR")
-            return False
+            return False, f"API {endpoint} - Timeout", "ERROR"
         except Exception as e:
-            self.print_status(f"API {endpoint} - Error: {str(e)}", "ERROR")
-            return False
+            return False, f"API {endpoint} - Error: {str(e)}", "ERROR"
+
+    def test_api_endpoint(self, endpoint, method="GET", data=None, expected_status=200, 
+                         should_contain=None, should_not_contain=None):
+        """Test a single API endpoint"""
+        ok, message, status = self.check_api_endpoint(endpoint, method, data, expected_status,
+                                                      should_contain, should_not_contain)
+        self.print_status(message, status)
+        return ok
+
+    def check_removed_api(self, endpoint):
+        """Check that a removed Job API is actually gone"""
+        try:
+            response = self.session.post(f"{self.base_url}{endpoint}", timeout=10)
+            if response.status_code in [417, 404, 500]:  # Expected for removed endpoints
+                return True, f"Removed API {endpoint} - Correctly unavailable ({response.status_code})", "SUCCESS"
+            else:
+                return False, f"Removed API {endpoint} - Unexpected status {response.status_code}", "WARNING"
+        except:
+            return True, f"Removed API {endpoint} - Connection error (expected)", "SUCCESS"
+
+    def check_removed_route(self, route):
+        """Check that a removed Job route is handled (redirect or 404)"""
+        try:
+            response = self.session.get(f"{self.base_url}{route}", allow_redirects=True,
+                                        timeout=10, stream=True)
+            if response.status_code in [404, 200]:
+                # Only the first 1000 bytes matter, so stop downloading there
+                job_content = bool(match_stream(response, should_not_contain=["Job"], limit=1000))
+            else:
+                finish_stream(response)
+        except Exception as e:
+            return False, f"Removed route {route} - Error: {str(e)}", "ERROR"
+
+        if response.status_code in [404, 200]:  # 200 if redirected to valid page
+            # Check that we're not on a job page
+            if "job" not in response.url.lower() and not job_content:
+                return True, f"Removed route {route} - Correctly handled", "SUCCESS"
+            else:
+                return False, f"Removed route {route} - Still shows job content", "ERROR"
+        else:
+            return False, f"Removed route {route} - Status {response.status_code}", "WARNING"
+
+    def test_groups(self):
+        """Return the test groups as (title, checks) in report order.
+
+        Each check is a zero-argument callable returning (ok, message, status),
+        so the same list can be run one by one or on a thread pool.
+        """
+        core_checks = [partial(self.check_api_endpoint, "/lms", should_contain="<!DOCTYPE html>")]
+        core_checks += [partial(self.check_api_endpoint, **test) for test in CORE_API_TESTS]
+
+        groups = [
+            ("📡 TESTING CORE APIS", core_checks),
+            ("🚫 TESTING REMOVED APIS",
+             [partial(self.check_removed_api, endpoint) for endpoint in REMOVED_APIS]),
+            ("🌐 TESTING FRONTEND ROUTES",
+             [partial(self.check_api_endpoint, route, should_contain="<!DOCTYPE html>")
+              for route, description in FRONTEND_ROUTES]),
+            ("🚫 TESTING REMOVED ROUTES",
+             [partial(self.check_removed_route, route) for route in REMOVED_ROUTES]),
+        ]
+        return groups
+
+    def print_group_header(self, title):
+        print(f"\n{Colors.BOLD}{title}{Colors.ENDC}")
+        print("-" * 30)
+
+    def run_group(self, title, checks):
+        """Run one test group sequentially"""
+        self.print_group_header(title)
+        for check in checks:
+            ok, message, status = check()
+            self.print_status(message, status)
+
+    def run_groups_concurrently(self, groups, workers):
+        """Run every check of every group on a bounded thread pool.
+
+        Checks are all submitted up front and share the session's connection
+        pool; results are reported in declaration order, so the output and the
+        pass/fail/warning counters are identical to a sequential run.
+        """
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            pending = [(title, [executor.submit(check) for check in checks])
+                       for title, checks in groups]
+            for title, futures in pending:
+                self.print_group_header(title)
+                for future in futures:
+                    ok, message, status = future.result()
+                    self.print_status(message, status)
 
     def test_core_apis(self):
         """Test core Frappe LMS APIs"""
-        print(f"\n{Colors.BOLD}📡 TESTING CORE APIS{Colors.ENDC}")
-        print("-" * 30)
-        
-        # Test main LMS page
-        self.test_api_endpoint("/lms", should_contain="<!DOCTYPE html>")
-        
-        # Test API endpoints
-        api_tests = [
-            {
-                "endpoint": "/api/method/lms.lms.api.get_user_info",
-                "method": "POST",
-                "should_not_contain": ["Traceback", "Error 500", "Internal Server Error"]
-            },
-            {
-                "endpoint": "/api/method/lms.lms.api.get_lms_setting",
-                "method": "POST",
-                "should_not_contain": ["Traceback", "Error 500"]
-            },
-            {
-                "endpoint": "/api/method/lms.lms.api.get_sidebar_settings",
-                "method": "POST",
-                "should_not_contain": ["Traceback", "Error 500"]
-            },
-            {
-                "endpoint": "/api/method/lms.lms.utils.get_courses",
-                "method": "POST",
-                "should_not_contain": ["Traceback", "Error 500"]
-            },
-            {
-                "endpoint": "/api/method/frappe.client.get_count",
-                "method": "POST",
-                "data": {"doctype": "User"},
-                "should_not_contain": ["Traceback", "Error 500"]
-            }
-        ]
-        
-        for test in api_tests:
-            self.test_api_endpoint(**test)
+        self.run_group(*self.test_groups()[0])
 
     def test_removed_apis(self):
         """Test that removed Job APIs are actually gone"""
-        print(f"\n{Colors.BOLD}🚫 TESTING REMOVED APIS{Colors.ENDC}")
-        print("-" * 30)
-        
-        # These should return 417 or 404 since Jobs were removed
-        removed_apis = [
-            "/api/method/lms.lms.api.get_job_opportunities",
-            "/api/method/lms.lms.api.get_job_details"
-        ]
-        
-        for endpoint in removed_apis:
-            try:
-                response = self.session.post(f"{self.base_url}{endpoint}", timeout=10)
-                if response.status_code in [417, 404, 500]:  # Expected for removed endpoints
-                    self.print_status(f"Removed API {endpoint} - Correctly unavailable ({response.status_code})", "SUCCESS")
-                else:
-                    self.print_status(f"Removed API {endpoint} - Unexpected status {response.status_code}", "WARNING")
-            except:
-                self.print_status(f"Removed API {endpoint} - Connection error (expected)", "SUCCESS")
+        self.run_group(*self.test_groups()[1])
 
     def test_frontend_routes(self):
         """Test frontend routes"""
-        print(f"\n{Colors.BOLD}🌐 TESTING FRONTEND ROUTES{Colors.ENDC}")
-        print("-" * 30)
-        
-        routes_to_test = [
-            ("/lms/courses", "Courses page"),
-            ("/lms/batches", "Batches page"),
-            ("/lms/statistics", "Statistics page"),
-        ]
-        
-        for route, description in routes_to_test:
-            self.test_api_endpoint(route, should_contain="<!DOCTYPE html>")
+        self.run_group(*self.test_groups()[2])
 
     def test_removed_routes(self):
         """Test that removed Job routes are gone"""
-        print(f"\n{Colors.BOLD}🚫 TESTING REMOVED ROUTES{Colors.ENDC}")
+        self.run_group(*self.test_groups()[3])
+
+    def timed_request(self, test):
+        """Send one core API request and return (seconds, ok), timing the full body"""
+        start = time.perf_counter()
+        try:
+            response = self.session.post(f"{self.base_url}{test['endpoint']}",
+                                         json=test.get("data"), timeout=10)
+            response.content
+            ok = response.status_code == 200
+        except requests.exceptions.RequestException:
+            ok = False
+        return time.perf_counter() - start, ok
+
+    def measure_latencies(self, samples=DEFAULT_BASELINE_SAMPLES):
+        """Sample every core API endpoint sequentially to build latency histograms"""
+        print(f"\n{Colors.BOLD}⏱️ SAMPLING LATENCIES ({samples} per endpoint){Colors.ENDC}")
         print("-" * 30)
-        
-        # Job routes should redirect or show 404
-        removed_routes = [
-            "/job-openings",
-            "/lms/job-openings"
-        ]
-        
-        for route in removed_routes:
-            # Check if route is handled properly (redirect or 404)
-            response = self.session.get(f"{self.base_url}{route}", allow_redirects=True, timeout=10)
-            if response.status_code in [404, 200]:  # 200 if redirected to valid page
-                # Check that we're not on a job page
-                if "job" not in response.url.lower() and "Job" not in response.text[:1000]:
-                    self.print_status(f"Removed route {route} - Correctly handled", "SUCCESS")
+        self.latencies = {test["endpoint"]: LatencyHistogram() for test in CORE_API_TESTS}
+        self.latency_errors = {test["endpoint"]: 0 for test in CORE_API_TESTS}
+        for test in CORE_API_TESTS:
+            for _ in range(samples):
+                seconds, ok = self.timed_request(test)
+                # A refused or failed request says nothing about endpoint latency
+                if ok:
+                    self.latencies[test["endpoint"]].record(seconds)
                 else:
-                    self.print_status(f"Removed route {route} - Still shows job content", "ERROR")
+                    self.latency_errors[test["endpoint"]] += 1
+            histogram = self.latencies[test["endpoint"]]
+            errors = self.latency_errors[test["endpoint"]]
+            if not histogram.count:
+                self.print_status(f"{test['endpoint']} - no successful samples ({errors} failed)", "ERROR")
+                continue
+            failed = f", {errors} failed samples skipped" if errors else ""
+            self.print_status(f"{test['endpoint']} - p50 {histogram.percentile(50):.1f}ms, "
+                              f"p95 {histogram.percentile(95):.1f}ms{failed}")
+        return self.latencies
+
+    def save_baseline(self, path):
+        """Write the current latency histograms to a baseline file.
+
+        Refuses (returning False) when an endpoint has no successful samples
+        or the load test saw errors, so a dead server never becomes a "fast" baseline.
+        """
+        unusable = [endpoint for endpoint, histogram in self.latencies.items()
+                    if not histogram.count or self.latency_errors.get(endpoint)]
+        if unusable:
+            print(f"{Colors.RED}✗ Not writing baseline {path}: failed requests for "
+                  f"{', '.join(endpoint.rsplit('.', 1)[-1] for endpoint in unusable)}{Colors.ENDC}")
+            return False
+        baseline = {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "base_url": self.base_url,
+            "endpoints": {endpoint: histogram.to_dict()
+                          for endpoint, histogram in self.latencies.items()},
+        }
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(baseline, f, indent=2)
+        os.replace(tmp_path, path)
+        print(f"{Colors.BLUE}ℹ Latency baseline written to {path}{Colors.ENDC}")
+        return True
+
+    def compare_to_baseline(self, path, tolerance=DEFAULT_BASELINE_TOLERANCE):
+        """Compare current p95 latencies against a baseline file.
+
+        Returns the number of endpoints whose p95 exceeds the baseline p95 by
+        more than the tolerance (and by at least BASELINE_MIN_SLACK_MS), or
+        None if the baseline file is missing or unreadable.
+        """
+        try:
+            with open(path) as f:
+                baseline = json.load(f)
+            baseline["endpoints"]
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            reason = "not found" if isinstance(e, FileNotFoundError) else f"unreadable ({e.__class__.__name__})"
+            print(f"{Colors.RED}❌ Latency baseline {path} {reason}; record one with --record-baseline{Colors.ENDC}")
+            return None
+
+        print(f"\n{Colors.BOLD}📈 LATENCY BASELINE ({baseline.get('created', 'unknown')}, "
+              f"tolerance {tolerance:.0%}){Colors.ENDC}")
+        print("-" * 30)
+        regressions = 0
+        for endpoint, histogram in self.latencies.items():
+            if endpoint not in baseline["endpoints"]:
+                print(f"{Colors.BLUE}ℹ {endpoint} - not in baseline{Colors.ENDC}")
+                continue
+            if not histogram.count:
+                print(f"{Colors.YELLOW}⚠ {endpoint} - no successful samples to compare{Colors.ENDC}")
+                continue
+            base_p95 = LatencyHistogram.from_dict(baseline["endpoints"][endpoint]).percentile(95)
+            current_p95 = histogram.percentile(95)
+            limit = max(base_p95 * (1 + tolerance), base_p95 + BASELINE_MIN_SLACK_MS)
+            message = f"{endpoint} - p95 {current_p95:.1f}ms (baseline {base_p95:.1f}ms, limit {limit:.1f}ms)"
+            if current_p95 > limit:
+                print(f"{Colors.RED}✗ {message} - REGRESSED{Colors.ENDC}")
+                regressions += 1
             else:
-                self.print_status(f"Removed route {route} - Status {response.status_code}", "WARNING")
+                print(f"{Colors.GREEN}✓ {message}{Colors.ENDC}")
+        return regressions
+
+    def run_load_test(self, users, duration=None, total_requests=None):
+        """Drive the core API endpoints with N concurrent virtual users.
+
+        Each user cycles through CORE_API_TESTS until the duration elapses or
+        total_requests have been sent. Returns 0 if every request succeeded,
+        2 otherwise.
+        """
+        print(f"{Colors.BOLD}{'='*60}")
+        print("🏋️ FRAPPE LMS API LOAD TEST")
+        print(f"{'='*60}{Colors.ENDC}")
+        limit = f"{total_requests} requests" if total_requests else f"{duration}s"
+        self.print_status(f"{users} virtual users, {limit}, {len(CORE_API_TESTS)} endpoints")
+
+        deadline = time.monotonic() + duration if duration else None
+        sent = 0
+        sent_lock = threading.Lock()
+        results = []
+
+        def virtual_user(offset):
+            nonlocal sent
+            histograms = {test["endpoint"]: LatencyHistogram() for test in CORE_API_TESTS}
+            errors = {test["endpoint"]: 0 for test in CORE_API_TESTS}
+            step = offset
+            while True:
+                if deadline and time.monotonic() >= deadline:
+                    break
+                if total_requests:
+                    with sent_lock:
+                        if sent >= total_requests:
+                            break
+                        sent += 1
+                test = CORE_API_TESTS[step % len(CORE_API_TESTS)]
+                step += 1
+                seconds, ok = self.timed_request(test)
+                # Failed requests (often instant refusals) would skew the percentiles
+                if ok:
+                    histograms[test["endpoint"]].record(seconds)
+                else:
+                    errors[test["endpoint"]] += 1
+            results.append((histograms, errors))
+
+        started = time.perf_counter()
+        threads = [threading.Thread(target=virtual_user, args=(i,), daemon=True) for i in range(users)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        # Merge the per-user histograms so workers never contend on a lock per sample
+        merged = {test["endpoint"]: LatencyHistogram() for test in CORE_API_TESTS}
+        error_counts = {test["endpoint"]: 0 for test in CORE_API_TESTS}
+        for histograms, errors in results:
+            for endpoint, histogram in histograms.items():
+                merged[endpoint].merge(histogram)
+                error_counts[endpoint] += errors[endpoint]
 
-    def run_all_tests(self):
+        total = LatencyHistogram()
+        for histogram in merged.values():
+            total.merge(histogram)
+        self.latencies = merged
+        self.latency_errors = error_counts
+        self.print_load_report(merged, error_counts, total, elapsed)
+        return 0 if sum(error_counts.values()) == 0 else 2
+
+    def print_load_report(self, histograms, errors, total, elapsed):
+        print(f"\n{Colors.BOLD}📊 LOAD TEST RESULTS ({elapsed:.1f}s){Colors.ENDC}")
+        print("-" * 96)
+        # Latencies cover successful requests only; Reqs and Req/s count every request sent
+        print(f"{'Endpoint':<30}{'Reqs':>8}{'Errors':>8}{'Req/s':>9}"
+              f"{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'max ms':>11}")
+        rows = [(endpoint.rsplit(".", 1)[-1], histograms[endpoint], errors[endpoint])
+                for endpoint in histograms]
+        rows.append(("TOTAL", total, sum(errors.values())))
+        for name, histogram, error_count in rows:
+            sent = histogram.count + error_count
+            rate = sent / elapsed if elapsed else 0
+            color = Colors.RED if error_count else Colors.GREEN
+            print(f"{color}{name:<30}{sent:>8}{error_count:>8}{rate:>9.1f}"
+                  f"{histogram.percentile(50):>10.1f}{histogram.percentile(90):>10.1f}"
+                  f"{histogram.percentile(99):>10.1f}{histogram.max_ms:>11.1f}{Colors.ENDC}")
+
+    def run_all_tests(self, concurrent=False, workers=DEFAULT_WORKERS):
         """Run all API tests"""
         print(f"{Colors.BOLD}{'='*60}")
         print("🧪 FRAPPE LMS API TEST SUITE")
         print(f"{'='*60}{Colors.ENDC}")
         
-        self.test_core_apis()
-        self.test_removed_apis()
-        self.test_frontend_routes()
-        self.test_removed_routes()
+        if concurrent:
+            self.run_groups_concurrently(self.test_groups(), workers)
+        else:
+            self.test_core_apis()
+            self.test_removed_apis()
+            self.test_frontend_routes()
+            self.test_removed_routes()
         
         # Print summary
         print(f"\n{Colors.BOLD}📊 TEST SUMMARY{Colors.ENDC}")
@@ -219,14 +658,76 @@ class APITester:
             print(f"\n{Colors.RED}❌ SOME TESTS FAILED{Colors.ENDC}")
             return 2
 
+def positive_int(value):
+    """argparse type for counts that must be at least 1"""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {value!r}")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+def positive_float(value):
+    """argparse type for durations that must be above zero"""
+    try:
+        number = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid float value: {value!r}")
+    if not 0 < number < math.inf:
+        raise argparse.ArgumentTypeError(f"must be a finite number above 0, got {value}")
+    return number
+
 def main():
-    if len(sys.argv) > 1:
-        base_url = sys.argv[1]
+    parser = argparse.ArgumentParser(description="API Test Suite for Frappe LMS")
+    parser.add_argument("base_url", nargs="?", default="http://127.0.0.1:8000")
+    parser.add_argument("--concurrent", action="store_true",
+                        help="send all endpoint checks in parallel")
+    parser.add_argument("--workers", type=positive_int, default=DEFAULT_WORKERS,
+                        help=f"thread pool size for --concurrent (default {DEFAULT_WORKERS})")
+    parser.add_argument("--load", action="store_true",
+                        help="load-test the core API endpoints instead of running the test suite")
+    parser.add_argument("--users", type=positive_int, default=10,
+                        help="concurrent virtual users for --load (default 10)")
+    parser.add_argument("--duration", type=positive_float, default=30,
+                        help="seconds to run --load for (default 30)")
+    parser.add_argument("--requests", type=positive_int, dest="total_requests",
+                        help="stop --load after this many requests instead of after --duration")
+    parser.add_argument("--record-baseline", metavar="FILE",
+                        help="record per-endpoint latency distributions to FILE")
+    parser.add_argument("--baseline", metavar="FILE",
+                        help=f"exit {EXIT_PERF_REGRESSION} if p95 latency regressed against FILE")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_BASELINE_TOLERANCE,
+                        help=f"allowed p95 increase as a fraction (default {DEFAULT_BASELINE_TOLERANCE})")
+    # Every check reads the response body, which the shared probe cache does not
+    # hold, so results are never reused; accepted so callers can pass it to every tool
+    parser.add_argument("--no-cache", action="store_true",
+                        help="accepted for consistency with the other tools; checks always hit the server")
+    parser.add_argument("--samples", type=int, default=DEFAULT_BASELINE_SAMPLES,
+                        help=f"latency samples per endpoint outside --load (default {DEFAULT_BASELINE_SAMPLES})")
+    args = parser.parse_args()
+    
+    if args.load:
+        tester = APITester(args.base_url, pool_size=args.users)
+        duration = None if args.total_requests else args.duration
+        exit_code = tester.run_load_test(args.users, duration=duration,
+                                         total_requests=args.total_requests)
     else:
-        base_url = "http://127.0.0.1:8000"
+        tester = APITester(args.base_url, pool_size=args.workers)
+        exit_code = tester.run_all_tests(concurrent=args.concurrent, workers=args.workers)
+        if args.record_baseline or args.baseline:
+            tester.measure_latencies(args.samples)
     
-    tester = APITester(base_url)
-    exit_code = tester.run_all_tests()
+    if args.record_baseline and not tester.save_baseline(args.record_baseline):
+        exit_code = 2
+    if args.baseline:
+        regressions = tester.compare_to_baseline(args.baseline, args.tolerance)
+        if regressions is None:
+            exit_code = 2
+        # Functional failures (2) take precedence over a performance regression
+        elif regressions and exit_code != 2:
+            print(f"\n{Colors.RED}🐢 PERFORMANCE REGRESSION in {regressions} endpoint(s){Colors.ENDC}")
+            exit_code = EXIT_PERF_REGRESSION
     sys.exit(exit_code)
 
 if __name__ == "__main__":
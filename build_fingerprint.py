@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Build Fingerprint for Frappe LMS
+Content-hashes the LMS frontend sources, lockfiles and build config so
+`bench build` can be skipped when nothing it reads has changed and its
+output is still intact. The fingerprint is stored next to the output in
+lms/public/frontend.
+
+Usage:
+    python3 build_fingerprint.py          # report whether a rebuild is needed
+    python3 build_fingerprint.py record   # record the current tree as built
+"""
+
+import hashlib
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+BENCH_PATH = "/workspaces/The-frappe-LMS-/lms-bench"
+APP_PATH = f"{BENCH_PATH}/apps/lms"
+FRONTEND_OUTPUT = f"{APP_PATH}/lms/public/frontend"
+FINGERPRINT_FILE = os.path.join(FRONTEND_OUTPUT, ".build-fingerprint.json")
+
+# Inputs relative to the app: source trees, lockfiles and build config
+INPUT_TREES = ["frontend/src", "frontend/public", "lms/public"]
+INPUT_FILES = [
+    "package.json", "yarn.lock",
+    "frontend/package.json", "frontend/yarn.lock", "frontend/index.html",
+    "frontend/vite.config.js", "frontend/vite.config.ts",
+    "frontend/tailwind.config.js", "frontend/postcss.config.js",
+]
+SKIP_DIRS = {"node_modules", ".git", "__pycache__", "dist"}
+# Other apps bench build also compiles; their git HEAD stands in for their sources
+OTHER_APPS = ["frappe"]
+
+def git_head(repo_path):
+    """Resolve a repo's HEAD commit by reading .git directly (no subprocess)"""
+    git_dir = os.path.join(repo_path, ".git")
+    try:
+        with open(os.path.join(git_dir, "HEAD")) as f:
+            head = f.read().strip()
+        if not head.startswith("ref: "):
+            return head
+        ref = head[5:]
+        ref_path = os.path.join(git_dir, ref)
+        if os.path.exists(ref_path):
+            with open(ref_path) as f:
+                return f.read().strip()
+        with open(os.path.join(git_dir, "packed-refs")) as f:
+            for line in f:
+                if line.rstrip().endswith(" " + ref):
+                    return line.split()[0]
+    except OSError:
+        pass
+    return None
+
+def list_inputs(app_path=APP_PATH):
+    """Return the sorted relative paths of every build input"""
+    output_dir = os.path.relpath(FRONTEND_OUTPUT, app_path)
+    paths = [path for path in INPUT_FILES if os.path.isfile(os.path.join(app_path, path))]
+    for tree in INPUT_TREES:
+        for root, dirs, files in os.walk(os.path.join(app_path, tree)):
+            rel_root = os.path.relpath(root, app_path)
+            dirs[:] = [d for d in dirs if d not in SKIP_DIRS
+                       and os.path.join(rel_root, d) != output_dir]
+            paths += [os.path.join(rel_root, name) for name in files]
+    return sorted(set(paths))
+
+def hash_file(path):
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def compute_fingerprint(app_path=APP_PATH, previous=None, max_workers=8):
+    """Hash every input in parallel; files whose size and mtime match the
+    previous fingerprint reuse their recorded digest without being read"""
+    known = (previous or {}).get("files", {})
+    files = {}
+    to_hash = []
+    for rel_path in list_inputs(app_path):
+        stat = os.stat(os.path.join(app_path, rel_path))
+        entry = known.get(rel_path)
+        if entry and entry[0] == stat.st_size and entry[1] == stat.st_mtime_ns:
+            files[rel_path] = entry
+        else:
+            files[rel_path] = [stat.st_size, stat.st_mtime_ns, None]
+            to_hash.append(rel_path)
+
+    # hashlib releases the GIL on large buffers, so threads hash in parallel
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        digests = executor.map(lambda rel: hash_file(os.path.join(app_path, rel)), to_hash)
+        for rel_path, digest in zip(to_hash, digests):
+            files[rel_path][2] = digest
+
+    combined = hashlib.blake2b(digest_size=16)
+    for rel_path in sorted(files):
+        combined.update(f"{rel_path}\0{files[rel_path][2]}\n".encode())
+    for app in OTHER_APPS:
+        combined.update(f"{app}@{git_head(os.path.join(os.path.dirname(app_path), app))}\n".encode())
+
+    return {"inputs": combined.hexdigest(), "files": files, "hashed": len(to_hash)}
+
+def output_manifest(output_path=FRONTEND_OUTPUT):
+    """Relative path -> size for every build output file"""
+    manifest = {}
+    for root, dirs, files in os.walk(output_path):
+        for name in files:
+            path = os.path.join(root, name)
+            if path != FINGERPRINT_FILE:
+                manifest[os.path.relpath(path, output_path)] = os.path.getsize(path)
+    return manifest
+
+def outputs_intact(manifest, output_path=FRONTEND_OUTPUT):
+    if not manifest:
+        return False
+    for rel_path, size in manifest.items():
+        path = os.path.join(output_path, rel_path)
+        if not os.path.isfile(path) or os.path.getsize(path) != size:
+            return False
+    return True
+
+def load_fingerprint(path=FINGERPRINT_FILE):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def save_fingerprint(fingerprint, path=FINGERPRINT_FILE):
+    """Write the fingerprint atomically together with the current output manifest"""
+    data = {"inputs": fingerprint["inputs"], "files": fingerprint["files"],
+            "outputs": output_manifest(os.path.dirname(path))}
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+def check_build():
+    """Return (needs_build, reason, fingerprint)"""
+    previous = load_fingerprint()
+    fingerprint = compute_fingerprint(previous=previous)
+    if previous is None:
+        return True, "no previous build fingerprint", fingerprint
+    if previous.get("inputs") != fingerprint["inputs"]:
+        return True, "frontend sources, lockfiles or build config changed", fingerprint
+    if not outputs_intact(previous.get("outputs")):
+        return True, "build output missing or modified", fingerprint
+    return False, "inputs unchanged and output intact", fingerprint
+
+def build_if_needed(run_build, force=False):
+    """Call run_build() unless the fingerprint says the output is current.
+
+    run_build must return True on success; the fingerprint is only recorded
+    after a successful build. Returns True if a build ran.
+    """
+    needs_build, reason, fingerprint = check_build()
+    if not needs_build and not force:
+        print(f"⏭️  Skipping bench build: {reason} (use --force to rebuild)")
+        return False
+    print(f"🔨 Building assets: {'forced' if force and not needs_build else reason}")
+    if run_build():
+        if os.path.isdir(FRONTEND_OUTPUT):
+            # Re-hash: the build may have touched inputs (e.g. generated files)
+            save_fingerprint(compute_fingerprint(previous=fingerprint))
+    return True
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "record":
+        save_fingerprint(compute_fingerprint(previous=load_fingerprint()))
+        print(f"✓ Build fingerprint recorded in {FINGERPRINT_FILE}")
+        return 0
+    needs_build, reason, fingerprint = check_build()
+    print(f"{'🔨 Rebuild needed' if needs_build else '✓ Build is current'}: {reason} "
+          f"({len(fingerprint['files'])} inputs, {fingerprint['hashed']} hashed)")
+    return 1 if needs_build else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,51 @@
 #!/usr/bin/env python3
+"""
+Create LMS users.
+
+Usage:
+    python3 create_users.py                    # admin, student and evaluator logins
+    python3 create_users.py bulk 50000 [--workers 4] [--batch 2000]
+        [--roles "LMS Student=90,Batch Evaluator=8,LMS Admin=2"] [--password seed123] [--seed 42]
+    python3 create_users.py dataset --scale 10 [--seed 42] [--batch 2000] [--workers 4]
+
+Bulk mode writes User, Has Role and __Auth rows directly with batched
+inserts instead of one insert() per user, so user hooks (welcome emails,
+LMS profile setup) do not run. Every seeded user gets the same password,
+hashed once.
+
+Dataset mode builds a courses/chapters/lessons/batches/enrollments/quiz
+submissions/progress graph on top of the seeded users. The same seed and
+scale always produce the same rows, and rerunning it skips rows that exist.
+"""
+
+import itertools
+import multiprocessing
+import random
+import sys
+import time
 
 import frappe
 from frappe.utils import getdate
 
+SITE = "lms.local"
+SITES_PATH = "/workspaces/The-frappe-LMS-/lms-bench/sites"
+SEED_DOMAIN = "seed.lms.local"
+DEFAULT_ROLE_MIX = "LMS Student=90,Batch Evaluator=8,LMS Admin=2"
+# Seeded role -> (user type, roles granted), as for the hand-made users above
+ROLE_GRANTS = {
+    "LMS Student": ("Website User", ["LMS Student"]),
+    "Batch Evaluator": ("System User", ["LMS Student", "Batch Evaluator"]),
+    "LMS Admin": ("System User", ["LMS Admin"]),
+}
+FIRST_NAMES = ["Asha", "Ben", "Chen", "Dana", "Elif", "Femi", "Gita", "Hugo", "Ines", "Jon",
+               "Kofi", "Lena", "Mateo", "Nia", "Omar", "Priya", "Quinn", "Rosa", "Sven", "Tariq"]
+LAST_NAMES = ["Adeyemi", "Brown", "Costa", "Dubois", "Evans", "Fischer", "Garcia", "Haddad",
+              "Ivanova", "Jensen", "Kim", "Lopez", "Mensah", "Nakamura", "Okafor", "Patel"]
+USER_FIELDS = ["name", "email", "first_name", "last_name", "full_name", "user_type", "enabled",
+               "send_welcome_email", "creation", "modified", "owner", "modified_by", "docstatus"]
+ROLE_FIELDS = ["name", "parent", "parenttype", "parentfield", "idx", "role",
+               "creation", "modified", "owner", "modified_by", "docstatus"]
+
 def create_users():
     # Connect to the site
     frappe.connect()
@@ -76,5 +119,318 @@ def create_users():
     print("Roles: LMS Student, Batch Evaluator")
     print("=" * 50)
 
+def parse_role_mix(text):
+    """'LMS Student=90,LMS Admin=10' -> [(role, weight)]"""
+    mix = []
+    for part in text.split(","):
+        role, _, weight = part.partition("=")
+        role = role.strip()
+        if role not in ROLE_GRANTS:
+            raise ValueError(f"unknown role {role!r} (choose from {', '.join(ROLE_GRANTS)})")
+        mix.append((role, float(weight or 1)))
+    return mix
+
+def connect_site():
+    if not getattr(frappe.local, "site", None):
+        frappe.init(site=SITE, sites_path=SITES_PATH)
+    frappe.connect()
+
+def seed_rows(index, role, now):
+    """User, Has Role and __Auth rows for synthetic user number `index`"""
+    rng = random.Random(index)
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    email = f"user{index:07d}@{SEED_DOMAIN}"
+    user_type, roles = ROLE_GRANTS[role]
+    user = (email, email, first, last, f"{first} {last}", user_type, 1, 0,
+            now, now, "Administrator", "Administrator", 0)
+    has_roles = [(f"{email}-role-{idx}", email, "User", "roles", idx, granted,
+                  now, now, "Administrator", "Administrator", 0)
+                 for idx, granted in enumerate(roles, 1)]
+    return user, has_roles
+
+def insert_auth(emails, password_hash):
+    placeholders = ", ".join(["('User', %s, 'password', %s, 0)"] * len(emails))
+    params = [value for email in emails for value in (email, password_hash)]
+    frappe.db.sql(f"INSERT IGNORE INTO `__Auth` (doctype, name, fieldname, password, encrypted) "
+                  f"VALUES {placeholders}", params)
+
+def seed_range(start, stop, roles, password_hash, batch_size):
+    """Insert users start..stop-1 in batches, committing after each; return rows written"""
+    connect_site()
+    rows = 0
+    try:
+        for batch_start in range(start, stop, batch_size):
+            now = frappe.utils.now()
+            users, has_roles = [], []
+            for index in range(batch_start, min(batch_start + batch_size, stop)):
+                user, user_roles = seed_rows(index, roles[index], now)
+                users.append(user)
+                has_roles += user_roles
+            frappe.db.bulk_insert("User", USER_FIELDS, users, ignore_duplicates=True)
+            frappe.db.bulk_insert("Has Role", ROLE_FIELDS, has_roles, ignore_duplicates=True)
+            insert_auth([user[0] for user in users], password_hash)
+            frappe.db.commit()
+            rows += len(users) * 2 + len(has_roles)
+    finally:
+        frappe.destroy()
+    return rows
+
+def assign_roles(count, role_mix=DEFAULT_ROLE_MIX, seed=42):
+    """Role per seeded user index; the same seed always yields the same prefix"""
+    mix = parse_role_mix(role_mix)
+    rng = random.Random(seed)
+    return rng.choices([role for role, _ in mix], weights=[weight for _, weight in mix], k=count)
+
+def users_for_students(students, role_mix=DEFAULT_ROLE_MIX, seed=42):
+    """How many users bulk_create_users must seed for `students` of them to be
+    Website User students under the role mix"""
+    mix = parse_role_mix(role_mix)
+    if not any(ROLE_GRANTS[role][0] == "Website User" and weight > 0 for role, weight in mix):
+        raise ValueError(f"role mix {role_mix!r} seeds no students")
+    # choices() draws one random() per user, so drawing one at a time walks the same sequence
+    rng = random.Random(seed)
+    population, weights = [role for role, _ in mix], [weight for _, weight in mix]
+    count = found = 0
+    while found < students:
+        role = rng.choices(population, weights=weights)[0]
+        count += 1
+        found += ROLE_GRANTS[role][0] == "Website User"
+    return count
+
+def bulk_create_users(count, role_mix=DEFAULT_ROLE_MIX, workers=1, batch_size=2000,
+                      password="seed123", seed=42):
+    from frappe.utils.password import passlibctx
+
+    mix = parse_role_mix(role_mix)
+    roles = assign_roles(count, role_mix, seed)
+
+    # Hashing is deliberately slow (pbkdf2/argon2); every seeded user shares one hash
+    password_hash = passlibctx.hash(password)
+
+    start = time.perf_counter()
+    workers = max(1, min(workers, count))
+    bounds = [count * i // workers for i in range(workers + 1)]
+    jobs = [(bounds[i], bounds[i + 1], roles, password_hash, batch_size) for i in range(workers)]
+    if workers == 1:
+        rows = seed_range(*jobs[0])
+    else:
+        # Each worker opens its own database connection after the fork
+        with multiprocessing.get_context("fork").Pool(workers) as pool:
+            rows = sum(pool.starmap(seed_range, jobs))
+    elapsed = time.perf_counter() - start
+
+    print(f"✅ Seeded {count} users ({rows} rows) in {elapsed:.1f}s with {workers} worker(s): "
+          f"{count / elapsed:.0f} users/sec, {rows / elapsed:.0f} rows/sec")
+    for role, _ in mix:
+        print(f"   {role}: {roles.count(role)}")
+    print(f"   Login as user0000000@{SEED_DOMAIN} ... with password: {password}")
+
+# Rows per 1x of --scale; everything else is derived from these
+DATASET_BASE = {"students": 1000, "courses": 20, "batches": 10}
+COURSE_TOPICS = ["Python", "Data Science", "Web Development", "Design", "Statistics", "Marketing",
+                 "Frappe Framework", "Machine Learning", "Writing", "Finance"]
+COURSE_LEVELS = ["Basics", "Fundamentals", "in Practice", "Advanced", "Masterclass"]
+
+class BulkWriter:
+    """Buffers rows for one doctype and writes them with bulk_insert, committing
+    after every batch. Columns the doctype does not have on this LMS version
+    (per frappe.get_meta) are dropped; missing doctypes are skipped."""
+
+    def __init__(self, doctype, batch_size):
+        self.doctype = doctype
+        self.batch_size = batch_size
+        self.enabled = bool(frappe.db.table_exists(doctype))
+        self.columns = set(frappe.get_meta(doctype).get_valid_columns()) if self.enabled else set()
+        self.fields = None
+        self.buffer = []
+        self.rows = 0
+
+    def add(self, row):
+        if not self.enabled:
+            return
+        if self.fields is None:
+            self.fields = [field for field in row if field in self.columns]
+        self.buffer.append(tuple(row.get(field) for field in self.fields))
+        if len(self.buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if self.buffer:
+            frappe.db.bulk_insert(self.doctype, self.fields, self.buffer, ignore_duplicates=True)
+            frappe.db.commit()
+            self.rows += len(self.buffer)
+            self.buffer = []
+
+class Dataset:
+    """Streams a deterministic LMS graph into the database"""
+
+    def __init__(self, seed, batch_size):
+        self.seed = seed
+        self.batch_size = batch_size
+        self.writers = {}
+        self.now = frappe.utils.now()
+
+    def rng(self, section):
+        # One generator per section keeps each section stable if another changes
+        return random.Random(f"{self.seed}:{section}")
+
+    def add(self, doctype, name, **values):
+        writer = self.writers.get(doctype)
+        if writer is None:
+            writer = self.writers[doctype] = BulkWriter(doctype, self.batch_size)
+        writer.add(dict(name=name, creation=self.now, modified=self.now, owner="Administrator",
+                        modified_by="Administrator", docstatus=0, **values))
+
+    def add_child(self, doctype, parent, parenttype, parentfield, idx, **values):
+        self.add(doctype, f"{parent}-{parentfield}-{idx}", parent=parent, parenttype=parenttype,
+                 parentfield=parentfield, idx=idx, **values)
+
+    def courses(self, count, instructors):
+        """Courses with chapters, lessons and one quiz per chapter; returns the outline"""
+        rng = self.rng("courses")
+        outline = []
+        for c in range(count):
+            course = f"seed-course-{c:05d}"
+            title = f"{rng.choice(COURSE_TOPICS)} {rng.choice(COURSE_LEVELS)} {c}"
+            self.add("LMS Course", course, title=title, published=int(rng.random() < 0.9), upcoming=0,
+                     short_introduction=f"An introduction to {title}.", description=f"<p>{title}</p>",
+                     paid_course=0)
+            self.add_child("Course Instructor", course, "LMS Course", "instructors", 1,
+                           instructor=rng.choice(instructors))
+            chapters = []
+            for k in range(rng.randint(4, 8)):
+                chapter = f"{course}-ch{k:02d}"
+                self.add("Course Chapter", chapter, title=f"Chapter {k + 1}", course=course)
+                self.add_child("Chapter Reference", course, "LMS Course", "chapters", k + 1, chapter=chapter)
+                lessons = []
+                for l in range(rng.randint(3, 7)):
+                    lesson = f"{chapter}-l{l:02d}"
+                    self.add("Course Lesson", lesson, title=f"Lesson {k + 1}.{l + 1}", chapter=chapter,
+                             course=course, include_in_preview=int(l == 0),
+                             content=f"Lesson {k + 1}.{l + 1} of {title}")
+                    self.add_child("Lesson Reference", chapter, "Course Chapter", "lessons", l + 1, lesson=lesson)
+                    lessons.append(lesson)
+                quiz = f"{chapter}-quiz"
+                self.add("LMS Quiz", quiz, title=f"{title} quiz {k + 1}", course=course, lesson=lessons[-1],
+                         passing_percentage=70, max_attempts=0)
+                chapters.append((chapter, lessons, quiz))
+            outline.append((course, chapters))
+        return outline
+
+    def batches(self, count, outline, students):
+        rng = self.rng("batches")
+        start = getdate(self.now)
+        for b in range(count):
+            batch = f"seed-batch-{b:04d}"
+            start_date = frappe.utils.add_days(start, rng.randint(-60, 60))
+            self.add("LMS Batch", batch, title=f"Cohort {b + 1}", published=1, seat_count=50,
+                     start_date=start_date, end_date=frappe.utils.add_days(start_date, 42),
+                     start_time="10:00:00", end_time="12:00:00", timezone="UTC",
+                     description=f"Seeded cohort {b + 1}", batch_details=f"<p>Seeded cohort {b + 1}</p>")
+            for idx, (course, _) in enumerate(rng.sample(outline, min(3, len(outline))), 1):
+                self.add_child("Batch Course", batch, "LMS Batch", "courses", idx, course=course)
+            for student in rng.sample(students, min(len(students), rng.randint(10, 50))):
+                self.add("LMS Batch Enrollment", f"{batch}-{student}", batch=batch, member=student)
+
+    def enrollments(self, outline, students):
+        """Each student takes 1-5 courses, skewed towards popular ones, with
+        lesson progress and quiz submissions for the chapters they finished"""
+        rng = self.rng("enrollments")
+        # Zipf-like popularity: course n is taken 1/n as often as the first
+        cum_weights = list(itertools.accumulate(1 / (rank + 1) for rank in range(len(outline))))
+        indexes = range(len(outline))
+        for student in students:
+            taken = set(rng.choices(indexes, cum_weights=cum_weights, k=rng.randint(1, 5)))
+            for index in sorted(taken):
+                course, chapters = outline[index]
+                lessons = [(chapter, lesson) for chapter, chapter_lessons, _ in chapters for lesson in chapter_lessons]
+                done = int(len(lessons) * rng.random() ** 0.7)
+                enrollment = f"seed-enrollment-{course}-{student}"
+                self.add("LMS Enrollment", enrollment, course=course, member=student, member_type="Student",
+                         role="Member", progress=round(done * 100 / len(lessons), 1),
+                         current_lesson=lessons[min(done, len(lessons) - 1)][1])
+                for chapter, lesson in lessons[:done]:
+                    self.add("LMS Course Progress", f"{lesson}-{student}", member=student, course=course,
+                             chapter=chapter, lesson=lesson, status="Complete")
+                finished = done
+                for chapter, chapter_lessons, quiz in chapters:
+                    if finished < len(chapter_lessons):
+                        break
+                    finished -= len(chapter_lessons)
+                    if rng.random() < 0.7:
+                        score = rng.randint(3, 10)
+                        self.add("LMS Quiz Submission", f"{quiz}-{student}", quiz=quiz, member=student,
+                                 course=course, score=score, score_out_of=10, percentage=score * 10,
+                                 passing_percentage=70)
+
+    def flush(self):
+        for writer in self.writers.values():
+            writer.flush()
+
+def generate_dataset(scale=1, seed=42, batch_size=2000, workers=1):
+    """Seed users if needed, then stream courses, batches, enrollments, quiz
+    submissions and progress for `scale` times the base dataset"""
+    students_needed = int(DATASET_BASE["students"] * scale)
+    connect_site()
+    seeded_students = frappe.db.count("User", {"name": ["like", f"%@{SEED_DOMAIN}"], "user_type": "Website User"})
+    if seeded_students < students_needed:
+        # Only part of the role mix are students, so seed enough users to reach the target
+        frappe.destroy()
+        bulk_create_users(users_for_students(students_needed, seed=seed),
+                          workers=workers, batch_size=batch_size, seed=seed)
+        connect_site()
+
+    start = time.perf_counter()
+    try:
+        users = frappe.get_all("User", filters={"name": ["like", f"%@{SEED_DOMAIN}"]},
+                               fields=["name", "user_type"], order_by="name")
+        students = [user.name for user in users if user.user_type == "Website User"][:students_needed]
+        instructors = [user.name for user in users if user.user_type == "System User"] or ["Administrator"]
+
+        dataset = Dataset(seed, batch_size)
+        outline = dataset.courses(max(1, int(DATASET_BASE["courses"] * scale)), instructors)
+        dataset.batches(max(1, int(DATASET_BASE["batches"] * scale)), outline, students)
+        dataset.enrollments(outline, students)
+        dataset.flush()
+    finally:
+        frappe.destroy()
+    elapsed = time.perf_counter() - start
+
+    total = sum(writer.rows for writer in dataset.writers.values())
+    print(f"✅ Generated {scale}x dataset (seed {seed}): {total} rows in {elapsed:.1f}s, {total / elapsed:.0f} rows/sec")
+    for doctype, writer in dataset.writers.items():
+        print(f"   {doctype}: {writer.rows if writer.enabled else 'skipped (doctype not installed)'}")
+
+def option(args, name, default, cast=str):
+    """Value after --name in args, or print usage and exit 1 when it is missing or malformed"""
+    if name not in args:
+        return default
+    index = args.index(name)
+    try:
+        return cast(args[index + 1])
+    except (IndexError, ValueError):
+        value = f"invalid value {args[index + 1]!r}" if index + 1 < len(args) else "a missing value"
+        print(f"❌ {name} has {value}")
+        print("Usage:" + __doc__.split("Usage:", 1)[1].split("\n\n", 1)[0].rstrip())
+        sys.exit(1)
+
 if __name__ == "__main__":
-    create_users()
+    args = sys.argv[1:]
+    if args and args[0] == "bulk":
+        try:
+            bulk_create_users(int(args[1]) if len(args) > 1 and args[1].isdigit() else 1000,
+                              role_mix=option(args, "--roles", DEFAULT_ROLE_MIX),
+                              workers=option(args, "--workers", 1, int),
+                              batch_size=option(args, "--batch", 2000, int),
+                              password=option(args, "--password", "seed123"),
+                              seed=option(args, "--seed", 42, int))
+        except ValueError as e:
+            print(f"❌ {e}")
+            sys.exit(2)
+    elif args and args[0] == "dataset":
+        generate_dataset(scale=option(args, "--scale", 1, float),
+                         seed=option(args, "--seed", 42, int),
+                         batch_size=option(args, "--batch", 2000, int),
+                         workers=option(args, "--workers", 1, int))
+    else:
+        create_users()
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Lightweight MariaDB Probe for Frappe LMS
+Connects straight to the site database using the credentials in the site
+config and keeps a small pool of reused connections, instead of booting a
+whole Frappe process with `bench execute`.
+
+Usage:
+    python3 db_probe.py            # probe once and print timings
+    python3 db_probe.py 10         # probe 10 times over the pooled connection
+"""
+
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from collections import namedtuple
+
+try:
+    import pymysql as db_driver
+except ImportError:
+    try:
+        import MySQLdb as db_driver
+    except ImportError:
+        db_driver = None
+
+BENCH_PATH = "/workspaces/The-frappe-LMS-/lms-bench"
+SITE = "lms.local"
+
+DBProbeResult = namedtuple("DBProbeResult", "ok connect_ms query_ms threads_connected reused error")
+
+def read_site_config(site=SITE, bench_path=BENCH_PATH):
+    """Merge common_site_config.json and the site's site_config.json"""
+    sites_path = os.path.join(bench_path, "sites")
+    config = {}
+    for path in (os.path.join(sites_path, "common_site_config.json"),
+                 os.path.join(sites_path, site, "site_config.json")):
+        try:
+            with open(path) as f:
+                config.update(json.load(f))
+        except (FileNotFoundError, ValueError):
+            continue
+    return config
+
+class MariaDBProbe:
+    """Probe MariaDB over a small pool of reused connections"""
+
+    def __init__(self, config, pool_size=2, connect_timeout=2, query_timeout=3):
+        self.connect_args = {
+            "host": config.get("db_host") or "127.0.0.1",
+            "port": int(config.get("db_port") or 3306),
+            "user": config.get("db_user") or config["db_name"],
+            "password": config.get("db_password", ""),
+            "database": config["db_name"],
+            "connect_timeout": connect_timeout,
+            # Without these a hung query or stalled server blocks the probe thread forever
+            "read_timeout": query_timeout,
+            "write_timeout": query_timeout,
+        }
+        self.pool = queue.LifoQueue(maxsize=pool_size)
+
+    def _connect(self):
+        start = time.perf_counter()
+        connection = db_driver.connect(**self.connect_args)
+        return connection, (time.perf_counter() - start) * 1000
+
+    def probe(self):
+        """Run SELECT 1 and read Threads_connected; return a DBProbeResult"""
+        connect_ms = None
+        reused = True
+        try:
+            connection = self.pool.get_nowait()
+        except queue.Empty:
+            connection = None
+
+        try:
+            if connection is None:
+                reused = False
+                connection, connect_ms = self._connect()
+
+            start = time.perf_counter()
+            cursor = connection.cursor()
+            cursor.execute("SELECT 1")
+            cursor.fetchall()
+            query_ms = (time.perf_counter() - start) * 1000
+
+            cursor.execute("SHOW GLOBAL STATUS LIKE 'Threads_connected'")
+            row = cursor.fetchone()
+            cursor.close()
+            threads = int(row[1]) if row else None
+        except Exception as e:
+            if connection is not None:
+                try:
+                    connection.close()
+                except Exception:
+                    pass
+            # A pooled connection may simply have gone stale; retry once fresh
+            if reused and connection is not None:
+                return self.probe()
+            return DBProbeResult(False, connect_ms, None, None, reused, f"{type(e).__name__}: {str(e)[:80]}")
+
+        try:
+            self.pool.put_nowait(connection)
+        except queue.Full:
+            connection.close()
+        return DBProbeResult(True, connect_ms, query_ms, threads, reused, None)
+
+    def close(self):
+        while True:
+            try:
+                self.pool.get_nowait().close()
+            except queue.Empty:
+                return
+            except Exception:
+                continue
+
+def describe(result):
+    """One-line summary of a DBProbeResult"""
+    if not result.ok:
+        return result.error
+    connect = "pooled" if result.reused else f"connect {result.connect_ms:.1f}ms"
+    return f"{connect}, query {result.query_ms:.1f}ms, {result.threads_connected} threads"
+
+_probe = None
+_probe_lock = threading.Lock()
+
+def get_mariadb_probe(site=SITE, bench_path=BENCH_PATH):
+    """Return the process-wide probe, or None if no driver or site config is available"""
+    global _probe
+    with _probe_lock:
+        if _probe is None:
+            if db_driver is None:
+                return None
+            config = read_site_config(site, bench_path)
+            if "db_name" not in config:
+                return None
+            _probe = MariaDBProbe(config)
+        return _probe
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1
+    probe = get_mariadb_probe()
+    if probe is None:
+        print("✗ MariaDB probe unavailable (install pymysql and check the site config)")
+        return 2
+
+    result = None
+    for _ in range(count):
+        result = probe.probe()
+        print(f"{'✓' if result.ok else '✗'} MariaDB - {describe(result)}")
+    probe.close()
+    return 0 if result.ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,7 +7,14 @@ Quick commands for common development tasks
 import subprocess
 import sys
 import os
-import time
+
+from build_fingerprint import build_if_needed
+from readiness import wait_until_ready, wait_until_down
+from start_orchestrator import start_all, stop_all
+from log_tail import show_log
+from log_index import analyze
+
+BENCH_SERVICES = ["web", "socketio", "redis-queue", "redis-cache"]
 
 def run_command(cmd, description="", show_output=True):
     """Run a shell command"""
@@ -28,16 +35,22 @@ def dev_start():
     print("🔥 Starting Frappe LMS Development Environment")
     print("=" * 50)
     
-    # Ensure MariaDB is running
-    print("1. Starting MariaDB...")
-    os.system("sudo service mariadb start")
-    time.sleep(2)
-    
-    # Start bench in background
-    print("2. Starting Frappe services...")
-    print("   Note: This will run in the background. Check with 'dev monitor'")
-    os.system("cd /workspaces/The-frappe-LMS-/lms-bench && nohup bench start > /tmp/bench.log 2>&1 &")
-    time.sleep(5)
+    if "--legacy" in sys.argv:
+        # Ensure MariaDB is running
+        print("1. Starting MariaDB...")
+        os.system("sudo service mariadb start")
+        wait_until_ready(["mariadb"], timeout=30)
+        
+        # Start bench in background
+        print("2. Starting Frappe services...")
+        print("   Note: This will run in the background. Check with 'dev monitor'")
+        os.system("cd /workspaces/The-frappe-LMS-/lms-bench && nohup bench start > /tmp/bench.log 2>&1 &")
+        wait_until_ready(BENCH_SERVICES)
+    else:
+        # MariaDB, Redis, web, socketio and workers start in parallel as their dependencies come up
+        print("1-2. Starting MariaDB and Frappe services from the Procfile...")
+        print("   Note: This will run in the background. Check with 'dev monitor'")
+        start_all()
     
     print("3. Checking services...")
     os.system("python3 /workspaces/The-frappe-LMS-/service_monitor.py")
@@ -47,10 +60,13 @@ def dev_stop():
     print("🛑 Stopping Frappe LMS Development Environment")
     print("=" * 50)
     
-    # Kill bench processes
+    # Components started by the orchestrator, then anything started by 'bench start'
+    stop_all()
     os.system("pkill -f 'bench start'")
     os.system("pkill -f 'redis-server'")
     os.system("pkill -f 'socketio'")
+    # Wait for the ports to close so a following start cannot hit "address in use"
+    wait_until_down(BENCH_SERVICES)
     print("✓ Stopped Frappe services")
 
 def dev_restart():
@@ -58,20 +74,19 @@ def dev_restart():
     print("🔄 Restarting Frappe LMS Development Environment")
     print("=" * 50)
     dev_stop()
-    time.sleep(3)
     dev_start()
 
 def dev_logs():
     """Show development logs"""
+    args = sys.argv[2:]
+    if "--analyze" in args:
+        print("🔎 Analyzing /tmp/bench.log:")
+        print("=" * 50)
+        analyze([arg for arg in args if arg != "--analyze"])
+        return
     print("📋 Recent logs from /tmp/bench.log:")
     print("=" * 50)
-    try:
-        with open("/tmp/bench.log", "r") as f:
-            lines = f.readlines()
-            for line in lines[-50:]:  # Last 50 lines
-                print(line.rstrip())
-    except FileNotFoundError:
-        print("No log file found. Start services first with 'dev start'")
+    show_log(args)
 
 def dev_reset():
     """Reset development environment (nuclear option)"""
@@ -80,7 +95,7 @@ def dev_reset():
     print("⚠️  This will:")
     print("   - Stop all services")
     print("   - Clear all caches")
-    print("   - Rebuild assets")
+    print("   - Rebuild assets (skipped if unchanged, unless --force)")
     print("   - Restart MariaDB")
     print()
     
@@ -94,13 +109,13 @@ def dev_reset():
     
     # Reset database
     os.system("sudo service mariadb restart")
-    time.sleep(3)
+    wait_until_ready(["mariadb"], timeout=30)
     
     # Clear caches and rebuild
     os.chdir("/workspaces/The-frappe-LMS-/lms-bench")
     run_command("bench clear-cache", "Clearing cache")
     run_command("bench clear-website-cache", "Clearing website cache")
-    run_command("bench build", "Rebuilding assets")
+    build_if_needed(lambda: run_command("bench build", "Rebuilding assets"), force="--force" in sys.argv)
     
     print("✅ Reset complete! Run 'dev start' to restart services.")
 
@@ -110,12 +125,14 @@ def dev_test():
     print("=" * 50)
     
     os.chdir("/workspaces/The-frappe-LMS-")
+    # The service monitor reuses the health check's port and DB probes unless --no-cache
+    cache_flag = " --no-cache" if "--no-cache" in sys.argv else ""
     
     print("1. Health Check...")
-    os.system("python3 health_check.py")
+    os.system(f"python3 health_check.py{cache_flag}")
     
     print("\n2. Service Monitor...")
-    os.system("python3 service_monitor.py")
+    os.system(f"python3 service_monitor.py{cache_flag}")
 
 def main():
     if len(sys.argv) < 2:
@@ -124,12 +141,13 @@ def main():
         print("Usage: python3 dev_helper.py <command>")
         print()
         print("Commands:")
-        print("  start     - Start development environment")
+        print("  start     - Start development environment (--legacy for plain 'bench start')")
         print("  stop      - Stop all services")
         print("  restart   - Restart all services")
-        print("  logs      - Show recent logs")
-        print("  reset     - Reset environment (nuclear option)")
-        print("  test      - Run health checks")
+        print("  logs      - Show recent logs ([N] [--follow] [--process web|worker|socketio|redis])")
+        print("              logs --analyze [summary|exceptions|slow|crashes|status] [--since 1h]")
+        print("  reset     - Reset environment (nuclear option, --force to always rebuild)")
+        print("  test      - Run health checks (--no-cache to re-probe everything)")
         print("  monitor   - Continuous service monitoring")
         print()
         print("Examples:")
@@ -4,14 +4,27 @@ Frappe LMS Health Check Script
 Run this script to quickly check if all services and APIs are working correctly
 """
 
-import requests
 import subprocess
 import json
+import threading
 import time
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from datetime import datetime
 
+from lms_probes import enable_cache, probe_http, probe_mariadb
+from proc_inspector import ProcessInspector, alerts, format_sample
+from socket_table import get_socket_table
+
+BENCH_PATH = "/workspaces/The-frappe-LMS-/lms-bench"
+BASE_URL = "http://127.0.0.1:8000"
+API_TIMEOUT = 10
+
+# Checks run on worker threads buffer their output here so it can be
+# printed in declaration order once the check finishes
+_output = threading.local()
+
 class Colors:
     GREEN = '\033[92m'
     RED = '\033[91m'
@@ -20,22 +33,30 @@ class Colors:
     ENDC = '\033[0m'
     BOLD = '\033[1m'
 
-def print_status(message, status="INFO"):
+def format_status(message, status="INFO"):
     timestamp = datetime.now().strftime("%H:%M:%S")
     if status == "SUCCESS":
-        print(f"{Colors.GREEN}✓ [{timestamp}] {message}{Colors.ENDC}")
+        return f"{Colors.GREEN}✓ [{timestamp}] {message}{Colors.ENDC}"
     elif status == "ERROR":
-        print(f"{Colors.RED}✗ [{timestamp}] {message}{Colors.ENDC}")
+        return f"{Colors.RED}✗ [{timestamp}] {message}{Colors.ENDC}"
     elif status == "WARNING":
-        print(f"{Colors.YELLOW}⚠ [{timestamp}] {message}{Colors.ENDC}")
+        return f"{Colors.YELLOW}⚠ [{timestamp}] {message}{Colors.ENDC}"
     else:
-        print(f"{Colors.BLUE}ℹ [{timestamp}] {message}{Colors.ENDC}")
+        return f"{Colors.BLUE}ℹ [{timestamp}] {message}{Colors.ENDC}"
+
+def print_status(message, status="INFO"):
+    line = format_status(message, status)
+    buffered = getattr(_output, "lines", None)
+    if buffered is not None:
+        buffered.append(line)
+    else:
+        print(line)
 
 def check_service_port(port, service_name):
     """Check if a service is running on the specified port"""
     try:
-        result = subprocess.run(['netstat', '-tlnp'], capture_output=True, text=True)
-        if f":{port} " in result.stdout:
+        # All port checks share one /proc/net/tcp snapshot per run
+        if get_socket_table().is_listening(port):
             print_status(f"{service_name} is running on port {port}", "SUCCESS")
             return True
         else:
@@ -46,63 +67,49 @@ def check_service_port(port, service_name):
         return False
 
 def check_mariadb():
-    """Check if MariaDB is running"""
-    try:
-        # First check if MariaDB service is running
-        result = subprocess.run("sudo service mariadb status", shell=True, capture_output=True, text=True)
-        if "active (running)" not in result.stdout:
-            return False, "MariaDB service is not running"
-        
-        # Then check if we can connect to the database
-        os.chdir("/workspaces/The-frappe-LMS-/lms-bench")
-        result = subprocess.run('bench --site lms.local execute "frappe.db.sql(\'SELECT 1\')"', 
-                              shell=True, capture_output=True, text=True, timeout=5)
-        if result.returncode == 0:
-            return True, "MariaDB is running and accessible"
-        else:
-            return False, f"MariaDB running but database connection failed"
-            
-    except subprocess.TimeoutExpired:
-        return False, "MariaDB connection timeout"
-    except Exception as e:
-        return False, f"MariaDB check failed: {str(e)[:50]}"
+    """Check if MariaDB is running and a query goes through"""
+    result = probe_mariadb(verify_connection=True)
+    if result.ok:
+        return True, f"MariaDB is running and accessible ({result.message})"
+    if result.error_class in ("connection", "timeout", "query"):
+        return False, f"MariaDB {result.message}"
+    return False, f"MariaDB check failed: {result.message}"
+
+def report_mariadb():
+    """Run check_mariadb and print its result"""
+    db_status, db_msg = check_mariadb()
+    print_status(db_msg, "SUCCESS" if db_status else "ERROR")
+    return db_status
 
 def check_api_endpoint(url, endpoint_name, expected_status=200):
     """Check if an API endpoint is accessible"""
-    try:
-        response = requests.get(url, timeout=10)
-        if response.status_code == expected_status:
-            print_status(f"{endpoint_name} API is accessible", "SUCCESS")
-            return True
-        else:
-            print_status(f"{endpoint_name} API returned status {response.status_code}", "WARNING")
-            return False
-    except requests.exceptions.ConnectionError:
+    result = probe_http(url, expected_status, timeout=API_TIMEOUT)
+    if result.ok:
+        print_status(f"{endpoint_name} API is accessible ({result.latency_ms:.0f}ms)", "SUCCESS")
+    elif result.error_class == "status":
+        print_status(f"{endpoint_name} API returned status {result.status}", "WARNING")
+    elif result.error_class == "connection":
         print_status(f"{endpoint_name} API is not accessible (Connection Error)", "ERROR")
-        return False
-    except requests.exceptions.Timeout:
+    elif result.error_class == "timeout":
         print_status(f"{endpoint_name} API timeout", "ERROR")
-        return False
-    except Exception as e:
-        print_status(f"Error checking {endpoint_name} API: {str(e)}", "ERROR")
-        return False
+    else:
+        print_status(f"Error checking {endpoint_name} API: {result.message}", "ERROR")
+    return result.ok
 
-def check_lms_apis(base_url):
-    """Check critical LMS API endpoints"""
-    apis_to_check = [
-        ("/api/method/lms.lms.api.get_user_info", "User Info"),
-        ("/api/method/lms.lms.api.get_lms_setting", "LMS Settings"),
-        ("/api/method/lms.lms.api.get_sidebar_settings", "Sidebar Settings"),
-        ("/api/method/lms.lms.utils.get_courses", "Courses"),
-        ("/api/method/frappe.client.get_count", "Database Count"),
-    ]
-    
-    success_count = 0
-    for endpoint, name in apis_to_check:
-        if check_api_endpoint(f"{base_url}{endpoint}", name):
-            success_count += 1
-    
-    return success_count, len(apis_to_check)
+LMS_APIS = [
+    ("/api/method/lms.lms.api.get_user_info", "User Info"),
+    ("/api/method/lms.lms.api.get_lms_setting", "LMS Settings"),
+    ("/api/method/lms.lms.api.get_sidebar_settings", "Sidebar Settings"),
+    ("/api/method/lms.lms.utils.get_courses", "Courses"),
+    ("/api/method/frappe.client.get_count", "Database Count"),
+]
+
+SERVICES = [
+    (8000, "Web Server"),
+    (9000, "Socket.IO"),
+    (11000, "Redis Queue"),
+    (13000, "Redis Cache")
+]
 
 def check_frontend_build():
     """Check if frontend assets exist and are recent"""
@@ -131,8 +138,8 @@ def check_frontend_build():
 def run_bench_command(command, description):
     """Run a bench command and check if it succeeds"""
     try:
-        os.chdir("/workspaces/The-frappe-LMS-/lms-bench")
-        result = subprocess.run(command, shell=True, capture_output=True, text=True, timeout=30)
+        result = subprocess.run(command, shell=True, capture_output=True, text=True, timeout=30,
+                                cwd=BENCH_PATH)
         if result.returncode == 0:
             print_status(f"{description} - Success", "SUCCESS")
             return True
@@ -146,67 +153,164 @@ def run_bench_command(command, description):
         print_status(f"{description} - Error: {str(e)}", "ERROR")
         return False
 
+def report_processes(inspector, min_interval=0.5):
+    """Print CPU/RSS/threads/fds per bench process (informational, not scored)"""
+    if inspector.last_sampled is not None:
+        time.sleep(max(0, min_interval - (time.monotonic() - inspector.last_sampled)))
+    try:
+        samples = inspector.sample()
+    except Exception as e:
+        print_status(f"Process inspection failed: {str(e)}", "WARNING")
+        return
+    if not samples:
+        print_status("No bench processes found", "WARNING")
+        return
+    for sample in samples:
+        problems = alerts(sample)
+        if problems:
+            print_status(f"{format_sample(sample)} - {', '.join(problems)}", "WARNING")
+        else:
+            print_status(format_sample(sample))
+
+class Check:
+    """A health check with the names of the checks it depends on"""
+
+    def __init__(self, name, label, section, func, depends_on=()):
+        self.name = name
+        self.label = label
+        self.section = section
+        self.func = func
+        self.depends_on = tuple(depends_on)
+
+def build_checks(base_url=BASE_URL):
+    """Return all health checks in report order"""
+    checks = [Check("mariadb", "MariaDB", "1. SERVICE CHECKS", report_mariadb)]
+    for port, service in SERVICES:
+        checks.append(Check(f"port:{port}", service, "1. SERVICE CHECKS",
+                            lambda port=port, service=service: check_service_port(port, service)))
+
+    # API checks can only pass if the web server is listening
+    checks.append(Check("api:/lms", "LMS Main Page API", "2. API CHECKS",
+                        lambda: check_api_endpoint(f"{base_url}/lms", "LMS Main Page"),
+                        depends_on=["port:8000"]))
+    for endpoint, name in LMS_APIS:
+        checks.append(Check(f"api:{endpoint}", f"{name} API", "2. API CHECKS",
+                            lambda endpoint=endpoint, name=name: check_api_endpoint(f"{base_url}{endpoint}", name),
+                            depends_on=["port:8000"]))
+
+    checks.append(Check("frontend-build", "Frontend build", "3. BUILD CHECKS", check_frontend_build))
+    checks.append(Check("hooks-syntax", "Hooks syntax check", "3. BUILD CHECKS",
+                        lambda: run_bench_command("python -m py_compile apps/lms/lms/hooks.py", "Hooks syntax check")))
+    return checks
+
+def _run_buffered(check):
+    """Run a check on a worker thread, capturing its output lines"""
+    _output.lines = []
+    try:
+        passed = bool(check.func())
+    except Exception as e:
+        print_status(f"{check.label} check crashed: {str(e)}", "ERROR")
+        passed = False
+    lines, _output.lines = _output.lines, None
+    return passed, lines
+
+def run_checks(checks, max_workers=8):
+    """Run checks concurrently, respecting dependencies.
+
+    A check starts as soon as all of its dependencies have passed; if any
+    dependency failed it is skipped and counted as failed, which is what it
+    would have reported after waiting out its own timeout. Output is printed
+    in declaration order as results become available. Returns the number of
+    passed checks.
+    """
+    labels = {check.name: check.label for check in checks}
+    for check in checks:
+        unknown = set(check.depends_on) - set(labels)
+        if unknown:
+            raise ValueError(f"{check.name} depends on unknown checks: {', '.join(sorted(unknown))}")
+    # Resolve the graph once up front: checks left over can never start
+    resolved = set()
+    pending = list(checks)
+    while pending:
+        ready = [check for check in pending if set(check.depends_on) <= resolved]
+        if not ready:
+            raise ValueError(f"dependency cycle between checks: {', '.join(check.name for check in pending)}")
+        resolved.update(check.name for check in ready)
+        pending = [check for check in pending if check.name not in resolved]
+
+    results = {}
+    outputs = {}
+    running = {}
+    waiting = list(checks)
+    printed = 0
+    current_section = None
+    passed_checks = 0
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while waiting or running or printed < len(checks):
+            # Start or skip every check whose dependencies are settled
+            for check in list(waiting):
+                if any(dep not in results for dep in check.depends_on):
+                    continue
+                waiting.remove(check)
+                failed = [labels[dep] for dep in check.depends_on if not results[dep]]
+                if failed:
+                    results[check.name] = False
+                    outputs[check.name] = [format_status(
+                        f"{check.label} skipped - {', '.join(failed)} check failed", "WARNING")]
+                else:
+                    running[executor.submit(_run_buffered, check)] = check
+
+            # Flush every finished check that is next in report order
+            while printed < len(checks) and checks[printed].name in outputs:
+                check = checks[printed]
+                if check.section != current_section:
+                    current_section = check.section
+                    print(f"\n{Colors.BOLD}{current_section}{Colors.ENDC}")
+                    print("-" * 20)
+                for line in outputs[check.name]:
+                    print(line)
+                if results[check.name]:
+                    passed_checks += 1
+                printed += 1
+
+            if not running:
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                check = running.pop(future)
+                results[check.name], outputs[check.name] = future.result()
+
+    return passed_checks
+
 def main():
     print(f"{Colors.BOLD}{'='*60}")
     print("🏥 FRAPPE LMS HEALTH CHECK")
     print(f"{'='*60}{Colors.ENDC}")
     print_status("Starting health check...")
+
+    # Reuse probe results other tools took in the last few seconds
+    if "--no-cache" not in sys.argv:
+        enable_cache()
     
-    # Track overall health
-    total_checks = 0
-    passed_checks = 0
-    
-    print(f"\n{Colors.BOLD}1. SERVICE CHECKS{Colors.ENDC}")
-    print("-" * 20)
-    
-    # Check database
-    total_checks += 1
-    db_status, db_msg = check_mariadb()
-    if db_status:
-        passed_checks += 1
-    
-    # Check services
-    services = [
-        (8000, "Web Server"),
-        (9000, "Socket.IO"),
-        (11000, "Redis Queue"),
-        (13000, "Redis Cache")
-    ]
-    
-    for port, service in services:
-        total_checks += 1
-        if check_service_port(port, service):
-            passed_checks += 1
-    
-    print(f"\n{Colors.BOLD}2. API CHECKS{Colors.ENDC}")
-    print("-" * 20)
-    
-    base_url = "http://127.0.0.1:8000"
-    
-    # Check main page
-    total_checks += 1
-    if check_api_endpoint(f"{base_url}/lms", "LMS Main Page"):
-        passed_checks += 1
+    # The first process sample is taken before the checks run so the
+    # second one, afterwards, can report CPU % without an extra wait
+    inspector = ProcessInspector()
+    try:
+        inspector.sample()
+    except OSError:
+        pass  # no /proc; report_processes will say so
     
-    # Check LMS APIs
-    api_success, api_total = check_lms_apis(base_url)
-    total_checks += api_total
-    passed_checks += api_success
+    # Independent checks run concurrently; API checks wait for the web port
+    checks = build_checks(BASE_URL)
+    total_checks = len(checks)
+    passed_checks = run_checks(checks)
     
-    print(f"\n{Colors.BOLD}3. BUILD CHECKS{Colors.ENDC}")
+    print(f"\n{Colors.BOLD}4. PROCESS RESOURCES{Colors.ENDC}")
     print("-" * 20)
+    report_processes(inspector)
     
-    # Check frontend build
-    total_checks += 1
-    if check_frontend_build():
-        passed_checks += 1
-    
-    # Check for syntax errors in hooks
-    total_checks += 1
-    if run_bench_command("python -m py_compile apps/lms/lms/hooks.py", "Hooks syntax check"):
-        passed_checks += 1
-    
-    print(f"\n{Colors.BOLD}4. OVERALL HEALTH{Colors.ENDC}")
+    print(f"\n{Colors.BOLD}5. OVERALL HEALTH{Colors.ENDC}")
     print("-" * 20)
     
     health_percentage = (passed_checks / total_checks) * 100
@@ -1,124 +1,337 @@
 #!/usr/bin/env python3
 """
 Script to verify that Jobs functionality has been completely removed from Frappe LMS.
+
+The whole app tree is scanned once: files are read by a thread pool and each
+is tested against every forbidden pattern in a single regex pass, so
+leftovers are reported as file:line hits wherever they are. Results are
+cached per file (size, mtime, content hash), so repeat runs only read files
+that changed.
+
+The rules are declarative; pass --rules with a JSON file to verify another
+removal the same way:
+
+    {
+      "name": "Jobs",
+      "forbidden_paths": [{"label": "Job directory", "path": "lms/job"}],
+      "modules_file": "lms/modules.txt",
+      "forbidden_modules": ["Job"],
+      "forbidden_patterns": [
+        {"label": "Job routes", "pattern": "job-opening", "ignore_case": true,
+         "globs": ["frontend/src/*"]}
+      ]
+    }
+
+Usage:
+    python3 job_removal_verification.py                    # full (cached) scan
+    python3 job_removal_verification.py --git-diff main    # only files changed since main
+    python3 job_removal_verification.py --staged           # only staged files (pre-commit)
+    python3 job_removal_verification.py --rules rules.json --no-cache
 """
 
+import fnmatch
+import hashlib
+import json
 import os
-import sys
+import re
 import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+BASE_PATH = "/workspaces/The-frappe-LMS-/lms-bench/apps/lms"
+CACHE_DIR = os.path.expanduser("~/.cache/lms-monitor")
+
+# Dependencies, VCS data and build output are not sources we could have missed
+SKIP_DIRS = {"node_modules", ".git", "__pycache__", "dist", "build", ".vite", ".cache"}
+SKIP_PATHS = {"lms/public/frontend"}
+MAX_FILE_SIZE = 2 * 1024 * 1024
+
+JOBS_RULES = {
+    "name": "Jobs",
+    "forbidden_paths": [
+        {"label": "Job directory", "path": "lms/job"},
+        {"label": "Job component", "path": "frontend/src/pages/Jobs.vue"},
+        {"label": "Job component", "path": "frontend/src/pages/JobDetail.vue"},
+        {"label": "Job component", "path": "frontend/src/pages/JobForm.vue"},
+        {"label": "Job component", "path": "frontend/src/components/JobCard.vue"},
+        {"label": "Job component", "path": "frontend/src/components/Modals/JobApplicationModal.vue"},
+    ],
+    "modules_file": "lms/modules.txt",
+    "forbidden_modules": ["Job"],
+    "forbidden_patterns": [
+        {"label": "Job routes", "pattern": "job-opening", "ignore_case": True},
+        {"label": "Job routes", "pattern": "jobdetail|jobform"},
+        {"label": "Job API methods", "pattern": "get_job_details|get_job_opportunities"},
+        {"label": "Job CSS classes", "pattern": r"\.job-"},
+        {"label": "Job component references", "pattern": "JobCard|JobApplication"},
+    ],
+}
 
 def check_file_exists(file_path):
     """Check if a file exists."""
     return os.path.exists(file_path)
 
-def search_in_files(directory, pattern):
-    """Search for a pattern in files within a directory."""
+def load_rules(path):
+    with open(path) as f:
+        rules = json.load(f)
+    for rule in rules.get("forbidden_patterns", []):
+        re.compile(rule["pattern"])  # fail early on a bad pattern, before scanning
+    return rules
+
+def rules_key(rules):
+    return hashlib.blake2b(json.dumps(rules, sort_keys=True).encode(), digest_size=8).hexdigest()
+
+class PatternSet:
+    """Forbidden patterns compiled for a fast whole-file test plus per-rule labelling.
+
+    re only uses its fast literal-prefix search for plain alternations: capturing
+    groups or IGNORECASE make it try every offset. So the whole-file test is one
+    non-capturing alternation per case mode, with case-insensitive rules matched
+    as lower-case patterns against lower-cased text, and the per-rule regexes
+    only run on the rare files that hit.
+    """
+
+    def __init__(self, rules):
+        self.rules = [(label, re.compile(pattern.encode(), re.IGNORECASE if ignore_case else 0))
+                      for label, pattern, ignore_case in rules]
+        # Lower-casing a pattern is only safe without escapes like \S or \W
+        lowerable = [pattern for _, pattern, ignore_case in rules
+                     if ignore_case and not re.search(r"\\[A-Z]", pattern)]
+        sensitive = [pattern for _, pattern, ignore_case in rules if not ignore_case]
+        insensitive = [pattern for _, pattern, ignore_case in rules if ignore_case and pattern not in lowerable]
+        self.sensitive = self._alternation(sensitive)
+        self.lowered = self._alternation([pattern.lower() for pattern in lowerable])
+        self.insensitive = self._alternation(insensitive, re.IGNORECASE)
+
+    @staticmethod
+    def _alternation(patterns, flags=0):
+        if not patterns:
+            return None
+        return re.compile("|".join(f"(?:{pattern})" for pattern in patterns).encode(), flags)
+
+    def search(self, data):
+        """True if any rule matches anywhere in data"""
+        return bool((self.sensitive and self.sensitive.search(data))
+                    or (self.lowered and self.lowered.search(data.lower()))
+                    or (self.insensitive and self.insensitive.search(data)))
+
+    def matches(self, line):
+        """Labels of the rules matching one line"""
+        return [label for label, regex in self.rules if regex.search(line)]
+
+class RuleSet:
+    """Picks the PatternSet for a file from the globs of each pattern rule"""
+
+    def __init__(self, pattern_rules):
+        self.rules = [(rule.get("globs") or ["*"], (rule["label"], rule["pattern"], rule.get("ignore_case", False)))
+                      for rule in pattern_rules]
+        self.sets = {}
+
+    def for_path(self, rel_path):
+        applicable = tuple(i for i, (globs, _) in enumerate(self.rules)
+                           if any(fnmatch.fnmatchcase(rel_path, glob) for glob in globs))
+        if not applicable:
+            return None
+        if applicable not in self.sets:
+            self.sets[applicable] = PatternSet([self.rules[i][1] for i in applicable])
+        return self.sets[applicable]
+
+def skipped(rel_path):
+    parts = rel_path.split(os.sep)
+    return (any(part in SKIP_DIRS for part in parts[:-1])
+            or any(rel_path.startswith(path + os.sep) for path in SKIP_PATHS))
+
+def walk_files(base_path):
+    """Yield relative paths of every scannable file under base_path"""
+    stack = [""]
+    while stack:
+        rel_dir = stack.pop()
+        try:
+            entries = os.scandir(os.path.join(base_path, rel_dir))
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                rel_path = os.path.join(rel_dir, entry.name)
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in SKIP_DIRS and rel_path not in SKIP_PATHS:
+                        stack.append(rel_path)
+                elif entry.is_file(follow_symlinks=False):
+                    yield rel_path
+
+def git_changed_files(base_path, base_ref=None, staged=False):
+    """Files changed against base_ref (or staged), plus untracked files, relative to base_path"""
+    if staged:
+        diff = ["git", "-C", base_path, "diff", "--cached", "--name-only", "--relative", "--diff-filter=ACMR"]
+    else:
+        diff = ["git", "-C", base_path, "diff", "--name-only", "--relative", "--diff-filter=ACMR", base_ref]
+    files = subprocess.run(diff, capture_output=True, text=True, check=True).stdout.splitlines()
+    if not staged:
+        untracked = ["git", "-C", base_path, "ls-files", "--others", "--exclude-standard"]
+        files += subprocess.run(untracked, capture_output=True, text=True, check=True).stdout.splitlines()
+    return sorted({path for path in files if path and not skipped(path)})
+
+def scan_file(path, patterns, cached=None):
+    """Return (hits, cache entry) for a file; hits are [line number, label, line].
+
+    A cached entry with the same size and mtime is trusted without reading the
+    file; one with the same content hash is trusted without matching it.
+    """
     try:
-        result = subprocess.run(
-            ["grep", "-r", "-i", pattern, directory],
-            capture_output=True,
-            text=True
-        )
-        return result.stdout.strip() if result.returncode == 0 else ""
-    except:
-        return ""
-
-def main():
-    print("🔍 Verifying Jobs functionality removal from Frappe LMS...")
+        stat = os.stat(path)
+        if cached and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns:
+            return cached[3], cached
+        if stat.st_size > MAX_FILE_SIZE:
+            return [], [stat.st_size, stat.st_mtime_ns, None, []]
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return [], None
+    digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+    if cached and cached[2] == digest:
+        return cached[3], [stat.st_size, stat.st_mtime_ns, digest, cached[3]]
+
+    hits = []
+    if b"\0" not in data[:1024] and patterns.search(data):
+        for number, line in enumerate(data.splitlines(), 1):
+            for label in patterns.matches(line):
+                hits.append([number, label, line.decode(errors="replace").strip()[:120]])
+    return hits, [stat.st_size, stat.st_mtime_ns, digest, hits]
+
+class ScanCache:
+    """Per-file scan results for one app tree and rule set, stored as JSON"""
+
+    def __init__(self, base_path, rules, directory=CACHE_DIR, enabled=True):
+        key = rules_key({"base": os.path.abspath(base_path), "rules": rules})
+        self.path = os.path.join(directory, f"removal-scan-{key}.json")
+        self.enabled = enabled
+        self.files = {}
+        if enabled:
+            try:
+                with open(self.path) as f:
+                    self.files = json.load(f)
+            except (OSError, ValueError):
+                pass
+
+    def save(self):
+        if not self.enabled:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.files, f)
+        os.replace(tmp_path, self.path)
+
+def scan_tree(base_path, pattern_rules, files=None, cache=None, max_workers=8):
+    """Scan files (default: the whole tree) once; return ({rel_path: hits}, scanned, read)"""
+    rule_set = RuleSet(pattern_rules)
+    full_scan = files is None
+    files = list(walk_files(base_path)) if full_scan else files
+    known = cache.files if cache else {}
+    targets = [(rel, rule_set.for_path(rel)) for rel in files]
+    targets = [(rel, patterns) for rel, patterns in targets if patterns is not None]
+
+    # Reads dominate and release the GIL; the regex pass per file is a single C call
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = list(executor.map(
+            lambda target: scan_file(os.path.join(base_path, target[0]), target[1], known.get(target[0])), targets))
+
+    hits = {}
+    read = 0
+    # A full scan also drops entries for files that no longer exist
+    entries = {} if full_scan else dict(known)
+    for (rel, _), (file_hits, entry) in zip(targets, results):
+        if entry is not None:
+            read += entry is not known.get(rel)
+            entries[rel] = entry
+        if file_hits:
+            hits[rel] = file_hits
+    if cache:
+        cache.files = entries
+        cache.save()
+    return hits, len(targets), read
+
+def option(args, name):
+    if name in args:
+        index = args.index(name)
+        if index + 1 < len(args):
+            return args[index + 1]
+    return None
+
+def main(args=None):
+    args = sys.argv[1:] if args is None else args
+    rules_file = option(args, "--rules")
+    rules = load_rules(rules_file) if rules_file else JOBS_RULES
+    base_path = option(args, "--base") or BASE_PATH
+    name = rules.get("name", "Removed")
+    pattern_rules = rules.get("forbidden_patterns", [])
+
+    print(f"🔍 Verifying {name} functionality removal from Frappe LMS...")
     print("=" * 60)
-    
-    base_path = "/workspaces/The-frappe-LMS-/lms-bench/apps/lms"
+
     issues_found = 0
-    
-    # 1. Check if job directory was removed
-    job_dir = f"{base_path}/lms/job"
-    if check_file_exists(job_dir):
-        print("❌ ISSUE: Job directory still exists at lms/job")
-        issues_found += 1
-    else:
-        print("✅ Job directory successfully removed")
-    
-    # 2. Check if Job module is in modules.txt
-    modules_file = f"{base_path}/lms/modules.txt"
-    if check_file_exists(modules_file):
+
+    # 1. Check that removed files and directories are gone
+    for rule in rules.get("forbidden_paths", []):
+        if check_file_exists(os.path.join(base_path, rule["path"])):
+            print(f"❌ ISSUE: {rule['label']} still exists: {rule['path']}")
+            issues_found += 1
+        else:
+            print(f"✅ {rule['label']} removed: {rule['path']}")
+
+    # 2. Check that removed modules are gone from modules.txt
+    modules_name = rules.get("modules_file", "lms/modules.txt")
+    modules_file = os.path.join(base_path, modules_name)
+    if rules.get("forbidden_modules") and check_file_exists(modules_file):
         with open(modules_file, 'r') as f:
-            content = f.read()
-            if "Job" in content:
-                print("❌ ISSUE: 'Job' still found in modules.txt")
+            modules = {line.strip() for line in f}
+        for module in rules["forbidden_modules"]:
+            if module in modules:
+                print(f"❌ ISSUE: '{module}' still found in {modules_name}")
                 issues_found += 1
             else:
-                print("✅ Job module removed from modules.txt")
-    
-    # 3. Check for job-related Vue components
-    frontend_path = f"{base_path}/frontend/src"
-    job_files = [
-        "pages/Jobs.vue",
-        "pages/JobDetail.vue", 
-        "pages/JobForm.vue",
-        "components/JobCard.vue",
-        "components/Modals/JobApplicationModal.vue"
-    ]
-    
-    for file_path in job_files:
-        full_path = f"{frontend_path}/{file_path}"
-        if check_file_exists(full_path):
-            print(f"❌ ISSUE: Job component still exists: {file_path}")
+                print(f"✅ {module} module removed from {modules_name}")
+
+    # 3. Scan the app tree (or only changed files) for leftover references
+    files = None
+    if "--staged" in args or "--git-diff" in args:
+        try:
+            base_ref = option(args, "--git-diff")
+            if not base_ref or base_ref.startswith("--"):
+                base_ref = "HEAD"
+            files = git_changed_files(base_path, base_ref, staged="--staged" in args)
+        except (OSError, subprocess.CalledProcessError) as e:
+            print(f"❌ Could not list changed files with git: {e}")
+            return 1
+    cache = ScanCache(base_path, pattern_rules, enabled="--no-cache" not in args)
+    start = time.perf_counter()
+    hits, scanned, read = scan_tree(base_path, pattern_rules, files, cache)
+    elapsed = time.perf_counter() - start
+    scope = "tree" if files is None else "changed"
+    print(f"\n🔎 Scanned {scanned} {scope} files in {elapsed:.2f}s ({read} read, {scanned - read} unchanged)")
+
+    by_label = {rule["label"]: [] for rule in pattern_rules}
+    for rel_path in sorted(hits):
+        for number, label, line in hits[rel_path]:
+            by_label[label].append(f"{rel_path}:{number}: {line}")
+    for label, locations in by_label.items():
+        if locations:
+            print(f"❌ ISSUE: {label} still found ({len(locations)}):")
+            for location in locations:
+                print(f"   {location}")
             issues_found += 1
         else:
-            print(f"✅ Job component removed: {file_path}")
-    
-    # 4. Check router.js for job routes
-    router_file = f"{frontend_path}/router.js"
-    if check_file_exists(router_file):
-        with open(router_file, 'r') as f:
-            content = f.read()
-            if "job-opening" in content.lower() or "jobdetail" in content or "jobform" in content:
-                print("❌ ISSUE: Job routes still found in router.js")
-                issues_found += 1
-            else:
-                print("✅ Job routes removed from router.js")
-    
-    # 5. Check API file for job methods
-    api_file = f"{base_path}/lms/lms/api.py"
-    if check_file_exists(api_file):
-        with open(api_file, 'r') as f:
-            content = f.read()
-            if "get_job_details" in content or "get_job_opportunities" in content:
-                print("❌ ISSUE: Job API methods still found in api.py")
-                issues_found += 1
-            else:
-                print("✅ Job API methods removed from api.py")
-    
-    # 6. Check for job references in CSS
-    css_file = f"{base_path}/lms/public/css/style.css"
-    if check_file_exists(css_file):
-        with open(css_file, 'r') as f:
-            content = f.read()
-            if ".job-" in content:
-                print("❌ ISSUE: Job CSS classes still found in style.css")
-                issues_found += 1
-            else:
-                print("✅ Job CSS classes removed from style.css")
-    
-    # 7. Check components.d.ts
-    components_file = f"{frontend_path}/../components.d.ts"
-    if check_file_exists(components_file):
-        with open(components_file, 'r') as f:
-            content = f.read()
-            if "JobCard" in content or "JobApplication" in content:
-                print("❌ ISSUE: Job component references still found in components.d.ts")
-                issues_found += 1
-            else:
-                print("✅ Job component references removed from components.d.ts")
-    
+            print(f"✅ No {label} left")
+
     print("=" * 60)
-    
+
     if issues_found == 0:
-        print("🎉 SUCCESS: Jobs functionality has been completely removed!")
-        print("✨ The LMS should now work without any job-related features.")
+        print(f"🎉 SUCCESS: {name} functionality has been completely removed!")
+        print("✨ The LMS should now work without any related features.")
     else:
         print(f"⚠️  FOUND {issues_found} ISSUES that need to be addressed.")
-        
+
     return issues_found
 
 if __name__ == "__main__":
@@ -7,14 +7,22 @@ echo "🔧 LMS Development Health Check Tools"
 echo "======================================"
 echo ""
 
+# --no-cache anywhere on the command line stops the health check reusing probe
+# results other tools took in the last few seconds; the API tests read every
+# response body and always hit the server
+CACHE_FLAG=""
+for arg in "$@"; do
+    [ "$arg" = "--no-cache" ] && CACHE_FLAG="--no-cache"
+done
+
 case "${1:-help}" in
     "health")
         echo "🏥 Running comprehensive health check..."
-        python3 /workspaces/The-frappe-LMS-/health_check.py
+        python3 /workspaces/The-frappe-LMS-/health_check.py $CACHE_FLAG
         ;;
     "api")
         echo "🔌 Running API tests..."
-        python3 /workspaces/The-frappe-LMS-/api_tester.py
+        python3 /workspaces/The-frappe-LMS-/api_tester.py $CACHE_FLAG
         ;;
     "service")
         shift
@@ -25,13 +33,13 @@ case "${1:-help}" in
         echo "🚀 Running all checks..."
         echo ""
         echo "1️⃣ Health Check:"
-        python3 /workspaces/The-frappe-LMS-/health_check.py
+        python3 /workspaces/The-frappe-LMS-/health_check.py $CACHE_FLAG
         echo ""
         echo "2️⃣ Service Status:"
         /workspaces/The-frappe-LMS-/lms_service_manager.sh status
         echo ""
         echo "3️⃣ API Tests:"
-        python3 /workspaces/The-frappe-LMS-/api_tester.py
+        python3 /workspaces/The-frappe-LMS-/api_tester.py $CACHE_FLAG
         ;;
     "help"|*)
         echo "Available commands:"
@@ -39,11 +47,14 @@ case "${1:-help}" in
         echo "  api      - Run API connectivity tests"
         echo "  service  - Manage LMS services (start/stop/restart/status/fix/logs)"
         echo "  all      - Run all checks and show service status"
+        echo "  (add --no-cache so the health check re-probes instead of reusing other tools'"
+        echo "   results from the last few seconds; API tests always hit the server)"
         echo ""
         echo "Examples:"
         echo "  ./lms_check.sh health"
         echo "  ./lms_check.sh service start"
         echo "  ./lms_check.sh service status"
         echo "  ./lms_check.sh all"
+        echo "  ./lms_check.sh all --no-cache"
         ;;
 esac
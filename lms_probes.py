@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Shared Probes for Frappe LMS
+HTTP, port and MariaDB probes used by health_check.py, service_monitor.py,
+quick_fix.py and readiness.py. HTTP probes go through one process-wide
+keep-alive session, so repeated checks reuse connections instead of paying
+a TCP handshake each, and every probe returns the same ProbeResult with its
+latency and a coarse error class.
+
+Tools that call enable_cache() share results through probe_cache.py for a
+few seconds, so scripts run back to back do not repeat the same probes.
+
+Usage:
+    python3 lms_probes.py                 # probe the standard LMS services once
+"""
+
+import subprocess
+import sys
+import threading
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from db_probe import get_mariadb_probe, describe as describe_db_probe
+from probe_cache import DEFAULT_TTL, ProbeCache
+from redis_probe import REDIS_PORTS, get_redis_probe, describe as describe_redis_probe
+
+BENCH_PATH = "/workspaces/The-frappe-LMS-/lms-bench"
+BASE_URL = "http://127.0.0.1:8000"
+POOL_SIZE = 8
+
+# Default timeout in seconds per probe kind; every probe also takes timeout=
+PROBE_TIMEOUTS = {
+    "http": 3,
+    "port": 2,
+    "mariadb": 5,
+}
+
+# ok: probe passed; status: HTTP status code (None without a response);
+# error_class: None, "connection", "timeout", "status" or an exception name
+ProbeResult = namedtuple("ProbeResult", "ok status latency_ms error_class message")
+
+_session = None
+_session_lock = threading.Lock()
+# Set by enable_cache(); probes are always fresh until then
+_cache = None
+# Per-thread switch for fresh_probes()
+_local = threading.local()
+
+def get_session():
+    """The process-wide keep-alive session shared by every HTTP probe"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=POOL_SIZE)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _session = session
+        return _session
+
+def enable_cache(ttl=DEFAULT_TTL):
+    """Reuse probe results younger than ttl seconds, including other tools' results"""
+    global _cache
+    _cache = ProbeCache(ttl=ttl)
+
+@contextmanager
+def fresh_probes():
+    """Bypass the cache for probes made by this thread inside the block,
+    e.g. to verify a fix; the fresh results still refresh the cache"""
+    previous = getattr(_local, "fresh", False)
+    _local.fresh = True
+    try:
+        yield
+    finally:
+        _local.fresh = previous
+
+def _cached(key, probe, cached=True, fallback_keys=()):
+    """Return a fresh-enough cached ProbeResult for key, or run probe and store it.
+
+    fallback_keys name stricter probes whose passing result also answers this one.
+    """
+    if _cache is None:
+        return probe()
+    if cached and not getattr(_local, "fresh", False):
+        value = _cache.get(key)
+        if value is not None:
+            return ProbeResult(*value)
+        for fallback in fallback_keys:
+            value = _cache.get(fallback)
+            if value is not None and value[0]:
+                return ProbeResult(*value)
+    result = probe()
+    _cache.put(key, list(result))
+    return result
+
+def _elapsed_ms(start):
+    return (time.perf_counter() - start) * 1000
+
+def probe_http(url, expected_status=200, timeout=None, cached=True):
+    """GET url and compare the status code; ok only on expected_status"""
+    return _cached(["http", url, expected_status], lambda: _probe_http(url, expected_status, timeout), cached)
+
+def _probe_http(url, expected_status, timeout):
+    start = time.perf_counter()
+    try:
+        response = get_session().get(url, timeout=timeout or PROBE_TIMEOUTS["http"])
+    except requests.exceptions.ConnectionError:
+        return ProbeResult(False, None, _elapsed_ms(start), "connection", "Connection Error")
+    except requests.exceptions.Timeout:
+        return ProbeResult(False, None, _elapsed_ms(start), "timeout", "Timeout")
+    except Exception as e:
+        return ProbeResult(False, None, _elapsed_ms(start), type(e).__name__, str(e)[:50])
+    latency = _elapsed_ms(start)
+    if response.status_code != expected_status:
+        return ProbeResult(False, response.status_code, latency, "status",
+                           f"status {response.status_code} (expected {expected_status})")
+    return ProbeResult(True, response.status_code, latency, None, "OK")
+
+def probe_port(port, timeout=None, cached=True):
+    """Check that a service answers on a local port: PING for Redis, any HTTP response otherwise"""
+    return _cached(["port", port], lambda: _probe_port(port, timeout), cached)
+
+def _probe_port(port, timeout):
+    if port in REDIS_PORTS:
+        start = time.perf_counter()
+        result = get_redis_probe(port).probe()
+        if result.ok:
+            return ProbeResult(True, None, _elapsed_ms(start), None, describe_redis_probe(result))
+        return ProbeResult(False, None, _elapsed_ms(start), "connection", str(result.error))
+
+    result = _probe_http(f"http://127.0.0.1:{port}", 200, timeout or PROBE_TIMEOUTS["port"])
+    if result.status is not None:
+        # Any response means something is listening, whatever the status
+        return result._replace(ok=True, error_class=None, message="OK")
+    return result
+
+def probe_mariadb(verify_connection=False, timeout=None, cached=True):
+    """Check MariaDB over the pooled direct connection, falling back to the
+    service status (and, with verify_connection, a `bench execute` query)"""
+    # A passing verified check also answers an unverified one
+    fallback = [["mariadb", True]] if not verify_connection else []
+    return _cached(["mariadb", verify_connection], lambda: _probe_mariadb(verify_connection, timeout),
+                   cached, fallback)
+
+def _probe_mariadb(verify_connection, timeout):
+    start = time.perf_counter()
+    probe = get_mariadb_probe()
+    if probe is not None:
+        result = probe.probe()
+        if result.ok:
+            return ProbeResult(True, None, _elapsed_ms(start), None, describe_db_probe(result))
+
+    timeout = timeout or PROBE_TIMEOUTS["mariadb"]
+    try:
+        result = subprocess.run("sudo service mariadb status", shell=True, capture_output=True,
+                                text=True, timeout=timeout)
+        if "active (running)" not in result.stdout:
+            return ProbeResult(False, None, _elapsed_ms(start), "connection", "service is not running")
+        if not verify_connection:
+            return ProbeResult(True, None, _elapsed_ms(start), None, "service running")
+
+        result = subprocess.run('bench --site lms.local execute "frappe.db.sql(\'SELECT 1\')"',
+                                shell=True, capture_output=True, text=True, timeout=timeout, cwd=BENCH_PATH)
+        if result.returncode == 0:
+            return ProbeResult(True, None, _elapsed_ms(start), None, "accessible")
+        return ProbeResult(False, None, _elapsed_ms(start), "query", "running but database connection failed")
+    except subprocess.TimeoutExpired:
+        return ProbeResult(False, None, _elapsed_ms(start), "timeout", "connection timeout")
+    except Exception as e:
+        return ProbeResult(False, None, _elapsed_ms(start), type(e).__name__, str(e)[:50])
+
+def main():
+    checks = [("MariaDB", probe_mariadb)]
+    checks += [(f"port {port}", lambda port=port: probe_port(port)) for port in (8000, 9000, 11000, 13000)]
+    checks += [(path, lambda path=path: probe_http(f"{BASE_URL}{path}"))
+               for path in ("/lms", "/api/method/lms.lms.api.get_user_info")]
+    failed = 0
+    for name, check in checks:
+        result = check()
+        mark = "✓" if result.ok else "✗"
+        status = f" {result.status}" if result.status is not None else ""
+        print(f"{mark} {name}{status} - {result.message} ({result.latency_ms:.1f}ms)")
+        failed += not result.ok
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -25,12 +25,26 @@ print_status() {
     esac
 }
 
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+LISTENING_PORTS=""
+
+# Take one snapshot of all listening ports (from /proc/net/tcp{,6}) so
+# every port check reads it instead of spawning netstat per port
+snapshot_ports() {
+    LISTENING_PORTS=" $(python3 "$SCRIPT_DIR/socket_table.py" 2>/dev/null | tr '\n' ' ') "
+    if [ "$LISTENING_PORTS" = "  " ]; then
+        # Fallback: a single netstat call shared by all checks
+        LISTENING_PORTS=" $(netstat -tln 2>/dev/null | awk 'NR>2 {n=split($4,a,":"); print a[n]}' | tr '\n' ' ') "
+    fi
+}
+
 # Function to check if a service is running
 check_service() {
     local service_name=$1
     local port=$2
     
-    if netstat -tlnp | grep -q ":$port "; then
+    [ -z "$LISTENING_PORTS" ] && snapshot_ports
+    if [[ "$LISTENING_PORTS" == *" $port "* ]]; then
         print_status "$service_name is running on port $port" "SUCCESS"
         return 0
     else
@@ -58,8 +72,8 @@ start_services() {
     print_status "Starting Frappe LMS services..." "INFO"
     bench start &
     
-    # Wait a moment for services to start
-    sleep 5
+    # Wait until each service answers its readiness probe (not a fixed sleep)
+    python3 "$SCRIPT_DIR/readiness.py" --timeout 60 mariadb web socketio redis-queue redis-cache || true
     
     # Check if services started successfully
     check_services
@@ -69,6 +83,10 @@ start_services() {
 stop_services() {
     echo -e "\n${BLUE}🛑 Stopping LMS Services...${NC}"
     
+    # Components started by start_orchestrator.py run in their own process
+    # groups (workers, scheduler and watch hold no port), so stop those first
+    python3 "$SCRIPT_DIR/start_orchestrator.py" stop || true
+    
     # Kill bench processes
     pkill -f "bench start" || true
     
@@ -90,6 +108,7 @@ check_services() {
     echo -e "\n${BLUE}🔍 Checking LMS Services...${NC}"
     
     local all_running=true
+    snapshot_ports
     
     # Check MariaDB
     if sudo service mariadb status | grep -q "active (running)"; then
@@ -118,7 +137,7 @@ check_services() {
 restart_services() {
     echo -e "\n${BLUE}🔄 Restarting LMS Services...${NC}"
     stop_services
-    sleep 3
+    python3 "$SCRIPT_DIR/readiness.py" --down --timeout 15 web socketio redis-queue redis-cache || true
     start_services
 }
 
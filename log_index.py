@@ -0,0 +1,390 @@
+#!/usr/bin/env python3
+"""
+Log Index for Frappe LMS
+Parses /tmp/bench.log incrementally into a SQLite index of requests (status,
+path, duration), exceptions (with a signature per exception type and raising
+frame) and worker crashes, keyed by time and process. Each run resumes from
+the byte offset where the last one stopped and starts over when the log is
+rotated or truncated, so queries never re-read old data.
+
+Request durations are taken from the end of access-log lines when the access
+log format includes them: "123ms", "1.2s", a bare float in seconds
+(gunicorn %(L)s) or a bare integer in microseconds (gunicorn %(D)s).
+
+Honcho prefixes carry only the time of day. The date comes from the dated
+"system | starting components (YYYY-MM-DD ...)" line start_orchestrator.py
+writes at every start, and advances a day whenever the clock goes back.
+
+Usage:
+    python3 log_index.py                                # summary of the last hour
+    python3 log_index.py exceptions --since 1h --limit 10
+    python3 log_index.py slow --min 2 --path get_courses
+    python3 log_index.py crashes --since 1d
+    python3 log_index.py status 500
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import sys
+import time
+from datetime import datetime, timedelta
+
+LOG_FILE = "/tmp/bench.log"
+INDEX_PATH = os.path.expanduser("~/.cache/lms-monitor/bench-log-index.sqlite")
+READ_SIZE = 4 * 1024 * 1024
+HEAD_BYTES = 256
+DAY_SECONDS = 86400
+# Prefix clocks going back by up to this many seconds are interleaved writers, not midnight
+CLOCK_SLACK = 300
+
+# "12:00:01 web.1   | content" as written by honcho and start_orchestrator
+PREFIX_PATTERN = re.compile(r"^(?:(?P<clock>\d\d:\d\d:\d\d) )?(?P<process>[\w-]+(?:\.\d+)?)\s*\| ?(?P<content>.*)$")
+ACCESS_PATTERN = re.compile(
+    r'(?:\[(?P<stamp>\d\d/\w{3}/\d{4}[: ]\d\d:\d\d:\d\d)[^\]]*\] )?'
+    r'"(?P<method>[A-Z]+) (?P<path>\S+) HTTP/[\d.]+" (?P<status>\d{3}) (?P<size>\S+)'
+    r'(?: "[^"]*" "[^"]*")?(?: (?P<duration>\d+(?:\.\d+)?)(?P<unit>ms|s|us)?)?\s*$')
+FRAME_PATTERN = re.compile(r'^\s+File "(?P<file>[^"]+)", line \d+, in (?P<func>\S+)')
+EXCEPTION_PATTERN = re.compile(r"^(?P<type>[A-Za-z_][\w.]*)(?::\s?(?P<message>.*))?$")
+CHAINED_MARKERS = ("During handling of the above exception", "The above exception was the direct cause")
+CRASH_PATTERNS = [
+    re.compile(r"WORKER TIMEOUT \(pid:\d+\)"),
+    re.compile(r"Worker \(pid:\d+\) was sent SIG\w+"),
+    re.compile(r"[Ww]ork-horse .*terminated unexpectedly.*"),
+    re.compile(r"Worker .* (?:died|crashed).*"),
+    re.compile(r"MemoryError|Killed$"),
+]
+START_PATTERN = re.compile(r"^starting components \((?P<date>\d{4}-\d\d-\d\d) (?P<clock>\d\d:\d\d:\d\d)\)")
+# honcho reports component exits as "system | web.1 stopped (rc=1)"
+SYSTEM_EXIT_PATTERN = re.compile(r"^(?P<process>\S+) (?:stopped|exited) \(rc=(?P<rc>-?\d+)\)")
+NORMAL_EXIT_CODES = {"0", "-2", "-15"}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS state (path TEXT PRIMARY KEY, inode INTEGER, offset INTEGER,
+                                  head TEXT, pending TEXT, log_date TEXT, last_clock TEXT);
+CREATE TABLE IF NOT EXISTS requests (ts REAL, process TEXT, method TEXT, path TEXT,
+                                     status INTEGER, duration_ms REAL);
+CREATE TABLE IF NOT EXISTS exceptions (ts REAL, process TEXT, exc_type TEXT, signature TEXT,
+                                       message TEXT, traceback TEXT);
+CREATE TABLE IF NOT EXISTS crashes (ts REAL, process TEXT, message TEXT);
+CREATE INDEX IF NOT EXISTS requests_ts ON requests (ts, process);
+CREATE INDEX IF NOT EXISTS requests_duration ON requests (duration_ms);
+CREATE INDEX IF NOT EXISTS requests_status ON requests (status, ts);
+CREATE INDEX IF NOT EXISTS exceptions_ts ON exceptions (ts, process);
+CREATE INDEX IF NOT EXISTS exceptions_signature ON exceptions (signature, ts);
+CREATE INDEX IF NOT EXISTS crashes_ts ON crashes (ts, process);
+"""
+
+def short_path(path):
+    """Trim a traceback file path to the part inside the bench: 'frappe/app.py'"""
+    for marker in ("/apps/", "/site-packages/"):
+        if marker in path:
+            path = path.split(marker, 1)[1]
+    return path
+
+def clock_seconds(clock):
+    """'HH:MM:SS' -> seconds since midnight"""
+    return int(clock[:2]) * 3600 + int(clock[3:5]) * 60 + int(clock[6:8])
+
+def parse_duration(value, unit):
+    if value is None:
+        return None
+    number = float(value)
+    if unit == "ms":
+        return number
+    if unit == "us" or (unit is None and "." not in value):
+        return number / 1000
+    return number * 1000
+
+class LogParser:
+    """Turns log lines into index rows, tracking an open traceback per process
+    and the date of the honcho clock times"""
+
+    def __init__(self, pending=None, log_date=None, last_clock=None):
+        # process -> {"ts", "lines", "frame"} for tracebacks still being read
+        self.pending = pending or {}
+        # Date of the last prefix clock ("YYYY-MM-DD"), None before the first start marker
+        self.log_date = log_date
+        self.last_clock = last_clock
+        self.requests = []
+        self.exceptions = []
+        self.crashes = []
+        # Consecutive lines share their second, so strptime runs once per distinct stamp
+        self.stamps = {}
+
+    def advance_clock(self, clock):
+        """Track the prefix clock, moving to the next day when it wraps past midnight"""
+        if clock is None or self.log_date is None or clock == self.last_clock:
+            return
+        if self.last_clock is not None:
+            back = (clock_seconds(self.last_clock) - clock_seconds(clock)) % DAY_SECONDS
+            if back <= CLOCK_SLACK:
+                return  # an interleaved writer's slightly older line; keep the later clock
+            if clock < self.last_clock:
+                next_day = datetime.strptime(self.log_date, "%Y-%m-%d") + timedelta(days=1)
+                self.log_date = next_day.strftime("%Y-%m-%d")
+        self.last_clock = clock
+
+    def timestamp(self, clock, stamp, now):
+        if stamp is None and clock is None:
+            return now.timestamp()
+        key = stamp or (self.log_date, self.last_clock, clock)
+        cached = self.stamps.get(key)
+        if cached is None:
+            if stamp:
+                cached = datetime.strptime(stamp.replace(" ", ":", 1), "%d/%b/%Y:%H:%M:%S").timestamp()
+            elif self.log_date is not None:
+                moment = datetime.strptime(f"{self.log_date} {clock}", "%Y-%m-%d %H:%M:%S")
+                latest = datetime.strptime(f"{self.log_date} {self.last_clock}", "%Y-%m-%d %H:%M:%S")
+                if moment - latest > timedelta(hours=12):
+                    moment -= timedelta(days=1)  # written just before the midnight already passed
+                cached = moment.timestamp()
+            else:
+                # Before any start marker the date is unknown; take the latest such moment not after now
+                moment = datetime.combine(now.date(), datetime.strptime(clock, "%H:%M:%S").time())
+                if moment > now + timedelta(minutes=5):
+                    moment -= timedelta(days=1)
+                cached = moment.timestamp()
+            if len(self.stamps) > 100000:
+                self.stamps.clear()
+            self.stamps[key] = cached
+        return cached
+
+    def feed(self, line, now):
+        match = PREFIX_PATTERN.match(line)
+        if match:
+            clock, process, content = match.group("clock"), match.group("process"), match.group("content")
+        else:
+            clock, process, content = None, "-", line
+
+        if process == "system":
+            start = START_PATTERN.match(content)
+            if start:
+                self.log_date, self.last_clock = start.group("date"), start.group("clock")
+                return
+            self.advance_clock(clock)
+            exit_match = SYSTEM_EXIT_PATTERN.match(content)
+            if exit_match and exit_match.group("rc") not in NORMAL_EXIT_CODES:
+                self.crashes.append((self.timestamp(clock, None, now), exit_match.group("process"), content))
+            return
+        self.advance_clock(clock)
+
+        traceback = self.pending.get(process)
+        if traceback is not None:
+            if not content.strip() or content.startswith((" ", "\t")) or content.startswith(CHAINED_MARKERS):
+                traceback["lines"].append(content)
+                frame = FRAME_PATTERN.match(content)
+                if frame:
+                    traceback["frame"] = f"{short_path(frame.group('file'))}:{frame.group('func')}"
+                return
+            if content.startswith("Traceback (most recent call last)"):
+                traceback["lines"].append(content)
+                return
+            self.finish_traceback(process, content)
+            return
+        if content.startswith("Traceback (most recent call last)"):
+            self.pending[process] = {"ts": self.timestamp(clock, None, now), "lines": [content], "frame": None}
+            return
+
+        access = ACCESS_PATTERN.search(content)
+        if access:
+            self.requests.append((self.timestamp(clock, access.group("stamp"), now), process,
+                                  access.group("method"), access.group("path"), int(access.group("status")),
+                                  parse_duration(access.group("duration"), access.group("unit"))))
+            return
+        for pattern in CRASH_PATTERNS:
+            crash = pattern.search(content)
+            if crash:
+                self.crashes.append((self.timestamp(clock, None, now), process, crash.group(0)))
+                return
+
+    def finish_traceback(self, process, exception_line):
+        traceback = self.pending.pop(process)
+        match = EXCEPTION_PATTERN.match(exception_line.strip())
+        exc_type = match.group("type").rsplit(".", 1)[-1] if match else "UnknownException"
+        message = (match.group("message") or "") if match else exception_line.strip()
+        signature = f"{exc_type} @ {traceback['frame'] or '?'}"
+        text = "\n".join(traceback["lines"] + [exception_line])
+        self.exceptions.append((traceback["ts"], process, exc_type, signature, message[:500], text))
+
+def file_head(f, length):
+    """Hash of the first bytes of the log, to notice it was replaced in place"""
+    f.seek(0)
+    return hashlib.blake2b(f.read(min(length, HEAD_BYTES)), digest_size=8).hexdigest()
+
+def connect(path=INDEX_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    db = sqlite3.connect(path)
+    columns = {row[1] for row in db.execute("PRAGMA table_info(state)")}
+    if columns and "log_date" not in columns:
+        # Built before log dates were tracked, so its rows may be misdated: index again
+        db.executescript("DROP TABLE state; DROP TABLE requests; DROP TABLE exceptions; DROP TABLE crashes;")
+    db.executescript(SCHEMA)
+    return db
+
+def update_index(db, log_path=LOG_FILE):
+    """Index whatever was appended since the last run; return (lines, bytes) read"""
+    row = db.execute("SELECT inode, offset, head, pending, log_date, last_clock FROM state WHERE path = ?",
+                     (log_path,)).fetchone()
+    with open(log_path, "rb") as f:
+        stat = os.fstat(f.fileno())
+        offset, pending, log_date, last_clock = 0, {}, None, None
+        if row:
+            inode, stored_offset, stored_head, stored_pending, stored_date, stored_clock = row
+            # Same file, not truncated and the same first bytes: resume where we stopped
+            if (inode == stat.st_ino and stat.st_size >= stored_offset
+                    and file_head(f, stored_offset) == stored_head):
+                offset, pending = stored_offset, json.loads(stored_pending or "{}")
+                log_date, last_clock = stored_date, stored_clock
+
+        parser = LogParser(pending, log_date, last_clock)
+        now = datetime.now()
+        lines = 0
+        f.seek(offset)
+        start_offset = offset
+        remainder = b""
+        while True:
+            chunk = f.read(READ_SIZE)
+            if not chunk:
+                break
+            data = remainder + chunk
+            cut = data.rfind(b"\n") + 1
+            remainder = data[cut:]
+            for line in data[:cut].decode(errors="replace").splitlines():
+                parser.feed(line, now)
+                lines += 1
+            offset += cut
+        head = file_head(f, offset)
+
+    # Rows and the new offset commit together, so an interrupted run is simply redone
+    with db:
+        db.executemany("INSERT INTO requests VALUES (?, ?, ?, ?, ?, ?)", parser.requests)
+        db.executemany("INSERT INTO exceptions VALUES (?, ?, ?, ?, ?, ?)", parser.exceptions)
+        db.executemany("INSERT INTO crashes VALUES (?, ?, ?)", parser.crashes)
+        db.execute("INSERT OR REPLACE INTO state VALUES (?, ?, ?, ?, ?, ?, ?)",
+                   (log_path, stat.st_ino, offset, head, json.dumps(parser.pending),
+                    parser.log_date, parser.last_clock))
+    return lines, offset - start_offset
+
+def parse_since(value):
+    """'90s', '30m', '1h', '2d' -> epoch seconds that long ago"""
+    units = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+    match = re.fullmatch(r"(\d+(?:\.\d+)?)([smhd]?)", value)
+    if not match:
+        raise ValueError(f"invalid --since value: {value}")
+    return time.time() - float(match.group(1)) * units[match.group(2) or "s"]
+
+def top_exceptions(db, since, limit=10):
+    return db.execute("""SELECT signature, COUNT(*), MAX(ts), MAX(message) FROM exceptions
+                         WHERE ts >= ? GROUP BY signature ORDER BY COUNT(*) DESC LIMIT ?""",
+                      (since, limit)).fetchall()
+
+def slow_requests(db, since, min_ms, path=None, limit=20):
+    query = "SELECT ts, process, method, path, status, duration_ms FROM requests WHERE duration_ms >= ? AND ts >= ?"
+    params = [min_ms, since]
+    if path:
+        query += " AND path LIKE ?"
+        params.append(f"%{path}%")
+    return db.execute(query + " ORDER BY duration_ms DESC LIMIT ?", params + [limit]).fetchall()
+
+def timed_request_count(db, since):
+    """Return (requests, requests with a duration) since a timestamp"""
+    return db.execute("SELECT COUNT(*), COUNT(duration_ms) FROM requests WHERE ts >= ?", (since,)).fetchone()
+
+def warn_if_untimed(db, since):
+    """Say so when no indexed request carries a duration, so an empty slow
+    list is not mistaken for 'nothing was slow'"""
+    total, timed = timed_request_count(db, since)
+    if total and not timed:
+        print(f"⚠️  None of the {total} indexed requests has a duration: the access log format "
+              f"records no timing, so slow-request figures are unavailable "
+              f"(see README_DIAGNOSTICS.md, 'Request timing')")
+        return True
+    return False
+
+def recent_crashes(db, since, limit=20):
+    return db.execute("SELECT ts, process, message FROM crashes WHERE ts >= ? ORDER BY ts DESC LIMIT ?",
+                      (since, limit)).fetchall()
+
+def requests_with_status(db, status, since, limit=20):
+    return db.execute("""SELECT path, COUNT(*), MAX(ts) FROM requests WHERE status = ? AND ts >= ?
+                         GROUP BY path ORDER BY COUNT(*) DESC LIMIT ?""", (status, since, limit)).fetchall()
+
+def summary(db, since):
+    total, errors, slow = db.execute("""SELECT COUNT(*), SUM(status >= 500), SUM(duration_ms >= 2000)
+                                        FROM requests WHERE ts >= ?""", (since,)).fetchone()
+    exceptions = db.execute("SELECT COUNT(*) FROM exceptions WHERE ts >= ?", (since,)).fetchone()[0]
+    crashes = db.execute("SELECT COUNT(*) FROM crashes WHERE ts >= ?", (since,)).fetchone()[0]
+    return {"requests": total, "server_errors": errors or 0, "slow_requests": slow or 0,
+            "exceptions": exceptions, "crashes": crashes}
+
+def clock(ts):
+    return datetime.fromtimestamp(ts).strftime("%m-%d %H:%M:%S")
+
+def option(args, name, default):
+    if name in args:
+        index = args.index(name)
+        if index + 1 < len(args):
+            return args[index + 1]
+    return default
+
+def analyze(args, log_path=LOG_FILE, index_path=INDEX_PATH):
+    """Update the index, then answer one query; args as on the command line"""
+    positional = [arg for i, arg in enumerate(args)
+                  if not arg.startswith("--") and (i == 0 or args[i - 1] not in ("--since", "--min", "--path", "--limit"))]
+    query = positional[0] if positional else "summary"
+    try:
+        since_text = option(args, "--since", "1h")
+        since = parse_since(since_text)
+        limit = int(option(args, "--limit", 10))
+        min_ms = float(option(args, "--min", 2)) * 1000
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 2
+
+    db = connect(index_path)
+    try:
+        start = time.perf_counter()
+        try:
+            lines, size = update_index(db, log_path)
+            print(f"📇 Indexed {lines} new lines ({size / 2**20:.1f}MB) in {time.perf_counter() - start:.2f}s")
+        except FileNotFoundError:
+            print(f"⚠️  {log_path} not found; querying the existing index")
+
+        if query == "exceptions":
+            print(f"\n🐞 Top {limit} exception signatures (last {since_text}):")
+            for signature, count, last, message in top_exceptions(db, since, limit):
+                print(f"  {count:>6}x  {signature}  (last {clock(last)})  {message[:80]}")
+        elif query == "slow":
+            path = option(args, "--path", None)
+            print(f"\n🐢 Requests over {min_ms / 1000:g}s{f' matching {path!r}' if path else ''} (last {since_text}):")
+            warn_if_untimed(db, since)
+            for ts, process, method, req_path, status, duration in slow_requests(db, since, min_ms, path, limit):
+                print(f"  {clock(ts)}  {duration / 1000:7.2f}s  {status}  {method} {req_path}  [{process}]")
+        elif query == "crashes":
+            print(f"\n💥 Worker crashes (last {since_text}):")
+            for ts, process, message in recent_crashes(db, since, limit):
+                print(f"  {clock(ts)}  {process:<14} {message}")
+        elif query == "status":
+            status = int(positional[1]) if len(positional) > 1 else 500
+            print(f"\n📊 Paths returning {status} (last {since_text}):")
+            for path, count, last in requests_with_status(db, status, since, limit):
+                print(f"  {count:>6}x  {path}  (last {clock(last)})")
+        elif query == "summary":
+            stats = summary(db, since)
+            print(f"\n📋 Last {since_text}: {stats['requests']} requests, {stats['server_errors']} 5xx, "
+                  f"{stats['slow_requests']} over 2s, {stats['exceptions']} exceptions, {stats['crashes']} crashes")
+            warn_if_untimed(db, since)
+            for signature, count, last, message in top_exceptions(db, since, 5):
+                print(f"  {count:>6}x  {signature}  {message[:80]}")
+        else:
+            print(f"❌ Unknown query: {query} (summary, exceptions, slow, crashes, status)")
+            return 2
+    finally:
+        db.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(analyze(sys.argv[1:]))
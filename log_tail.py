@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Log Tail for Frappe LMS
+Prints the end of /tmp/bench.log by seeking backwards in blocks, so the cost
+does not grow with the size of the log, and follows it with inotify (polling
+where inotify is unavailable). Lines can be filtered by process using the
+honcho "web.1 |" prefix while streaming.
+
+Usage:
+    python3 log_tail.py                       # last 50 lines
+    python3 log_tail.py 200 --process worker  # last 200 worker lines
+    python3 log_tail.py --follow --process web
+"""
+
+import ctypes
+import ctypes.util
+import os
+import re
+import select
+import struct
+import sys
+import time
+
+LOG_FILE = "/tmp/bench.log"
+BLOCK_SIZE = 64 * 1024
+POLL_INTERVAL = 0.25
+
+# Honcho prefix, optionally preceded by its timestamp: "12:00:01 web.1   | ..."
+PREFIX_PATTERN = re.compile(r"^(?:\d\d:\d\d:\d\d )?(?P<name>[\w-]+)\.\d+\s*\|")
+# --process name -> Procfile entries it covers
+PROCESS_GROUPS = {
+    "web": re.compile(r"^web$"),
+    "worker": re.compile(r"^(worker|schedule)"),
+    "socketio": re.compile(r"^socketio$"),
+    "redis": re.compile(r"^redis"),
+}
+
+IN_MODIFY = 0x002
+IN_ATTRIB = 0x004
+IN_MOVE_SELF = 0x800
+IN_DELETE_SELF = 0x400
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+def line_filter(process):
+    """Return a predicate over raw log lines (bytes) for a --process name, or None"""
+    if process is None:
+        return None
+    group = PROCESS_GROUPS[process]
+
+    def keep(line):
+        match = PREFIX_PATTERN.match(line.decode(errors="replace"))
+        return bool(match) and bool(group.match(match.group("name")))
+    return keep
+
+def tail_lines(path, count, keep=None, block_size=BLOCK_SIZE):
+    """Return the last `count` lines (bytes, without newlines) that pass keep,
+    reading the file backwards one block at a time"""
+    lines = []
+    with open(path, "rb") as f:
+        end = position = f.seek(0, os.SEEK_END)
+        partial = b""
+        while position > 0 and len(lines) < count:
+            start = max(0, position - block_size)
+            f.seek(start)
+            block = f.read(position - start)
+            pieces = (block + partial).split(b"\n")
+            # The first piece may continue in the block before this one
+            partial = pieces.pop(0)
+            if position == end and pieces and pieces[-1] == b"":
+                pieces.pop()  # a trailing newline ends the last line
+            position = start
+            for line in reversed(pieces):
+                if keep is None or keep(line):
+                    lines.append(line)
+                    if len(lines) == count:
+                        break
+        if end and position == 0 and len(lines) < count and (keep is None or keep(partial)):
+            lines.append(partial)
+    return list(reversed(lines))
+
+class Inotify:
+    """Minimal ctypes binding: wait for changes to one file"""
+
+    def __init__(self, path):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        mask = IN_MODIFY | IN_ATTRIB | IN_MOVE_SELF | IN_DELETE_SELF
+        if libc.inotify_add_watch(self.fd, os.fsencode(path), mask) < 0:
+            os.close(self.fd)
+            raise OSError(ctypes.get_errno(), "inotify_add_watch failed")
+
+    def wait(self, timeout):
+        """Block until an event or timeout; return True if the file moved or was deleted"""
+        moved = False
+        if select.select([self.fd], [], [], timeout)[0]:
+            try:
+                data = os.read(self.fd, 4096)
+            except BlockingIOError:
+                return False
+            offset = 0
+            while offset + 16 <= len(data):
+                _, mask, _, name_len = struct.unpack_from("iIII", data, offset)
+                moved = moved or bool(mask & (IN_MOVE_SELF | IN_DELETE_SELF))
+                offset += 16 + name_len
+        return moved
+
+    def close(self):
+        os.close(self.fd)
+
+def open_watcher(path):
+    try:
+        return Inotify(path)
+    except (OSError, AttributeError):
+        return None  # no inotify (non-Linux, or watch limit reached): poll instead
+
+def follow(path, keep=None, output=None):
+    """Print lines appended to path until interrupted, reopening it when it
+    is rotated or truncated"""
+    output = output or sys.stdout.buffer
+    f = open(path, "rb")
+    f.seek(0, os.SEEK_END)
+    watcher = open_watcher(path)
+    pending = b""
+
+    def emit(data):
+        lines = (pending + data).split(b"\n")
+        for line in lines[:-1]:
+            if keep is None or keep(line):
+                output.write(line + b"\n")
+        output.flush()
+        return lines[-1]
+
+    try:
+        while True:
+            data = f.read()
+            if data:
+                pending = emit(data)
+                continue
+
+            if watcher is not None:
+                moved = watcher.wait(1.0)
+            else:
+                time.sleep(POLL_INTERVAL)
+                moved = False
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue  # rotated away and not recreated yet
+            rotated = moved or stat.st_ino != os.fstat(f.fileno()).st_ino
+            if rotated or stat.st_size < f.tell():
+                if rotated:
+                    # Finish whatever was written to the old file before it was moved
+                    pending = emit(f.read())
+                    if pending:
+                        emit(b"\n")
+                # Read the new (or truncated) file from the start
+                f.close()
+                f = open(path, "rb")
+                pending = b""
+                if watcher is not None:
+                    watcher.close()
+                    watcher = open_watcher(path)
+    finally:
+        f.close()
+        if watcher is not None:
+            watcher.close()
+
+def parse_args(args):
+    """Return (count, follow, process) from a list like ['100', '-f', '--process', 'web']"""
+    count, following, process = 50, False, None
+    i = 0
+    while i < len(args):
+        arg = args[i]
+        if arg in ("--follow", "-f"):
+            following = True
+        elif arg == "--process":
+            i += 1
+            process = args[i] if i < len(args) else None
+            if process not in PROCESS_GROUPS:
+                raise ValueError(f"--process must be one of: {', '.join(PROCESS_GROUPS)}")
+        elif arg.isdigit():
+            count = int(arg)
+        i += 1
+    return count, following, process
+
+def show_log(args, path=LOG_FILE):
+    try:
+        count, following, process = parse_args(args)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 2
+    keep = line_filter(process)
+    try:
+        lines = tail_lines(path, count, keep)
+    except FileNotFoundError:
+        print("No log file found. Start services first with 'dev start'")
+        return 1
+    out = sys.stdout.buffer
+    for line in lines:
+        out.write(line + b"\n")
+    out.flush()
+    if following:
+        try:
+            follow(path, keep, out)
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(show_log(sys.argv[1:]))
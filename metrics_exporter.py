@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Metrics Exporter for Frappe LMS
+Caches the latest probe results and serves them as Prometheus/OpenMetrics
+text. Scrapes only read the cache; probes run on their own schedule, so any
+number of dashboards costs the LMS the same probe load as one.
+"""
+
+import re
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+DEFAULT_METRICS_PORT = 9469
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+OPENMETRICS_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+PROMETHEUS_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+def metric_label(name):
+    return re.sub(r"[^a-z0-9]+", "_", name.lower()).strip("_")
+
+class ProbeStats:
+    def __init__(self, kind):
+        self.kind = kind
+        self.up = 0
+        self.duration = 0.0
+        self.last_run = 0.0
+        self.runs = 0
+        self.failures = 0
+        self.buckets = [0] * len(LATENCY_BUCKETS)
+        self.latency_sum = 0.0
+        self.message = ""
+
+class MetricsCache:
+    """Latest result and latency histogram per probe, safe to share across threads"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.probes = {}
+
+    def record(self, name, kind, ok, duration, message=""):
+        with self.lock:
+            stats = self.probes.setdefault(name, ProbeStats(kind))
+            stats.up = 1 if ok else 0
+            stats.duration = duration
+            stats.last_run = time.time()
+            stats.runs += 1
+            stats.failures += 0 if ok else 1
+            stats.latency_sum += duration
+            stats.message = message
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if duration <= bound:
+                    stats.buckets[i] += 1
+
+    def render(self, openmetrics=False):
+        """Render the cached results; never runs a probe"""
+        with self.lock:
+            probes = sorted(self.probes.items())
+            lines = []
+
+            def family(name, kind, help_text):
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+
+            def labels(name, stats, extra=""):
+                return f'probe="{metric_label(name)}",kind="{stats.kind}"{extra}'
+
+            family("lms_probe_up", "gauge", "Whether the last probe succeeded (1) or failed (0).")
+            for name, stats in probes:
+                lines.append(f"lms_probe_up{{{labels(name, stats)}}} {stats.up}")
+
+            family("lms_probe_duration_seconds", "gauge", "Wall time of the last probe run.")
+            for name, stats in probes:
+                lines.append(f"lms_probe_duration_seconds{{{labels(name, stats)}}} {stats.duration:.6f}")
+
+            family("lms_probe_last_run_timestamp_seconds", "gauge", "Unix time the probe last completed.")
+            for name, stats in probes:
+                lines.append(f"lms_probe_last_run_timestamp_seconds{{{labels(name, stats)}}} {stats.last_run:.3f}")
+
+            # OpenMetrics names the counter family without the _total suffix
+            for counter, attr, help_text in (("lms_probe_runs", "runs", "Probe runs since the exporter started."),
+                                             ("lms_probe_failures", "failures", "Failed probe runs since the exporter started.")):
+                family(counter if openmetrics else f"{counter}_total", "counter", help_text)
+                for name, stats in probes:
+                    lines.append(f"{counter}_total{{{labels(name, stats)}}} {getattr(stats, attr)}")
+
+            family("lms_probe_latency_seconds", "histogram", "Distribution of probe durations.")
+            for name, stats in probes:
+                bounds = [str(bound) for bound in LATENCY_BUCKETS] + ["+Inf"]
+                for bound, count in zip(bounds, stats.buckets + [stats.runs]):
+                    bucket_labels = labels(name, stats, f',le="{bound}"')
+                    lines.append(f"lms_probe_latency_seconds_bucket{{{bucket_labels}}} {count}")
+                lines.append(f"lms_probe_latency_seconds_count{{{labels(name, stats)}}} {stats.runs}")
+                lines.append(f"lms_probe_latency_seconds_sum{{{labels(name, stats)}}} {stats.latency_sum:.6f}")
+
+        if openmetrics:
+            lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+def make_handler(cache):
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                body = b'<html><body><a href="/metrics">Frappe LMS probe metrics</a></body></html>'
+                content_type = "text/html; charset=utf-8"
+                status = 200 if self.path == "/" else 404
+            else:
+                openmetrics = "application/openmetrics-text" in self.headers.get("Accept", "")
+                body = cache.render(openmetrics).encode()
+                content_type = OPENMETRICS_TYPE if openmetrics else PROMETHEUS_TYPE
+                status = 200
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass  # scrapes every few seconds would flood the terminal
+
+    return MetricsHandler
+
+def serve_metrics(cache, port=DEFAULT_METRICS_PORT, host="127.0.0.1"):
+    """Serve the cache on host:port until interrupted"""
+    server = ThreadingHTTPServer((host, port), make_handler(cache))
+    server.daemon_threads = True
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
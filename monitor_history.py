@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Monitor History for Frappe LMS
+Fixed-size, array-backed ring buffers of probe samples (timestamp, up/down,
+latency) with automatic minute and hour rollups. Each probe's history lives
+in one flat buffer, optionally a memory-mapped file, so memory stays flat for
+weeks of monitoring and history survives monitor restarts.
+"""
+
+import math
+import mmap
+import os
+import re
+import struct
+
+DEFAULT_HISTORY_DIR = os.path.expanduser("~/.cache/lms-monitor")
+
+MAGIC = b"LMSTS001"
+# Per-ring header: capacity, head (next write slot), length
+RING_HEADER = struct.Struct("<III")
+HEADER_SIZE = 64
+
+# Raw sample: timestamp, latency ms (NaN if unknown), up flag
+SAMPLE = struct.Struct("<dfBxxx")
+# Rollup: bucket start, samples, up samples, samples with latency, latency sum, latency max
+ROLLUP = struct.Struct("<dIIIdf")
+
+RAW_CAPACITY = 3600        # 30 minutes at the web server's 0.5s interval
+MINUTE_CAPACITY = 1440     # one day of minutes
+HOUR_CAPACITY = 24 * 60    # sixty days of hours
+
+class RingBuffer:
+    """Fixed-capacity ring of fixed-size records stored in a shared buffer"""
+
+    def __init__(self, buffer, header_offset, data_offset, record, capacity):
+        self.buffer = buffer
+        self.header_offset = header_offset
+        self.data_offset = data_offset
+        self.record = record
+        self.capacity = capacity
+        stored_capacity, self.head, self.length = RING_HEADER.unpack_from(buffer, header_offset)
+        if stored_capacity != capacity:
+            self.head = self.length = 0
+            self._save_header()
+
+    @staticmethod
+    def size(record, capacity):
+        return record.size * capacity
+
+    def _save_header(self):
+        RING_HEADER.pack_into(self.buffer, self.header_offset, self.capacity, self.head, self.length)
+
+    def _offset(self, slot):
+        return self.data_offset + slot * self.record.size
+
+    def append(self, *values):
+        self.record.pack_into(self.buffer, self._offset(self.head), *values)
+        self.head = (self.head + 1) % self.capacity
+        self.length = min(self.length + 1, self.capacity)
+        self._save_header()
+
+    def last(self):
+        if not self.length:
+            return None
+        return self.record.unpack_from(self.buffer, self._offset((self.head - 1) % self.capacity))
+
+    def replace_last(self, *values):
+        self.record.pack_into(self.buffer, self._offset((self.head - 1) % self.capacity), *values)
+
+    def __len__(self):
+        return self.length
+
+    def __iter__(self):
+        """Yield records from oldest to newest"""
+        start = (self.head - self.length) % self.capacity
+        for i in range(self.length):
+            yield self.record.unpack_from(self.buffer, self._offset((start + i) % self.capacity))
+
+    def newest_first(self):
+        """Yield records from newest to oldest"""
+        for i in range(1, self.length + 1):
+            yield self.record.unpack_from(self.buffer, self._offset((self.head - i) % self.capacity))
+
+class ProbeHistory:
+    """Raw samples plus minute and hour rollups for one probe"""
+
+    RINGS = [("raw", SAMPLE, RAW_CAPACITY),
+             ("minutes", ROLLUP, MINUTE_CAPACITY),
+             ("hours", ROLLUP, HOUR_CAPACITY)]
+
+    def __init__(self, path=None):
+        total = HEADER_SIZE + sum(RingBuffer.size(record, capacity) for _, record, capacity in self.RINGS)
+        self.path = path
+        self._file = None
+        if path:
+            self._file = open(path, "a+b")
+            if os.fstat(self._file.fileno()).st_size != total:
+                self._file.truncate(0)
+                self._file.truncate(total)
+            self.buffer = mmap.mmap(self._file.fileno(), total)
+        else:
+            self.buffer = bytearray(total)
+
+        if bytes(self.buffer[:len(MAGIC)]) != MAGIC:
+            self.buffer[:HEADER_SIZE] = MAGIC + bytes(HEADER_SIZE - len(MAGIC))
+
+        offset = HEADER_SIZE
+        for index, (name, record, capacity) in enumerate(self.RINGS):
+            header_offset = len(MAGIC) + index * RING_HEADER.size
+            setattr(self, name, RingBuffer(self.buffer, header_offset, offset, record, capacity))
+            offset += RingBuffer.size(record, capacity)
+
+    def record(self, timestamp, up, latency_ms=None):
+        latency = float("nan") if latency_ms is None else latency_ms
+        self.raw.append(timestamp, latency, 1 if up else 0)
+        self._roll_up(self.minutes, timestamp - timestamp % 60, up, latency_ms)
+        self._roll_up(self.hours, timestamp - timestamp % 3600, up, latency_ms)
+
+    @staticmethod
+    def _roll_up(ring, bucket, up, latency_ms):
+        """Fold a sample into the newest rollup, starting a new one on a bucket change"""
+        last = ring.last()
+        if last is None or last[0] != bucket:
+            last = (bucket, 0, 0, 0, 0.0, 0.0)
+            ring.append(*last)
+        start, count, up_count, latency_count, latency_sum, latency_max = last
+        count += 1
+        up_count += 1 if up else 0
+        if latency_ms is not None:
+            latency_count += 1
+            latency_sum += latency_ms
+            latency_max = max(latency_max, latency_ms)
+        ring.replace_last(start, count, up_count, latency_count, latency_sum, latency_max)
+
+    def recent(self, since):
+        """Return (uptime %, avg latency ms, max latency ms, samples) from raw samples
+        since a timestamp, for windows shorter than a rollup bucket"""
+        count = up_count = latency_count = 0
+        latency_sum = latency_max = 0.0
+        for timestamp, latency, up in self.raw.newest_first():
+            if timestamp < since:
+                break
+            count += 1
+            up_count += up
+            if not math.isnan(latency):
+                latency_count += 1
+                latency_sum += latency
+                latency_max = max(latency_max, latency)
+        if not count:
+            return None
+        avg = latency_sum / latency_count if latency_count else math.nan
+        return up_count * 100 / count, avg, latency_max, count
+
+    def summary(self, since):
+        """Return (uptime %, avg latency ms, max latency ms, samples) over rollups since a timestamp"""
+        ring = self.minutes if since >= self._oldest(self.minutes) else self.hours
+        count = up_count = latency_count = 0
+        latency_sum = latency_max = 0.0
+        for start, c, u, lc, ls, lm in ring:
+            if start + (60 if ring is self.minutes else 3600) <= since:
+                continue
+            count += c
+            up_count += u
+            latency_count += lc
+            latency_sum += ls
+            latency_max = max(latency_max, lm)
+        if not count:
+            return None
+        avg = latency_sum / latency_count if latency_count else math.nan
+        return up_count * 100 / count, avg, latency_max, count
+
+    @staticmethod
+    def _oldest(ring):
+        for record in ring:
+            return record[0]
+        return math.inf
+
+    def flush(self):
+        if self._file:
+            self.buffer.flush()
+
+    def close(self):
+        if self._file:
+            self.buffer.flush()
+            self.buffer.close()
+            self._file.close()
+            self._file = None
+
+def history_path(name, directory=DEFAULT_HISTORY_DIR):
+    slug = re.sub(r"[^a-z0-9]+", "_", name.lower()).strip("_")
+    return os.path.join(directory, f"{slug}.ts")
+
+class MonitorHistory:
+    """ProbeHistory per probe name, in memory or memory-mapped under a directory"""
+
+    def __init__(self, directory=None):
+        self.directory = directory
+        self.probes = {}
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def get(self, name):
+        if name not in self.probes:
+            path = history_path(name, self.directory) if self.directory else None
+            self.probes[name] = ProbeHistory(path)
+        return self.probes[name]
+
+    def record(self, name, timestamp, up, latency_ms=None):
+        self.get(name).record(timestamp, up, latency_ms)
+
+    def flush(self):
+        for history in self.probes.values():
+            history.flush()
+
+    def close(self):
+        for history in self.probes.values():
+            history.close()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Probe Result Cache for Frappe LMS
+A short-lived on-disk cache shared by the diagnostic tools, so scripts run
+back to back (health_check.py then service_monitor.py, as dev_helper.py test
+runs them) reuse each other's fresh probe results instead of probing again.
+Each probe identity is one small JSON file under ~/.cache/lms-monitor/probes,
+replaced atomically, so concurrent tools and threads never see a partial entry.
+
+Usage:
+    python3 probe_cache.py           # list cached probes and their age
+    python3 probe_cache.py clear     # drop every cached result
+"""
+
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+
+CACHE_DIR = os.path.expanduser("~/.cache/lms-monitor/probes")
+DEFAULT_TTL = 10
+
+class ProbeCache:
+    """Probe results keyed by identity (any JSON-serialisable value), valid for ttl seconds"""
+
+    def __init__(self, directory=CACHE_DIR, ttl=DEFAULT_TTL):
+        self.directory = directory
+        self.ttl = ttl
+
+    def path(self, key):
+        digest = hashlib.sha1(json.dumps(key, sort_keys=True, default=str).encode()).hexdigest()
+        return os.path.join(self.directory, f"{digest}.json")
+
+    def get(self, key):
+        """Return the cached value for key, or None if missing or older than the TTL"""
+        try:
+            with open(self.path(key)) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if time.time() - entry.get("stored", 0) > self.ttl:
+            return None
+        return entry.get("value")
+
+    def put(self, key, value):
+        path = self.path(key)
+        # Unique per thread, so concurrent writers never share a temp file
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(tmp_path, "w") as f:
+                json.dump({"key": key, "stored": time.time(), "value": value}, f, default=str)
+            os.replace(tmp_path, path)
+        except OSError:
+            pass  # an unwritable cache only costs a re-probe
+
+    def entries(self):
+        """Return [(key, age in seconds)] for every cached result"""
+        entries = []
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return entries
+        for name in sorted(names):
+            if not name.endswith(".json"):
+                continue
+            try:
+                with open(os.path.join(self.directory, name)) as f:
+                    entry = json.load(f)
+            except (OSError, ValueError):
+                continue
+            entries.append((entry.get("key"), time.time() - entry.get("stored", 0)))
+        return entries
+
+    def clear(self):
+        """Delete every cached result; return how many were removed"""
+        removed = 0
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return 0
+        for name in names:
+            try:
+                os.remove(os.path.join(self.directory, name))
+                removed += 1
+            except OSError:
+                pass
+        return removed
+
+def main():
+    cache = ProbeCache()
+    if len(sys.argv) > 1 and sys.argv[1] == "clear":
+        print(f"✓ Removed {cache.clear()} cached probe result(s)")
+        return 0
+    entries = cache.entries()
+    if not entries:
+        print(f"ℹ No cached probe results in {cache.directory}")
+    for key, age in sorted(entries, key=lambda entry: entry[1]):
+        mark = "✓" if age <= cache.ttl else "·"
+        print(f"{mark} {age:6.1f}s  {json.dumps(key)}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Bench Process Inspector for Frappe LMS
+Walks /proc once per cycle to find the bench's processes (gunicorn master and
+workers, RQ workers, socketio, redis, scheduler) and samples CPU %, RSS,
+threads and open fds for each. CPU % comes from diffing /proc/<pid>/stat
+between cycles, so keep one inspector around and call sample() repeatedly.
+
+Usage:
+    python3 proc_inspector.py           # two samples 1s apart
+    python3 proc_inspector.py 5         # ... 5s apart
+"""
+
+import os
+import re
+import sys
+import time
+from collections import namedtuple
+
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+CPU_ALERT_PERCENT = 90
+RSS_ALERT_MB = 1024
+RSS_GROWTH_ALERT_MB = 256
+
+ProcessSample = namedtuple("ProcessSample",
+                           "pid ppid role cpu_percent rss_mb rss_growth_mb threads open_fds cmdline")
+
+# Checked in order; the first matching pattern names the role
+ROLE_PATTERNS = [
+    ("socketio", re.compile(r"socketio\.js")),
+    ("redis", re.compile(r"redis-server")),
+    ("scheduler", re.compile(r"\b(bench|frappe) schedule\b|frappe\.utils\.scheduler")),
+    ("worker", re.compile(r"\b(bench|frappe) worker\b|\brq:(worker|job|work-horse)|\brq worker\b")),
+    ("web", re.compile(r"\b(bench|frappe) serve\b|frappe\.app")),
+    ("bench", re.compile(r"\bbench start\b|\bhoncho\b")),
+    ("watch", re.compile(r"\b(bench|frappe) watch\b")),
+]
+
+def read_cmdline(pid):
+    try:
+        with open(f"/proc/{pid}/cmdline", "rb") as f:
+            return f.read().replace(b"\0", b" ").decode(errors="replace").strip()
+    except OSError:
+        return ""
+
+def read_stat(pid):
+    """Return (ppid, cpu_ticks, threads, starttime, rss_bytes) from /proc/<pid>/stat"""
+    with open(f"/proc/{pid}/stat") as f:
+        data = f.read()
+    # The command name may contain spaces, so split after its closing parenthesis
+    fields = data[data.rindex(")") + 2:].split()
+    return (int(fields[1]), int(fields[11]) + int(fields[12]), int(fields[17]),
+            int(fields[19]), int(fields[21]) * PAGE_SIZE)
+
+def classify(cmdline, parent_cmdline):
+    if "gunicorn" in cmdline:
+        return "gunicorn-worker" if "gunicorn" in parent_cmdline else "gunicorn-master"
+    for role, pattern in ROLE_PATTERNS:
+        if pattern.search(cmdline):
+            if role == "redis":
+                port = re.search(r":(\d+)", cmdline)
+                return f"redis:{port.group(1)}" if port else role
+            return role
+    return None
+
+class ProcessInspector:
+    """Samples bench processes, keeping the previous sample to compute CPU %"""
+
+    def __init__(self):
+        # (pid, starttime) -> (cpu_ticks, wall time, first rss)
+        self.previous = {}
+        self.last_sampled = None
+
+    def sample(self):
+        now = time.monotonic()
+        cmdlines = {}
+        for entry in os.listdir("/proc"):
+            if entry.isdigit():
+                cmdlines[int(entry)] = read_cmdline(entry)
+
+        samples = []
+        seen = {}
+        for pid, cmdline in cmdlines.items():
+            if not cmdline:
+                continue
+            try:
+                ppid, ticks, threads, starttime, rss = read_stat(pid)
+            except (OSError, ValueError, IndexError):
+                continue
+            role = classify(cmdline, cmdlines.get(ppid, ""))
+            if role is None:
+                continue
+
+            key = (pid, starttime)
+            previous = self.previous.get(key)
+            cpu_percent = None
+            first_rss = rss
+            if previous:
+                prev_ticks, prev_time, first_rss = previous
+                if now > prev_time:
+                    cpu_percent = (ticks - prev_ticks) / CLOCK_TICKS / (now - prev_time) * 100
+            seen[key] = (ticks, now, first_rss)
+
+            try:
+                open_fds = len(os.listdir(f"/proc/{pid}/fd"))
+            except OSError:
+                open_fds = None
+
+            samples.append(ProcessSample(pid, ppid, role, cpu_percent, rss / 2**20,
+                                         (rss - first_rss) / 2**20, threads, open_fds, cmdline))
+
+        # Forget processes that exited so the table cannot grow without bound
+        self.previous = seen
+        self.last_sampled = now
+        return sorted(samples, key=lambda s: (s.role, s.pid))
+
+def alerts(sample):
+    """Return a list of human-readable problems with a process sample"""
+    problems = []
+    if sample.cpu_percent is not None and sample.cpu_percent >= CPU_ALERT_PERCENT:
+        problems.append(f"CPU {sample.cpu_percent:.0f}%")
+    if sample.rss_mb >= RSS_ALERT_MB:
+        problems.append(f"RSS {sample.rss_mb:.0f}MB")
+    if sample.rss_growth_mb >= RSS_GROWTH_ALERT_MB:
+        problems.append(f"RSS +{sample.rss_growth_mb:.0f}MB since first seen")
+    return problems
+
+def role_counts(samples):
+    counts = {}
+    for sample in samples:
+        role = sample.role.split(":")[0]
+        counts[role] = counts.get(role, 0) + 1
+    return counts
+
+def format_sample(sample):
+    cpu = "   -  " if sample.cpu_percent is None else f"{sample.cpu_percent:5.1f}%"
+    fds = "-" if sample.open_fds is None else sample.open_fds
+    return (f"{sample.role:<16}{sample.pid:>8}  CPU {cpu}  RSS {sample.rss_mb:7.1f}MB  "
+            f"threads {sample.threads:>3}  fds {fds:>4}")
+
+_inspector = None
+
+def get_process_inspector():
+    """Return the process-wide inspector so CPU % is measured across calls"""
+    global _inspector
+    if _inspector is None:
+        _inspector = ProcessInspector()
+    return _inspector
+
+def main():
+    interval = float(sys.argv[1]) if len(sys.argv) > 1 else 1.0
+    inspector = ProcessInspector()
+    inspector.sample()
+    time.sleep(interval)
+    samples = inspector.sample()
+    if not samples:
+        print("✗ No bench processes found")
+        return 1
+    for sample in samples:
+        problems = alerts(sample)
+        print(f"{'⚠' if problems else '✓'} {format_sample(sample)}"
+              + (f"  <- {', '.join(problems)}" if problems else ""))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
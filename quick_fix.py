@@ -6,15 +6,57 @@ Automatically fixes common issues based on health check results
 
 import subprocess
 import sys
+import threading
 import time
-import requests
 import os
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from build_fingerprint import build_if_needed
+from lms_probes import enable_cache, fresh_probes, probe_mariadb, probe_port
+from readiness import wait_until_ready, wait_until_down
+from redis_probe import REDIS_PORTS
+from socket_table import SocketTable
+from start_orchestrator import PROCFILE, start_all, stop_all
+
+BENCH_PATH = "/workspaces/The-frappe-LMS-/lms-bench"
+FRONTEND_PATH = f"{BENCH_PATH}/apps/lms/lms/public/frontend"
+
+class ThreadBufferedOutput:
+    """sys.stdout stand-in: threads that called capture() write to their own
+    buffer, everyone else writes straight through"""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.local = threading.local()
+
+    def capture(self):
+        self.local.parts = []
+
+    def release(self):
+        parts, self.local.parts = self.local.parts, None
+        return "".join(parts)
+
+    def write(self, text):
+        parts = getattr(self.local, "parts", None)
+        if parts is None:
+            return self.stream.write(text)
+        parts.append(text)
+        return len(text)
+
+    def flush(self):
+        if getattr(self.local, "parts", None) is None:
+            self.stream.flush()
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
 
 def run_command(cmd, description=""):
     """Run a shell command and return result"""
     print(f"⚡ Running: {description if description else cmd}")
     try:
-        result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
+        # Fixes may run on parallel threads, so pass cwd instead of os.chdir
+        cwd = BENCH_PATH if os.path.isdir(BENCH_PATH) else None
+        result = subprocess.run(cmd, shell=True, capture_output=True, text=True, cwd=cwd)
         if result.returncode == 0:
             print(f"✓ Success: {description}")
             return True, result.stdout
@@ -28,11 +70,8 @@ def run_command(cmd, description=""):
 
 def check_port(port):
     """Check if a port is open"""
-    try:
-        response = requests.get(f"http://127.0.0.1:{port}", timeout=3)
-        return True
-    except:
-        return False
+    # Redis is asked directly with PING; anything else must answer HTTP
+    return probe_port(port, timeout=3).ok
 
 def fix_mariadb():
     """Fix MariaDB issues"""
@@ -44,36 +83,33 @@ def fix_mariadb():
     if not success:
         print("Starting MariaDB...")
         run_command("sudo service mariadb start", "Start MariaDB")
-        time.sleep(3)
+        wait_until_ready(["mariadb"], timeout=30)
     
-    # Check if we can connect to database
-    os.chdir("/workspaces/The-frappe-LMS-/lms-bench")
-    success, _ = run_command("bench --site lms.local execute \"frappe.db.sql('SELECT 1')\"", "Test database connection")
-    if not success:
+    # Check if we can connect to database (direct probe, or bench execute without a driver)
+    result = probe_mariadb(verify_connection=True, cached=False)
+    print(f"{'✓' if result.ok else '✗'} Database connection: {result.message}")
+    if not result.ok:
         print("Database connection failed - attempting to fix...")
         run_command("bench --site lms.local migrate", "Run database migration")
         run_command("bench --site lms.local execute \"frappe.db.sql('SELECT 1')\"", "Verify database connection")
 
-def fix_cache_issues():
-    """Clear all caches and rebuild"""
+def fix_cache_issues(force_build=False):
+    """Clear all caches and rebuild if the build fingerprint changed"""
     print("\n🔧 FIXING CACHE & BUILD ISSUES")
     print("=" * 50)
     
-    os.chdir("/workspaces/The-frappe-LMS-/lms-bench")
-    
     # Clear caches
     run_command("bench clear-cache", "Clear Frappe cache")
     run_command("bench clear-website-cache", "Clear website cache")
     
-    # Rebuild assets
-    run_command("bench build", "Rebuild assets")
+    # Rebuild assets only when sources changed or the output is damaged
+    build_if_needed(lambda: run_command("bench build", "Rebuild assets")[0], force=force_build)
     
 def fix_permissions():
     """Fix file permissions"""
     print("\n🔧 FIXING PERMISSIONS")
     print("=" * 50)
     
-    os.chdir("/workspaces/The-frappe-LMS-/lms-bench")
     run_command("bench set-config allow_tests true", "Allow tests")
     run_command("bench setup requirements", "Setup requirements")
 
@@ -82,15 +118,162 @@ def restart_services():
     print("\n🔧 RESTARTING SERVICES")
     print("=" * 50)
     
-    # Kill any hanging processes
+    # Stop orchestrator-started components by process group (workers,
+    # scheduler and watch hold no port), then anything under 'bench start'
+    print(f"✓ Signalled {stop_all()} orchestrator process group(s)")
     run_command("pkill -f 'bench start'", "Kill existing bench processes")
-    time.sleep(2)
+    wait_until_down(["web", "socketio", "redis-queue", "redis-cache"], timeout=10)
     
     # Restart MariaDB
     run_command("sudo service mariadb restart", "Restart MariaDB")
-    time.sleep(3)
+    wait_until_ready(["mariadb"], timeout=30)
     
-    print("✓ Services restart initiated. Run 'bench start' to start LMS services.")
+    # Start the bench again so the plan's verify step sees it back up
+    if not os.path.exists(PROCFILE):
+        print(f"⚠ No Procfile at {PROCFILE}; run 'bench start' to start LMS services.")
+        return
+    if start_all():
+        print("✓ Services restarted")
+    else:
+        print("✗ Some services did not become ready; see /tmp/bench.log")
+
+def database_healthy():
+    """Pre-condition for fix_mariadb: the site database answers a query"""
+    return probe_mariadb(verify_connection=True, timeout=30).ok
+
+def assets_healthy():
+    """Pre-condition for fix_cache_issues: the frontend build output is present"""
+    return all(os.path.exists(os.path.join(FRONTEND_PATH, name)) for name in ("index.html", "sw.js"))
+
+def requirements_healthy():
+    """Pre-condition for fix_permissions: the bench env can import frappe and lms"""
+    python = os.path.join(BENCH_PATH, "env", "bin", "python")
+    return subprocess.run([python, "-c", "import frappe, lms"], capture_output=True,
+                          cwd=BENCH_PATH, timeout=30).returncode == 0
+
+def services_healthy():
+    """Pre-condition for restart_services: web, socketio and both Redis instances are up"""
+    listening = SocketTable()
+    return (listening.is_listening(8000) and listening.is_listening(9000)
+            and all(check_port(port) for port in REDIS_PORTS))
+
+class FixStep:
+    """A fix that runs only when its health probe fails, after its dependencies"""
+
+    def __init__(self, name, fix, probe, depends_on=(), run_if_dependency_fixed=False):
+        self.name = name
+        self.fix = fix
+        self.probe = probe
+        self.depends_on = tuple(depends_on)
+        self.run_if_dependency_fixed = run_if_dependency_fixed
+
+def build_fix_plan(force_build=False):
+    """The database fix runs `bench migrate` from the bench env that the
+    requirements fix reinstalls, so it waits for it; the cache needs the
+    database for clear-cache, and services are restarted last, also whenever
+    an earlier fix ran"""
+    return [
+        FixStep("perms", fix_permissions, requirements_healthy),
+        FixStep("db", fix_mariadb, database_healthy, depends_on=["perms"]),
+        FixStep("cache", lambda: fix_cache_issues(force_build), assets_healthy, depends_on=["db"]),
+        FixStep("restart", restart_services, services_healthy,
+                depends_on=["db", "perms", "cache"], run_if_dependency_fixed=True),
+    ]
+
+def timed_probe(probe):
+    start = time.perf_counter()
+    try:
+        healthy = bool(probe())
+    except Exception:
+        healthy = False
+    return healthy, time.perf_counter() - start
+
+def run_step(step, force, dependency_fixed):
+    """Probe, fix if needed, re-probe; return a timing record for the step"""
+    record = {"name": step.name, "probe": 0.0, "fix": 0.0, "verify": 0.0}
+    if force:
+        record["action"] = "forced"
+    else:
+        healthy, record["probe"] = timed_probe(step.probe)
+        if healthy and not (step.run_if_dependency_fixed and dependency_fixed):
+            record["action"] = "skipped (healthy)"
+            record["healthy"] = True
+            return record
+        record["action"] = "ran (dependency fixed)" if healthy else "ran (probe failed)"
+
+    start = time.perf_counter()
+    try:
+        step.fix()
+    except Exception as e:
+        # Record the failure so the rest of the plan and the timing table still run
+        record["fix"] = time.perf_counter() - start
+        record["action"] = "fix crashed"
+        record["healthy"] = False
+        print(f"✗ {step.name} fix crashed: {e}")
+        return record
+    record["fix"] = time.perf_counter() - start
+    # Verify against the fixed system, not a result cached before the fix
+    with fresh_probes():
+        record["healthy"], record["verify"] = timed_probe(step.probe)
+    return record
+
+def _run_buffered(output, step, force, dependency_fixed):
+    """Run a step on a worker thread, capturing what it prints"""
+    output.capture()
+    try:
+        record = run_step(step, force, dependency_fixed)
+    finally:
+        text = output.release()
+    return record, text
+
+def run_fix_plan(plan, force=False, max_workers=4):
+    """Run each fix whose probe fails, independent fixes concurrently.
+
+    Each step's output is buffered and printed in plan order once the step
+    and every step before it have finished, so concurrent fixes never
+    interleave their lines.
+    """
+    records = {}
+    outputs = {}
+    running = {}
+    waiting = list(plan)
+    fixed = set()
+    printed = 0
+    output = ThreadBufferedOutput(sys.stdout)
+    sys.stdout = output
+
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            while waiting or running:
+                for step in list(waiting):
+                    if all(dep in records for dep in step.depends_on):
+                        waiting.remove(step)
+                        dependency_fixed = any(dep in fixed for dep in step.depends_on)
+                        running[executor.submit(_run_buffered, output, step, force, dependency_fixed)] = step
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    step = running.pop(future)
+                    records[step.name], outputs[step.name] = future.result()
+                    if not records[step.name]["action"].startswith("skipped"):
+                        fixed.add(step.name)
+                while printed < len(plan) and plan[printed].name in outputs:
+                    output.stream.write(outputs[plan[printed].name])
+                    output.stream.flush()
+                    printed += 1
+    finally:
+        sys.stdout = output.stream
+
+    print_fix_timings([records[step.name] for step in plan])
+    return records
+
+def print_fix_timings(records):
+    print("\n⏱️  FIX PLAN TIMING")
+    print("=" * 78)
+    print(f"{'Step':<10}{'Action':<26}{'Probe':>9}{'Fix':>10}{'Verify':>9}  Result")
+    for record in records:
+        result = "healthy" if record.get("healthy") else "STILL FAILING"
+        print(f"{record['name']:<10}{record['action']:<26}{record['probe']:>8.1f}s"
+              f"{record['fix']:>9.1f}s{record['verify']:>8.1f}s  {result}")
 
 def main():
     print("🚀 FRAPPE LMS QUICK FIX")
@@ -102,25 +285,30 @@ def main():
         fix_type = sys.argv[1].lower()
     else:
         print("Available fixes:")
-        print("  python3 quick_fix.py all       - Run all fixes")
+        print("  python3 quick_fix.py all       - Run every fix whose health check fails")
+        print("  python3 quick_fix.py all --force - Run all fixes unconditionally")
         print("  python3 quick_fix.py db        - Fix database issues")
-        print("  python3 quick_fix.py cache     - Clear cache and rebuild")
+        print("  python3 quick_fix.py cache     - Clear cache and rebuild if sources changed")
+        print("  python3 quick_fix.py cache --force - Clear cache and always rebuild")
         print("  python3 quick_fix.py perms     - Fix permissions")
         print("  python3 quick_fix.py restart   - Restart services")
+        print("  (add --no-cache to re-probe instead of reusing results from the last few seconds)")
         print()
         fix_type = input("Enter fix type (or 'all'): ").lower()
     
     start_time = time.time()
+    # Health probes may reuse results from a health check run just before
+    if "--no-cache" not in sys.argv:
+        enable_cache()
     
     if fix_type == "all":
-        fix_mariadb()
-        fix_cache_issues()
-        fix_permissions()
-        restart_services()
+        # Only fixes whose health probe fails run; --force runs them all
+        force = "--force" in sys.argv
+        run_fix_plan(build_fix_plan(force_build=force), force=force)
     elif fix_type == "db":
         fix_mariadb()
     elif fix_type == "cache":
-        fix_cache_issues()
+        fix_cache_issues(force_build="--force" in sys.argv)
     elif fix_type == "perms":
         fix_permissions()
     elif fix_type == "restart":
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Readiness Waiter for Frappe LMS
+Polls each service with its own probe (MariaDB connect, Redis PING, HTTP 200
+on /lms, socket.io handshake) using tight exponential backoff up to a
+deadline, and reports the measured time-to-ready. Used instead of fixed
+sleeps after starting, stopping or restarting services.
+
+Usage:
+    python3 readiness.py web socketio redis-queue redis-cache
+    python3 readiness.py --timeout 30 mariadb
+    python3 readiness.py --down web socketio   # wait for ports to close
+"""
+
+import socket
+import sys
+import threading
+import time
+
+from db_probe import get_mariadb_probe, read_site_config
+from lms_probes import get_session, probe_http
+from redis_probe import RedisProbe
+from socket_table import SocketTable
+
+BASE_URL = "http://127.0.0.1:8000"
+DEFAULT_TIMEOUT = 60
+INITIAL_DELAY = 0.05
+BACKOFF_FACTOR = 1.5
+MAX_DELAY = 1.0
+
+SERVICE_PORTS = {
+    "mariadb": 3306,
+    "web": 8000,
+    "socketio": 9000,
+    "redis-queue": 11000,
+    "redis-cache": 13000,
+}
+
+def mariadb_ready():
+    probe = get_mariadb_probe()
+    if probe is not None:
+        return probe.probe().ok
+    # No driver: the server greeting proves mysqld is accepting connections
+    config = read_site_config()
+    address = (config.get("db_host") or "127.0.0.1", int(config.get("db_port") or 3306))
+    with socket.create_connection(address, timeout=1) as sock:
+        sock.settimeout(1)
+        return len(sock.recv(4)) == 4
+
+def redis_ready(port):
+    # A fresh probe per attempt; a half-started Redis may drop early sockets
+    probe = RedisProbe(port, timeout=1)
+    try:
+        return probe.command("PING") == "PONG"
+    finally:
+        probe.close()
+
+def web_ready():
+    return probe_http(f"{BASE_URL}/lms", timeout=2, cached=False).ok
+
+def socketio_ready():
+    # Engine.IO handshake: an open packet ("0{...sid...}") over long-polling
+    response = get_session().get(f"http://127.0.0.1:{SERVICE_PORTS['socketio']}/socket.io/",
+                            params={"EIO": "4", "transport": "polling"}, timeout=2)
+    return response.status_code == 200 and response.text.lstrip().startswith("0")
+
+READINESS_PROBES = {
+    "mariadb": mariadb_ready,
+    "web": web_ready,
+    "socketio": socketio_ready,
+    "redis-queue": lambda: redis_ready(SERVICE_PORTS["redis-queue"]),
+    "redis-cache": lambda: redis_ready(SERVICE_PORTS["redis-cache"]),
+}
+
+def poll_until(check, timeout, give_up=None):
+    """Call check() with exponential backoff until it returns True or the
+    deadline passes (or give_up() returns True); return (ok, seconds waited, attempts)"""
+    start = time.monotonic()
+    deadline = start + timeout
+    delay = INITIAL_DELAY
+    attempts = 0
+    while True:
+        attempts += 1
+        try:
+            if check():
+                return True, time.monotonic() - start, attempts
+        except Exception:
+            pass
+        remaining = deadline - time.monotonic()
+        if remaining <= 0 or (give_up is not None and give_up()):
+            return False, time.monotonic() - start, attempts
+        time.sleep(min(delay, remaining))
+        delay = min(delay * BACKOFF_FACTOR, MAX_DELAY)
+
+def _wait_all(names, check_for, timeout, verb):
+    results = {}
+
+    def wait_one(name):
+        results[name] = poll_until(check_for(name), timeout)
+
+    threads = [threading.Thread(target=wait_one, args=(name,)) for name in names]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    for name in names:
+        ok, seconds, attempts = results[name]
+        if ok:
+            print(f"✓ {name} {verb} in {seconds:.2f}s ({attempts} probes)")
+        else:
+            print(f"✗ {name} not {verb} after {seconds:.1f}s ({attempts} probes)")
+    return all(ok for ok, _, _ in results.values()), results
+
+def wait_until_ready(names, timeout=DEFAULT_TIMEOUT):
+    """Wait for services to pass their readiness probes, concurrently.
+
+    Returns (all_ready, {name: (ok, seconds, attempts)}).
+    """
+    return _wait_all(names, lambda name: READINESS_PROBES[name], timeout, "ready")
+
+def wait_until_down(names, timeout=15):
+    """Wait for the services' ports to stop listening"""
+    def check_for(name):
+        return lambda: not SocketTable().is_listening(SERVICE_PORTS[name])
+    return _wait_all(names, check_for, timeout, "stopped")
+
+def main():
+    args = sys.argv[1:]
+    timeout = DEFAULT_TIMEOUT
+    if "--timeout" in args:
+        index = args.index("--timeout")
+        timeout = float(args[index + 1])
+        del args[index:index + 2]
+    down = "--down" in args
+    names = [arg for arg in args if not arg.startswith("--")] or list(READINESS_PROBES)
+
+    unknown = [name for name in names if name not in READINESS_PROBES]
+    if unknown:
+        print(f"❌ Unknown service(s): {', '.join(unknown)}. Known: {', '.join(READINESS_PROBES)}")
+        return 2
+
+    ok, _ = wait_until_down(names, timeout) if down else wait_until_ready(names, timeout)
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Native Redis Probe for Frappe LMS
+Speaks RESP (PING, INFO) to the bench's Redis instances over persistent
+sockets and reports round-trip latency, used memory, connected clients and
+ops/sec, instead of treating any reply to an HTTP GET as healthy.
+
+Usage:
+    python3 redis_probe.py              # probe Redis Queue and Redis Cache
+    python3 redis_probe.py 13000        # probe one port
+"""
+
+import socket
+import sys
+import threading
+import time
+from collections import namedtuple
+
+REDIS_PORTS = {
+    11000: "Redis Queue",
+    13000: "Redis Cache",
+}
+
+RedisProbeResult = namedtuple("RedisProbeResult",
+                              "ok ping_ms used_memory connected_clients ops_per_sec error")
+
+class RedisError(Exception):
+    pass
+
+class RedisProbe:
+    """Minimal RESP client that keeps one connection open between probes"""
+
+    def __init__(self, port, host="127.0.0.1", timeout=1.0):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.sock = None
+        self.reader = None
+        self.lock = threading.Lock()
+
+    def _connect(self):
+        self.sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.reader = self.sock.makefile("rb")
+
+    def _disconnect(self):
+        for resource in (self.reader, self.sock):
+            if resource is not None:
+                try:
+                    resource.close()
+                except OSError:
+                    pass
+        self.sock = self.reader = None
+
+    def command(self, *args):
+        """Send one command as a RESP array and return the parsed reply"""
+        if self.sock is None:
+            self._connect()
+        parts = [f"*{len(args)}\r\n".encode()]
+        for arg in args:
+            data = str(arg).encode()
+            parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+        self.sock.sendall(b"".join(parts))
+        return self._read_reply()
+
+    def _read_reply(self):
+        line = self.reader.readline()
+        if not line.endswith(b"\r\n"):
+            raise ConnectionError("connection closed by Redis")
+        kind, payload = line[:1], line[1:-2]
+        if kind == b"+":
+            return payload.decode()
+        if kind == b"-":
+            raise RedisError(payload.decode())
+        if kind == b":":
+            return int(payload)
+        if kind == b"$":
+            length = int(payload)
+            if length < 0:
+                return None
+            data = self.reader.read(length + 2)
+            return data[:-2].decode(errors="replace")
+        if kind == b"*":
+            count = int(payload)
+            return None if count < 0 else [self._read_reply() for _ in range(count)]
+        raise ConnectionError(f"not a Redis server (unexpected reply {line[:20]!r})")
+
+    def probe(self):
+        """PING for latency and INFO for load figures; return a RedisProbeResult"""
+        with self.lock:
+            for attempt in (1, 2):
+                reused = self.sock is not None
+                try:
+                    start = time.perf_counter()
+                    if self.command("PING") != "PONG":
+                        raise ConnectionError("unexpected PING reply")
+                    ping_ms = (time.perf_counter() - start) * 1000
+                    info = parse_info(self.command("INFO"))
+                    return RedisProbeResult(True, ping_ms, info.get("used_memory_human"),
+                                            int(info.get("connected_clients", 0)),
+                                            int(info.get("instantaneous_ops_per_sec", 0)), None)
+                except (OSError, ConnectionError, RedisError, ValueError) as e:
+                    self._disconnect()
+                    # A kept-alive socket may have been closed by Redis; retry once fresh
+                    if reused and attempt == 1:
+                        continue
+                    return RedisProbeResult(False, None, None, None, None, f"{type(e).__name__}: {str(e)[:60]}")
+
+    def close(self):
+        with self.lock:
+            self._disconnect()
+
+def parse_info(text):
+    info = {}
+    for line in (text or "").splitlines():
+        if line and not line.startswith("#") and ":" in line:
+            key, value = line.split(":", 1)
+            info[key] = value
+    return info
+
+def describe(result):
+    """One-line summary of a RedisProbeResult"""
+    if not result.ok:
+        return result.error
+    return (f"PING {result.ping_ms:.1f}ms, {result.used_memory} used, "
+            f"{result.connected_clients} clients, {result.ops_per_sec} ops/s")
+
+_probes = {}
+_probes_lock = threading.Lock()
+
+def get_redis_probe(port, host="127.0.0.1"):
+    """Return the process-wide probe for a Redis port, reusing its socket"""
+    with _probes_lock:
+        if (host, port) not in _probes:
+            _probes[(host, port)] = RedisProbe(port, host)
+        return _probes[(host, port)]
+
+def main():
+    ports = [int(arg) for arg in sys.argv[1:]] or list(REDIS_PORTS)
+    healthy = True
+    for port in ports:
+        result = get_redis_probe(port).probe()
+        name = REDIS_PORTS.get(port, "Redis")
+        print(f"{'✓' if result.ok else '✗'} {name} (:{port}) - {describe(result)}")
+        healthy = healthy and result.ok
+    return 0 if healthy else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
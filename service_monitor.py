@@ -2,41 +2,63 @@
 """
 Service Monitor for Frappe LMS
 Real-time monitoring of all services with auto-restart capabilities
+
+Usage:
+    python3 service_monitor.py [--no-cache]          # one-shot status
+    python3 service_monitor.py monitor [--persist]
+    python3 service_monitor.py serve [--port 9469] [--interval 15]
+    python3 service_monitor.py history [PROBE]
 """
 
+import asyncio
+import math
 import subprocess
 import sys
 import os
 import time
-import requests
 import json
+import threading
 from datetime import datetime
 
+from lms_probes import enable_cache, probe_http, probe_mariadb, probe_port
+from proc_inspector import get_process_inspector, alerts, role_counts
+from redis_probe import REDIS_PORTS
+from metrics_exporter import MetricsCache, serve_metrics, DEFAULT_METRICS_PORT
+from monitor_history import MonitorHistory, ProbeHistory, DEFAULT_HISTORY_DIR, history_path
+
+def check_redis(port, service_name):
+    """Check a Redis instance with RESP PING/INFO over a persistent socket"""
+    result = probe_port(port)
+    if result.ok:
+        return True, f"✓ {service_name} (:{port}) - OK ({result.message})"
+    return False, f"✗ {service_name} (:{port}) - DOWN ({result.message})"
+
 def check_service_port(port, service_name):
     """Check if a service is running on a specific port"""
-    try:
-        response = requests.get(f"http://127.0.0.1:{port}", timeout=2)
-        return True, f"✓ {service_name} (:{port}) - OK"
-    except requests.exceptions.ConnectionError:
+    if port in REDIS_PORTS:
+        return check_redis(port, service_name)
+    result = probe_port(port)
+    if result.ok:
+        return True, f"✓ {service_name} (:{port}) - OK ({result.latency_ms:.1f}ms)"
+    if result.error_class == "connection":
         return False, f"✗ {service_name} (:{port}) - DOWN"
-    except requests.exceptions.Timeout:
+    if result.error_class == "timeout":
         return False, f"⚠ {service_name} (:{port}) - TIMEOUT"
-    except Exception as e:
-        return False, f"✗ {service_name} (:{port}) - ERROR: {str(e)[:50]}"
+    return False, f"✗ {service_name} (:{port}) - ERROR: {result.message}"
 
 def check_mariadb():
     """Check MariaDB service"""
-    try:
-        result = subprocess.run("sudo service mariadb status", shell=True, capture_output=True, text=True)
-        if "active (running)" in result.stdout:
-            return True, "✓ MariaDB - RUNNING"
-        else:
-            return False, "✗ MariaDB - STOPPED"
-    except:
-        return False, "✗ MariaDB - ERROR"
+    result = probe_mariadb()
+    if result.ok:
+        return True, f"✓ MariaDB - RUNNING ({result.message})"
+    if result.error_class == "connection":
+        return False, "✗ MariaDB - STOPPED"
+    return False, "✗ MariaDB - ERROR"
 
 def check_bench_processes():
     """Check if bench processes are running"""
+    if os.path.isdir("/proc/self"):
+        return check_bench_processes_proc()
     try:
         result = subprocess.run("pgrep -f 'bench start'", shell=True, capture_output=True, text=True)
         if result.returncode == 0:
@@ -47,87 +69,344 @@ def check_bench_processes():
     except:
         return False, "✗ Bench Processes - ERROR"
 
+def bench_is_running(samples):
+    """A bench/honcho supervisor, or both a web server and socketio; a stray
+    host redis-server or gunicorn alone does not count"""
+    roles = {sample.role.split(":")[0] for sample in samples}
+    if "bench" in roles:
+        return True
+    web = "web" in roles or any(role.startswith("gunicorn") for role in roles)
+    return web and "socketio" in roles
+
+def check_bench_processes_proc():
+    """Check bench processes from one /proc walk, with CPU/RSS alerts"""
+    try:
+        samples = get_process_inspector().sample()
+    except Exception as e:
+        return False, f"✗ Bench Processes - ERROR: {str(e)[:50]}"
+    if not samples:
+        return False, "✗ Bench Processes - NONE"
+
+    counts = ", ".join(f"{role} {count}" for role, count in sorted(role_counts(samples).items()))
+    if not bench_is_running(samples):
+        return False, f"✗ Bench Processes - NOT RUNNING (only {counts})"
+    hot = [f"{sample.role} {sample.pid}: {', '.join(alerts(sample))}" for sample in samples if alerts(sample)]
+    if hot:
+        return True, f"⚠ Bench Processes - {len(samples)} running ({counts}) - {'; '.join(hot)}"
+    return True, f"✓ Bench Processes - {len(samples)} running ({counts})"
+
+API_ENDPOINTS = {
+    "Health": "http://127.0.0.1:8000",
+    "LMS": "http://127.0.0.1:8000/lms",
+    "API": "http://127.0.0.1:8000/api/method/lms.lms.api.get_user_info"
+}
+
+def check_api_endpoint(name, url):
+    """Check a single API endpoint"""
+    result = probe_http(url)
+    if result.ok:
+        return True, f"✓ {name} API - OK ({result.status}, {result.latency_ms:.0f}ms)"
+    if result.status is not None:
+        return False, f"⚠ {name} API - {result.status}"
+    return False, f"✗ {name} API - ERROR"
+
 def check_api_endpoints():
     """Check critical API endpoints"""
-    endpoints = {
-        "Health": "http://127.0.0.1:8000",
-        "LMS": "http://127.0.0.1:8000/lms",
-        "API": "http://127.0.0.1:8000/api/method/lms.lms.api.get_user_info"
-    }
-    
-    results = []
-    for name, url in endpoints.items():
+    return [check_api_endpoint(name, url) for name, url in API_ENDPOINTS.items()]
+
+class MonitorProbe:
+    """A probe with its own schedule: check() is a coroutine returning (ok, msg)"""
+
+    def __init__(self, name, check, interval, timeout):
+        self.name = name
+        self.check = check
+        self.interval = interval
+        self.timeout = timeout
+
+async def http_status(host, port, path="/"):
+    """Send a minimal HTTP GET and return the response status code"""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        writer.write(f"GET {path} HTTP/1.1\r\nHost: {host}:{port}\r\nConnection: close\r\n\r\n".encode())
+        await writer.drain()
+        status_line = await reader.readline()
+    finally:
+        writer.close()
+    parts = status_line.split()
+    if len(parts) < 2 or not parts[1].isdigit():
+        raise ConnectionError("invalid HTTP response")
+    return int(parts[1])
+
+def port_probe(port, name):
+    if port in REDIS_PORTS:
+        async def check_redis_port():
+            return await asyncio.to_thread(check_redis, port, name)
+        return check_redis_port
+
+    async def check():
+        start = time.perf_counter()
+        try:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        except OSError:
+            return False, f"✗ {name} (:{port}) - DOWN"
+        writer.close()
+        return True, f"✓ {name} (:{port}) - OK ({(time.perf_counter() - start) * 1000:.1f}ms)"
+    return check
+
+def api_probe(name, path):
+    async def check():
+        start = time.perf_counter()
+        try:
+            status = await http_status("127.0.0.1", 8000, path)
+        except (OSError, ConnectionError):
+            return False, f"✗ {name} API - ERROR"
+        elapsed = (time.perf_counter() - start) * 1000
+        if status == 200:
+            return True, f"✓ {name} API - OK ({status}, {elapsed:.0f}ms)"
+        return False, f"⚠ {name} API - {status}"
+    return check
+
+async def mariadb_probe():
+    return await asyncio.to_thread(check_mariadb)
+
+async def bench_processes_probe():
+    return await asyncio.to_thread(check_bench_processes)
+
+# Probe layout: one section per list, each probe on its own interval/timeout
+MONITOR_SECTIONS = [
+    [
+        MonitorProbe("MariaDB", mariadb_probe, interval=5, timeout=4),
+        MonitorProbe("Web Server", port_probe(8000, "Web Server"), interval=0.5, timeout=0.5),
+        MonitorProbe("Socket.IO", port_probe(9000, "Socket.IO"), interval=2, timeout=1),
+        MonitorProbe("Redis Queue", port_probe(11000, "Redis Queue"), interval=2, timeout=1),
+        MonitorProbe("Redis Cache", port_probe(13000, "Redis Cache"), interval=2, timeout=1),
+    ],
+    [
+        MonitorProbe("Bench Processes", bench_processes_probe, interval=5, timeout=3),
+    ],
+    [
+        MonitorProbe("Health", api_probe("Health", "/"), interval=2, timeout=3),
+        MonitorProbe("LMS", api_probe("LMS", "/lms"), interval=2, timeout=3),
+        MonitorProbe("API", api_probe("API", "/api/method/lms.lms.api.get_user_info"), interval=2, timeout=3),
+    ],
+]
+
+class StatusBoard:
+    """Fixed-layout terminal screen that rewrites only the lines that changed"""
+
+    def __init__(self, probes_by_section, history):
+        self.history = history
+        self.lines = [f"📊 FRAPPE LMS SERVICE MONITOR - {datetime.now().strftime('%H:%M:%S')}", "=" * 60]
+        self.rows = {}
+        self.status = {}
+        for section in probes_by_section:
+            for probe in section:
+                self.rows[probe.name] = len(self.lines)
+                self.lines.append(f"… {probe.name} - checking")
+            self.lines.append("")
+        self.summary_row = len(self.lines)
+        self.lines += ["", "", "Probing continuously... (Ctrl+C to exit)"]
+
+    def draw(self):
+        """Clear once with ANSI escapes and paint the whole board"""
+        sys.stdout.write("\033[?25l\033[2J\033[H" + "\n".join(self.lines) + "\n")
+        sys.stdout.flush()
+
+    def set_line(self, row, text):
+        if self.lines[row] == text:
+            return
+        self.lines[row] = text
+        sys.stdout.write(f"\033[{row + 1};1H\033[2K{text}\033[{len(self.lines) + 1};1H")
+        sys.stdout.flush()
+
+    def update(self, name, ok, msg, latency_ms=None):
+        self.status[name] = ok
+        now = time.time()
+        history = self.history.get(name)
+        history.record(now, ok, latency_ms)
+        # Raw samples: the minute rollups would cover whole buckets, or an hour
+        trend = history.recent(now - 60)
+        self.set_line(self.rows[name], f"{msg}  [1m: {trend[0]:.0f}% up, avg {trend[1]:.1f}ms]")
+        if len(self.status) < len(self.rows):
+            return
+        if all(self.status.values()):
+            self.set_line(self.summary_row, "🟢 ALL SYSTEMS OPERATIONAL")
+        else:
+            self.set_line(self.summary_row, "🔴 ISSUES DETECTED - Run quick_fix.py")
+
+    def tick(self):
+        self.set_line(0, f"📊 FRAPPE LMS SERVICE MONITOR - {datetime.now().strftime('%H:%M:%S')}")
+
+    def close(self):
+        sys.stdout.write(f"\033[{len(self.lines) + 1};1H\033[?25h")
+        sys.stdout.flush()
+
+async def run_probe(probe, board):
+    """Run one probe forever on a fixed cadence that does not drift"""
+    loop = asyncio.get_running_loop()
+    next_run = loop.time()
+    while True:
+        started = loop.time()
         try:
-            response = requests.get(url, timeout=3)
-            if response.status_code == 200:
-                results.append((True, f"✓ {name} API - OK ({response.status_code})"))
-            else:
-                results.append((False, f"⚠ {name} API - {response.status_code}"))
+            ok, msg = await asyncio.wait_for(probe.check(), probe.timeout)
+        except asyncio.TimeoutError:
+            ok, msg = False, f"⚠ {probe.name} - TIMEOUT"
         except Exception as e:
-            results.append((False, f"✗ {name} API - ERROR"))
-    
-    return results
+            ok, msg = False, f"✗ {probe.name} - ERROR: {str(e)[:50]}"
+        board.update(probe.name, ok, msg, (loop.time() - started) * 1000)
+
+        # Schedule from the previous slot, not from now; skip slots a slow probe missed
+        next_run += probe.interval
+        now = loop.time()
+        if next_run < now:
+            next_run = now
+        await asyncio.sleep(next_run - now)
 
-def monitor_mode():
+async def run_clock(board):
+    while True:
+        board.tick()
+        await asyncio.sleep(1 - time.time() % 1)
+
+async def flush_history(history):
+    while True:
+        await asyncio.sleep(30)
+        history.flush()
+
+async def async_monitor(sections=MONITOR_SECTIONS, history_dir=None):
+    history = MonitorHistory(history_dir)
+    board = StatusBoard(sections, history)
+    board.draw()
+    tasks = [asyncio.create_task(run_clock(board)), asyncio.create_task(flush_history(history))]
+    tasks += [asyncio.create_task(run_probe(probe, board)) for section in sections for probe in section]
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+        board.close()
+        history.close()
+
+def monitor_mode(history_dir=None):
     """Continuous monitoring mode"""
-    print("🔍 CONTINUOUS MONITORING MODE")
-    print("Press Ctrl+C to exit")
-    print("=" * 60)
-    
     try:
-        while True:
-            os.system('clear' if os.name == 'posix' else 'cls')
-            print(f"📊 FRAPPE LMS SERVICE MONITOR - {datetime.now().strftime('%H:%M:%S')}")
-            print("=" * 60)
-            
-            # Check services
-            services = [
-                (3306, "MariaDB"),
-                (8000, "Web Server"),
-                (9000, "Socket.IO"),
-                (11000, "Redis Queue"),
-                (13000, "Redis Cache")
-            ]
-            
-            all_good = True
-            for port, name in services:
-                if name == "MariaDB":
-                    status, msg = check_mariadb()
-                else:
-                    status, msg = check_service_port(port, name)
-                print(msg)
-                if not status:
-                    all_good = False
-            
-            print()
-            
-            # Check bench processes
-            status, msg = check_bench_processes()
-            print(msg)
-            if not status:
-                all_good = False
-            
-            print()
-            
-            # Check APIs
-            api_results = check_api_endpoints()
-            for status, msg in api_results:
-                print(msg)
-                if not status:
-                    all_good = False
-            
-            print()
-            if all_good:
-                print("🟢 ALL SYSTEMS OPERATIONAL")
-            else:
-                print("🔴 ISSUES DETECTED - Run quick_fix.py")
-            
-            print("\nNext check in 5 seconds... (Ctrl+C to exit)")
-            time.sleep(5)
-            
+        asyncio.run(async_monitor(history_dir=history_dir))
     except KeyboardInterrupt:
         print("\n👋 Monitoring stopped.")
 
+SERVICES = [
+    (8000, "Web Server"),
+    (9000, "Socket.IO"),
+    (11000, "Redis Queue"),
+    (13000, "Redis Cache")
+]
+
+def exporter_probes():
+    """Return (name, kind, check) for every check the exporter runs"""
+    probes = [("MariaDB", "db", check_mariadb)]
+    probes += [(name, "redis" if port in REDIS_PORTS else "port",
+                lambda port=port, name=name: check_service_port(port, name))
+               for port, name in SERVICES]
+    probes.append(("Bench Processes", "process", check_bench_processes))
+    probes += [(name, "api", lambda name=name, url=url: check_api_endpoint(name, url))
+               for name, url in API_ENDPOINTS.items()]
+    return probes
+
+def run_exporter_probe(cache, name, kind, check, interval, stop):
+    """Run one check on a fixed cadence and record its result in the cache"""
+    next_run = time.monotonic()
+    while not stop.is_set():
+        started = time.monotonic()
+        try:
+            ok, msg = check()
+        except Exception as e:
+            ok, msg = False, f"✗ {name} - ERROR: {str(e)[:50]}"
+        cache.record(name, kind, ok, time.monotonic() - started, msg)
+        next_run = max(next_run + interval, time.monotonic())
+        stop.wait(next_run - time.monotonic())
+
+def serve_mode(port=DEFAULT_METRICS_PORT, interval=15):
+    """Run the checks in the background and serve cached results as metrics"""
+    cache = MetricsCache()
+    stop = threading.Event()
+    for name, kind, check in exporter_probes():
+        threading.Thread(target=run_exporter_probe, args=(cache, name, kind, check, interval, stop),
+                         daemon=True).start()
+
+    print(f"📡 Serving LMS probe metrics on http://127.0.0.1:{port}/metrics "
+          f"(probing every {interval:g}s, Ctrl+C to exit)")
+    try:
+        serve_metrics(cache, port)
+    except KeyboardInterrupt:
+        print("\n👋 Exporter stopped.")
+    finally:
+        stop.set()
+
+def option_value(name, default, cast=str):
+    """Value after --name in sys.argv, or print usage and exit 1 when it is missing or malformed"""
+    if name not in sys.argv:
+        return default
+    index = sys.argv.index(name)
+    try:
+        return cast(sys.argv[index + 1])
+    except (IndexError, ValueError):
+        value = f"invalid value {sys.argv[index + 1]!r}" if index + 1 < len(sys.argv) else "a missing value"
+        print(f"❌ {name} has {value}")
+        print("Usage:" + __doc__.split("Usage:", 1)[1].rstrip())
+        sys.exit(1)
+
+def port_number(value):
+    port = int(value)
+    if not 0 < port < 65536:
+        raise ValueError(f"port out of range: {port}")
+    return port
+
+def positive_seconds(value):
+    # A zero interval would probe the LMS non-stop, the load the exporter exists to avoid
+    seconds = float(value)
+    if not 0 < seconds < math.inf:
+        raise ValueError(f"interval must be above 0: {value}")
+    return seconds
+
+def format_trend(trend):
+    if trend is None:
+        return "no samples"
+    uptime, avg, peak, count = trend
+    return f"{uptime:5.1f}% up, avg {avg:7.1f}ms, max {peak:7.1f}ms ({count} samples)"
+
+def show_history(name=None, history_dir=DEFAULT_HISTORY_DIR):
+    """Print latency trends from persisted monitor history"""
+    probe_names = [probe.name for section in MONITOR_SECTIONS for probe in section]
+    if name:
+        probe_names = [probe for probe in probe_names if probe.lower() == name.lower()]
+        if not probe_names:
+            print(f"❌ Unknown probe: {name}")
+            return False
+
+    now = time.time()
+    print(f"📈 FRAPPE LMS MONITOR HISTORY ({history_dir})")
+    print("=" * 60)
+    for probe_name in probe_names:
+        path = history_path(probe_name, history_dir)
+        if not os.path.exists(path):
+            print(f"{probe_name:<16} no history (run 'monitor --persist')")
+            continue
+        history = ProbeHistory(path)
+        print(f"{probe_name:<16} 1h: {format_trend(history.summary(now - 3600))}")
+        print(f"{'':<16} 24h: {format_trend(history.summary(now - 86400))}")
+        if name:
+            print("\nLast 15 minutes:")
+            for start, count, up, latency_count, latency_sum, latency_max in list(history.minutes)[-15:]:
+                avg = latency_sum / latency_count if latency_count else 0
+                print(f"  {datetime.fromtimestamp(start).strftime('%H:%M')}  {up * 100 / count:5.1f}% up  "
+                      f"avg {avg:7.1f}ms  max {latency_max:7.1f}ms")
+            print("\nLast 24 hours:")
+            for start, count, up, latency_count, latency_sum, latency_max in list(history.hours)[-24:]:
+                avg = latency_sum / latency_count if latency_count else 0
+                print(f"  {datetime.fromtimestamp(start).strftime('%m-%d %H:00')}  {up * 100 / count:5.1f}% up  "
+                      f"avg {avg:7.1f}ms  max {latency_max:7.1f}ms")
+        history.close()
+    return True
+
 def single_check():
     """Single comprehensive check"""
     print("📊 FRAPPE LMS SERVICE STATUS")
@@ -175,8 +454,18 @@ def single_check():
 
 def main():
     if len(sys.argv) > 1 and sys.argv[1] == "monitor":
-        monitor_mode()
+        # --persist keeps probe history in memory-mapped files across restarts
+        monitor_mode(DEFAULT_HISTORY_DIR if "--persist" in sys.argv else None)
+    elif len(sys.argv) > 1 and sys.argv[1] == "serve":
+        serve_mode(option_value("--port", DEFAULT_METRICS_PORT, port_number),
+                   option_value("--interval", 15, positive_seconds))
+    elif len(sys.argv) > 1 and sys.argv[1] == "history":
+        show_history(sys.argv[2] if len(sys.argv) > 2 else None)
     else:
+        # One-shot status can reuse results health_check.py just took;
+        # monitor and serve modes always probe fresh
+        if "--no-cache" not in sys.argv:
+            enable_cache()
         single_check()
 
 if __name__ == "__main__":
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Socket Table Snapshot for Frappe LMS
+Reads /proc/net/tcp and /proc/net/tcp6 once and answers every listening-port
+question from that snapshot, instead of spawning netstat once per port.
+
+Usage:
+    python3 socket_table.py                 # print listening ports, one per line
+    python3 socket_table.py --pids          # ... with owning pids
+    python3 socket_table.py 8000 9000       # exit 0 only if all ports are listening
+"""
+
+import os
+import subprocess
+import sys
+import threading
+import time
+
+PROC_NET_TABLES = ["/proc/net/tcp", "/proc/net/tcp6"]
+TCP_LISTEN = "0A"
+
+class SocketTable:
+    """One snapshot of the host's listening TCP sockets"""
+
+    def __init__(self, with_pids=False):
+        self.taken_at = time.time()
+        self.with_pids = with_pids
+        # port -> set of socket inodes listening on it
+        self.listening = {}
+        # inode -> pid, filled only when with_pids is set
+        self.inode_pids = {}
+
+        if os.path.exists(PROC_NET_TABLES[0]):
+            for path in PROC_NET_TABLES:
+                self._read_proc_table(path)
+            if with_pids:
+                self._map_inodes_to_pids()
+        else:
+            self._read_netstat()
+
+    def _read_proc_table(self, path):
+        try:
+            with open(path) as f:
+                next(f)  # header
+                for line in f:
+                    fields = line.split()
+                    if len(fields) < 10 or fields[3] != TCP_LISTEN:
+                        continue
+                    port = int(fields[1].rsplit(":", 1)[1], 16)
+                    self.listening.setdefault(port, set()).add(int(fields[9]))
+        except FileNotFoundError:
+            pass  # tcp6 is missing when IPv6 is disabled
+
+    def _map_inodes_to_pids(self):
+        """Walk /proc/<pid>/fd once to find the owners of the listening sockets"""
+        wanted = {inode for inodes in self.listening.values() for inode in inodes}
+        for pid in os.listdir("/proc"):
+            if not pid.isdigit():
+                continue
+            fd_dir = f"/proc/{pid}/fd"
+            try:
+                fds = os.listdir(fd_dir)
+            except (PermissionError, FileNotFoundError):
+                continue
+            for fd in fds:
+                try:
+                    target = os.readlink(f"{fd_dir}/{fd}")
+                except OSError:
+                    continue
+                if target.startswith("socket:["):
+                    inode = int(target[8:-1])
+                    if inode in wanted:
+                        self.inode_pids[inode] = int(pid)
+
+    def _read_netstat(self):
+        """Fallback for hosts without /proc/net: one netstat call for all ports"""
+        result = subprocess.run(['netstat', '-tln'], capture_output=True, text=True)
+        for line in result.stdout.splitlines():
+            fields = line.split()
+            if len(fields) >= 4 and fields[0].startswith("tcp"):
+                port = fields[3].rsplit(":", 1)[-1].rsplit(".", 1)[-1]
+                if port.isdigit():
+                    self.listening.setdefault(int(port), set())
+
+    def is_listening(self, port):
+        return port in self.listening
+
+    def pids_for_port(self, port):
+        """Return the pids owning sockets listening on port (needs with_pids)"""
+        return sorted({self.inode_pids[inode] for inode in self.listening.get(port, ())
+                       if inode in self.inode_pids})
+
+    def ports(self):
+        return sorted(self.listening)
+
+_snapshot = None
+_snapshot_lock = threading.Lock()
+
+def get_socket_table(refresh=False, with_pids=False):
+    """Return the process-wide snapshot, taking it on first use"""
+    global _snapshot
+    with _snapshot_lock:
+        if _snapshot is None or refresh or (with_pids and not _snapshot.with_pids):
+            _snapshot = SocketTable(with_pids=with_pids)
+        return _snapshot
+
+def main():
+    args = sys.argv[1:]
+    with_pids = "--pids" in args
+    ports = [int(arg) for arg in args if arg.isdigit()]
+    table = SocketTable(with_pids=with_pids)
+
+    if ports:
+        missing = [port for port in ports if not table.is_listening(port)]
+        return 1 if missing else 0
+
+    for port in table.ports():
+        if with_pids:
+            pids = ",".join(str(pid) for pid in table.pids_for_port(port))
+            print(f"{port} {pids or '-'}")
+        else:
+            print(port)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
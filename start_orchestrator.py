@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Start Orchestrator for Frappe LMS
+Reads the bench Procfile and launches its components in parallel, each as
+soon as the components it depends on are ready (MariaDB and both Redis
+instances first, then web, socketio, workers and the scheduler). Output goes
+to /tmp/bench.log with honcho-style "name.1 |" prefixes, and a startup
+timeline with the critical path is printed at the end.
+
+Components run in their own sessions and keep running after this script
+exits; their process groups are recorded in a pidfile for `stop`.
+
+Usage:
+    python3 start_orchestrator.py          # start and print the timeline
+    python3 start_orchestrator.py stop     # stop components from the pidfile
+"""
+
+import os
+import shlex
+import signal
+import subprocess
+import sys
+import threading
+import time
+
+from readiness import READINESS_PROBES, poll_until
+
+BENCH_PATH = "/workspaces/The-frappe-LMS-/lms-bench"
+PROCFILE = os.path.join(BENCH_PATH, "Procfile")
+LOG_FILE = "/tmp/bench.log"
+PIDFILE = "/tmp/bench-components.pid"
+READY_TIMEOUT = 90
+# Components without a readiness probe count as ready once they survive this long
+STARTUP_GRACE = 1.0
+
+MARIADB = "mariadb"
+REDIS = ["redis_cache", "redis_queue"]
+# Procfile name -> components it needs; names not listed need MariaDB and Redis
+DEPENDENCIES = {
+    "redis_cache": [],
+    "redis_queue": [],
+    "redis_socketio": [],
+    "socketio": ["redis_cache", "redis_queue"],
+    "watch": [],
+}
+# Procfile name -> readiness.py probe
+PROBES = {
+    "mariadb": "mariadb",
+    "redis_cache": "redis-cache",
+    "redis_queue": "redis-queue",
+    "web": "web",
+    "socketio": "socketio",
+}
+
+class Component:
+    def __init__(self, name, command, depends_on):
+        self.name = name
+        self.command = command
+        self.depends_on = depends_on
+        self.ready = threading.Event()
+        self.ok = False
+        self.process = None
+        self.launched_at = None
+        self.ready_at = None
+        self.status = "pending"
+
+def read_procfile(path=PROCFILE):
+    """Return [(name, command)] in Procfile order"""
+    entries = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#") or ":" not in line:
+                continue
+            name, command = line.split(":", 1)
+            entries.append((name.strip(), command.strip()))
+    return entries
+
+def build_components(entries):
+    """The MariaDB service plus one Component per Procfile entry"""
+    names = {name for name, _ in entries}
+    components = [Component(MARIADB, "sudo service mariadb start", [])]
+    for name, command in entries:
+        needs = DEPENDENCIES.get(name, [MARIADB] + REDIS)
+        components.append(Component(name, command, [dep for dep in needs if dep == MARIADB or dep in names]))
+    return components
+
+# Runs per component as "python3 -c PREFIXER label width"; kept import-free so it starts fast
+PREFIXER = """import sys, time
+label, width = sys.argv[1], int(sys.argv[2])
+for line in sys.stdin:
+    sys.stdout.write(f"{time.strftime('%H:%M:%S')} {label:<{width}} | {line}")
+    sys.stdout.flush()
+"""
+
+def prefixed_command(component, width):
+    """Shell pipeline that writes the component's output to the log with
+    honcho-style 'HH:MM:SS web.1 | ...' prefixes"""
+    prefixer = " ".join(shlex.quote(arg) for arg in
+                        (sys.executable, "-u", "-c", PREFIXER, f"{component.name}.1", str(width)))
+    return f"({component.command}) 2>&1 | {prefixer} >> {shlex.quote(LOG_FILE)}"
+
+def start_component(component, by_name, started, width):
+    for dep in component.depends_on:
+        by_name[dep].ready.wait()
+    failed = [dep for dep in component.depends_on if not by_name[dep].ok]
+    if failed:
+        component.status = f"skipped ({', '.join(failed)} not ready)"
+        component.ready.set()
+        return
+
+    probe = READINESS_PROBES.get(PROBES.get(component.name))
+    component.launched_at = time.monotonic() - started
+    try:
+        if probe is not None and poll_until(probe, 0)[0]:
+            component.status = "already running"
+        elif component.name == MARIADB:
+            subprocess.run(component.command, shell=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            component.status = "started"
+        else:
+            # A new session per component so stop can signal the whole pipeline
+            component.process = subprocess.Popen(prefixed_command(component, width), shell=True, cwd=BENCH_PATH,
+                                                 stdin=subprocess.DEVNULL, start_new_session=True)
+            component.status = "started"
+
+        exited = (lambda: component.process.poll() is not None) if component.process else None
+        if component.status == "already running":
+            component.ok = True
+        elif probe is not None:
+            component.ok = poll_until(probe, READY_TIMEOUT, give_up=exited)[0]
+        else:
+            time.sleep(STARTUP_GRACE)
+            component.ok = not exited()
+        if not component.ok:
+            component.status = "exited" if exited and exited() else "not ready"
+    finally:
+        component.ready_at = time.monotonic() - started
+        component.ready.set()
+
+def read_pidfile(path=PIDFILE):
+    try:
+        with open(path) as f:
+            return [line.split() for line in f if len(line.split()) == 2]
+    except FileNotFoundError:
+        return []
+
+def group_alive(pgid):
+    try:
+        os.killpg(int(pgid), 0)
+        return True
+    except (ProcessLookupError, PermissionError, ValueError):
+        return False
+
+def write_pidfile(components, path=PIDFILE):
+    """Record the new process groups, keeping live ones from an earlier start"""
+    entries = [entry for entry in read_pidfile(path) if group_alive(entry[1])]
+    entries += [[c.name, str(c.process.pid)] for c in components
+                if c.process is not None and c.process.poll() is None]
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        f.writelines(f"{name} {pgid}\n" for name, pgid in entries)
+    os.replace(tmp_path, path)
+
+def critical_path(components):
+    """Chain of components ending at the last one to become ready, following
+    at each step the dependency that became ready latest"""
+    by_name = {c.name: c for c in components}
+    finished = [c for c in components if c.ready_at is not None]
+    if not finished:
+        return []
+    path = [max(finished, key=lambda c: c.ready_at)]
+    while True:
+        deps = [by_name[dep] for dep in path[-1].depends_on if by_name[dep].ready_at is not None]
+        if not deps:
+            return list(reversed(path))
+        path.append(max(deps, key=lambda c: c.ready_at))
+
+def print_timeline(components):
+    print("\n📈 STARTUP TIMELINE (seconds since start)")
+    total = max((c.ready_at or 0 for c in components), default=0) or 1
+    for component in sorted(components, key=lambda c: (c.launched_at is None, c.launched_at or 0)):
+        if component.launched_at is None:
+            print(f"  {component.name:<16}{'':>16}  {component.status}")
+            continue
+        start = min(int(component.launched_at / total * 30), 29)
+        end = max(int(component.ready_at / total * 30), start + 1)
+        bar = " " * start + "█" * (end - start)
+        mark = "✓" if component.ok else "✗"
+        print(f"  {component.name:<16}{component.launched_at:6.2f} → {component.ready_at:6.2f}  "
+              f"|{bar:<30}| {mark} {component.status}")
+
+    path = critical_path(components)
+    if path:
+        steps = []
+        previous = 0.0
+        for component in path:
+            steps.append(f"{component.name} (+{component.ready_at - previous:.2f}s)")
+            previous = component.ready_at
+        print(f"\n🛣️  Critical path: {' → '.join(steps)} = {path[-1].ready_at:.2f}s")
+
+def start_all(procfile=PROCFILE):
+    """Launch every component in dependency order; return True if all became ready"""
+    components = build_components(read_procfile(procfile))
+    by_name = {c.name: c for c in components}
+    width = max(len(c.name) for c in components) + 2
+    # Append rather than truncate: earlier runs stay available to log_index.py
+    with open(LOG_FILE, "a") as f:
+        f.write(f"{time.strftime('%H:%M:%S')} system | starting components "
+                f"({time.strftime('%Y-%m-%d %H:%M:%S')})\n")
+    started = time.monotonic()
+
+    threads = [threading.Thread(target=start_component, args=(c, by_name, started, width)) for c in components]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    write_pidfile(components)
+    print_timeline(components)
+    return all(c.ok for c in components)
+
+def stop_all(path=PIDFILE):
+    """Terminate the process groups recorded by start_all; return how many were signalled"""
+    stopped = 0
+    for name, pgid in read_pidfile(path):
+        try:
+            os.killpg(int(pgid), signal.SIGTERM)
+            stopped += 1
+        except (ProcessLookupError, PermissionError, ValueError):
+            pass
+    if os.path.exists(path):
+        os.remove(path)
+    return stopped
+
+def main():
+    command = sys.argv[1] if len(sys.argv) > 1 else "start"
+    if command == "stop":
+        print(f"✓ Signalled {stop_all()} component process group(s)")
+        return 0
+    if not os.path.exists(PROCFILE):
+        print(f"❌ No Procfile at {PROCFILE}")
+        return 1
+    return 0 if start_all() else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
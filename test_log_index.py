@@ -0,0 +1,73 @@
+"""Tests for log_index.py dating of honcho clock times across several days"""
+
+import time
+from datetime import datetime
+
+import log_index
+
+def stamp(text):
+    return datetime.strptime(text, "%Y-%m-%d %H:%M:%S").timestamp()
+
+def traceback_lines(clock, process, message):
+    return [
+        f"{clock} {process} | Traceback (most recent call last):",
+        f'{clock} {process} |   File "/bench/apps/frappe/frappe/app.py", line 10, in application',
+        f"{clock} {process} | ValueError: {message}",
+    ]
+
+MULTI_DAY_LOG = (
+    ["09:00:00 system | starting components (2026-10-10 09:00:00)"]
+    + traceback_lines("09:30:00", "web.1", "first day")
+    + ['23:59:58 web.1 | "GET /lms HTTP/1.1" 200 512']
+    # A second writer's line from just before midnight, appended after it passed
+    + ['00:00:01 web.1 | "GET /lms HTTP/1.1" 200 512',
+       '23:59:59 socketio.1 | "GET /socket.io HTTP/1.1" 200 64']
+    + traceback_lines("08:00:00", "worker.1", "second day")
+    # Nothing logged for most of a day: the clock still goes back, so a day passed
+    + traceback_lines("07:00:00", "web.1", "third day")
+)
+
+def write_log(path, lines):
+    with open(path, "a") as f:
+        f.write("\n".join(lines) + "\n")
+
+def test_multi_day_log_dates_each_line(tmp_path):
+    log_path = tmp_path / "bench.log"
+    write_log(log_path, MULTI_DAY_LOG)
+    db = log_index.connect(str(tmp_path / "index.sqlite"))
+    log_index.update_index(db, str(log_path))
+
+    exceptions = dict(db.execute("SELECT message, ts FROM exceptions").fetchall())
+    assert exceptions == {
+        "first day": stamp("2026-10-10 09:30:00"),
+        "second day": stamp("2026-10-11 08:00:00"),
+        "third day": stamp("2026-10-12 07:00:00"),
+    }
+    requests = sorted(ts for ts, in db.execute("SELECT ts FROM requests"))
+    assert requests == [stamp("2026-10-10 23:59:58"), stamp("2026-10-10 23:59:59"),
+                        stamp("2026-10-11 00:00:01")]
+
+    # None of it is from the last hour
+    assert log_index.top_exceptions(db, time.time() - 3600) == []
+
+def test_incremental_run_keeps_the_date(tmp_path):
+    log_path = tmp_path / "bench.log"
+    write_log(log_path, MULTI_DAY_LOG)
+    db = log_index.connect(str(tmp_path / "index.sqlite"))
+    log_index.update_index(db, str(log_path))
+
+    write_log(log_path, traceback_lines("06:00:00", "web.1", "fourth day"))
+    lines, size = log_index.update_index(db, str(log_path))
+    assert lines == 3
+    ts, = db.execute("SELECT ts FROM exceptions WHERE message = 'fourth day'").fetchone()
+    assert ts == stamp("2026-10-13 06:00:00")
+
+def test_restart_marker_resets_the_date(tmp_path):
+    log_path = tmp_path / "bench.log"
+    write_log(log_path, MULTI_DAY_LOG + ["10:00:00 system | starting components (2026-10-16 10:00:00)"]
+              + traceback_lines("10:00:05", "web.1", "after restart"))
+    db = log_index.connect(str(tmp_path / "index.sqlite"))
+    log_index.update_index(db, str(log_path))
+
+    ts, = db.execute("SELECT ts FROM exceptions WHERE message = 'after restart'").fetchone()
+    assert ts == stamp("2026-10-16 10:00:05")